@@ -0,0 +1,111 @@
+"""
+Running aggregates behind the admin analytics dashboard
+"""
+
+import asyncio
+import heapq
+from operator import itemgetter
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+_STATUSES = ("online", "offline")
+
+class AdminStatsCache:
+    """URL status counts and response-time totals, kept current as URLs change
+
+    Seeded once from a full scan, then updated per add/remove/ping so reading
+    the dashboard no longer walks every URL.
+    """
+
+    def __init__(self):
+        self._entries: Dict[Tuple[str, str], Tuple[str, Optional[float]]] = {}  # (user, url) -> (status, response time)
+        self._user_url_counts: Dict[str, int] = {}
+        self.online = 0
+        self.offline = 0
+        self.pending = 0
+        self.sum_rt = 0.0
+        self.count_rt = 0
+        self.version = 0  # Bumped on every change, so renders of these stats can be reused
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    @property
+    def users(self) -> int:
+        return len(self._user_url_counts)
+
+    @property
+    def urls(self) -> int:
+        return len(self._entries)
+
+    def top_users(self, n: int) -> List[Tuple[str, int]]:
+        """The `n` users monitoring the most URLs, as (user id, URL count)"""
+        return heapq.nlargest(n, self._user_url_counts.items(), key=itemgetter(1))
+
+    def _apply(self, status: str, response_time: Optional[float], sign: int):
+        if status == "online":
+            self.online += sign
+        elif status == "offline":
+            self.offline += sign
+        else:
+            self.pending += sign
+        if response_time and response_time > 0:
+            self.sum_rt += sign * response_time
+            self.count_rt += sign
+
+    def _set(self, user_chat_id: str, url: str, status: str, response_time: Optional[float]):
+        self.version += 1
+        key = (user_chat_id, url)
+        previous = self._entries.get(key)
+        if previous:
+            self._apply(*previous, -1)
+        else:
+            self._user_url_counts[user_chat_id] = self._user_url_counts.get(user_chat_id, 0) + 1
+        if status not in _STATUSES:
+            status = "pending"
+        self._entries[key] = (status, response_time)
+        self._apply(status, response_time, 1)
+
+    async def ensure_loaded(self, loader: Callable[[], Awaitable[Optional[Dict[str, Dict[str, Dict[str, Any]]]]]]):
+        """Seed the aggregates from `loader` (user_id -> url -> data) on first use
+
+        A loader returning None signals a failed scan; nothing is marked loaded,
+        so the next call tries again.
+        """
+        if self._loaded:
+            return
+        async with self._load_lock:
+            if self._loaded:
+                return
+            seed = await loader()
+            if seed is None:
+                return
+            for user_chat_id, user_urls in seed.items():
+                for url, data in user_urls.items():
+                    self._set(user_chat_id, url, data.get("status"), data.get("response_time"))
+            self._loaded = True
+
+    def url_added(self, user_chat_id: str, url: str):
+        """Count a newly added URL as pending until its first ping"""
+        if self._loaded:
+            self._set(user_chat_id, url, "pending", None)
+
+    def url_removed(self, user_chat_id: str, url: str):
+        """Drop a removed URL from the aggregates"""
+        previous = self._entries.pop((user_chat_id, url), None)
+        if previous is None:
+            return
+        self.version += 1
+        self._apply(*previous, -1)
+        remaining = self._user_url_counts[user_chat_id] - 1
+        if remaining:
+            self._user_url_counts[user_chat_id] = remaining
+        else:
+            del self._user_url_counts[user_chat_id]
+
+    def status_updated(self, user_chat_id: str, url: str, success: bool, response_time: Optional[float]):
+        """Apply a ping result for a monitored URL"""
+        if self._loaded and (user_chat_id, url) in self._entries:
+            self._set(user_chat_id, url, "online" if success else "offline", response_time)
@@ -5,14 +5,73 @@ Provides enhanced interactive elements, animations, and modern interface feature
 
 import asyncio
 import logging
+import time
+from itertools import islice
 from datetime import datetime
 from typing import Dict, List, Any, Optional, Tuple
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
+from telegram.constants import ParseMode
+from telegram.error import BadRequest, RetryAfter, TelegramError, TimedOut
 from telegram.ext import ContextTypes
-from utils import format_uptime_message, get_status_emoji, truncate_url
+from utils import format_uptime_message, get_status_emoji, truncate_url, short_url_hash, escape_markdown_v2, clock_time
 
 logger = logging.getLogger(__name__)
 
+# Status badges used by the URL dashboard cards
+_STATUS_INFO = {
+    "online": {"emoji": "🟢", "text": "ONLINE", "color": "✅"},
+    "offline": {"emoji": "🔴", "text": "OFFLINE", "color": "❌"},
+    "pending": {"emoji": "🟡", "text": "PENDING", "color": "⏳"}
+}
+_STATUS_DEFAULT = {"emoji": "⚪", "text": "UNKNOWN", "color": "❓"}
+
+# Status badges used by the URL detail view
+_STATUS_INDICATORS = {
+    "online": {"emoji": "🟢", "text": "ONLINE", "color": "🟢", "badge": "✅"},
+    "offline": {"emoji": "🔴", "text": "OFFLINE", "color": "🔴", "badge": "❌"},
+    "pending": {"emoji": "🟡", "text": "PENDING", "color": "🟡", "badge": "⏳"},
+    "unknown": {"emoji": "⚪", "text": "UNKNOWN", "color": "⚪", "badge": "❓"}
+}
+
+# (minimum uptime %, indicator) bands, highest first
+_DASHBOARD_HEALTH_BANDS = (
+    (95, "🟢 EXCELLENT"),
+    (80, "🟡 GOOD"),
+    (50, "🟠 WARNING"),
+)
+_DASHBOARD_HEALTH_DEFAULT = "🔴 CRITICAL"
+
+# (minimum uptime %, emoji, status, description) bands, highest first
+_STATS_HEALTH_BANDS = (
+    (98, "🟢", "EXCELLENT", "All systems optimal"),
+    (90, "🟡", "GOOD", "Performing well"),
+    (70, "🟠", "WARNING", "Some issues detected"),
+)
+_STATS_HEALTH_DEFAULT = (0, "🔴", "CRITICAL", "Needs immediate attention")
+
+# Buttons repeated across many keyboards; markups only read them, so share one instance
+_MAIN_MENU_BTN = InlineKeyboardButton("🏠 Main Menu", callback_data="main_menu")
+_MAIN_MENU_ROW = (_MAIN_MENU_BTN,)
+_ADD_URL_BTN = InlineKeyboardButton("➕ Add URL", callback_data="add_url_wizard")
+
+# (color, badge, value) shown in place of 24h uptime, which is not tracked per URL yet
+_PENDING_UPTIME = ("⚪", "⏳ Collecting data", "Not enough data yet")
+
+class _StaticKeyboardMarkup(InlineKeyboardMarkup):
+    """Inline keyboard that serializes itself once and reuses the result"""
+    
+    __slots__ = ("_cached_dict",)
+    
+    def __init__(self, inline_keyboard, **kwargs):
+        super().__init__(inline_keyboard, **kwargs)
+        # The markup is frozen after init, so bypass the read-only guard
+        object.__setattr__(self, "_cached_dict", super().to_dict())
+    
+    def to_dict(self, recursive: bool = True) -> Dict[str, Any]:
+        if not recursive:
+            return super().to_dict(recursive=False)
+        return dict(self._cached_dict)
+
 class AdvancedUI:
     def __init__(self, url_monitor, config):
         self.url_monitor = url_monitor
@@ -20,25 +79,55 @@ class AdvancedUI:
         self.loading_frames = ["⏳", "⌛", "⏳", "⌛"]
         self.progress_frames = ["▱▱▱▱▱", "▰▱▱▱▱", "▰▰▱▱▱", "▰▰▰▱▱", "▰▰▰▰▱", "▰▰▰▰▰"]
         
-    async def create_animated_loading(self, message, duration: int = 3):
-        """Create animated loading effect"""
-        original_text = message.text
+        # Static menus never change, so build them once and share the markups
+        self._main_menu = _StaticKeyboardMarkup(self._build_main_menu_keyboard().inline_keyboard)
+        self._stats_dashboard = _StaticKeyboardMarkup(self._build_stats_dashboard_keyboard().inline_keyboard)
+        self._quick_actions = _StaticKeyboardMarkup(self._build_quick_actions_keyboard().inline_keyboard)
+        self._settings = _StaticKeyboardMarkup(self._build_settings_keyboard().inline_keyboard)
+        
+        # Short callback IDs per URL, computed once and resolvable both ways
+        self._url_ids: Dict[str, str] = {}
+        self._url_by_id: Dict[str, str] = {}
+        
+    async def create_animated_loading(self, message, duration: int = 3,
+                                      cancel: Optional[asyncio.Event] = None):
+        """Create animated loading effect, stopping early once cancel is set"""
+        # Escape the static body once; only the frame changes between edits
+        body = " Processing\\.\\.\\.\n\n" + escape_markdown_v2(message.text or "")
+        frames = self.loading_frames
+        if cancel is None:
+            cancel = asyncio.Event()
         
         for i in range(duration * 2):  # 2 frames per second
-            frame = self.loading_frames[i % len(self.loading_frames)]
-            animated_text = f"{frame} Processing...\n\n{original_text}"
+            if cancel.is_set():
+                break
+            
+            animated_text = frames[i % len(frames)] + body
+            delay = 0.5
+            try:
+                await message.edit_text(animated_text, parse_mode=ParseMode.MARKDOWN_V2)
+            except RetryAfter as e:
+                delay = e.retry_after  # Back off as long as Telegram asks
+            except TimedOut:
+                pass  # Try again with the next frame
+            except TelegramError:
+                break  # Message was deleted or can no longer be edited
             
             try:
-                await message.edit_text(animated_text, parse_mode='Markdown')
-                await asyncio.sleep(0.5)
-            except Exception:
-                break  # Stop if message can't be edited
+                await asyncio.wait_for(cancel.wait(), timeout=delay)
+                break  # Cancelled while waiting for the next frame
+            except asyncio.TimeoutError:
+                pass
     
     def create_main_menu_keyboard(self) -> InlineKeyboardMarkup:
+        """Get the enhanced main menu keyboard"""
+        return self._main_menu
+    
+    def _build_main_menu_keyboard(self) -> InlineKeyboardMarkup:
         """Create enhanced main menu with modern design"""
         keyboard = [
             [
-                InlineKeyboardButton("➕ Add URL", callback_data="add_url_wizard"),
+                _ADD_URL_BTN,
                 InlineKeyboardButton("🗑️ Remove URL", callback_data="remove_url_menu")
             ],
             [
@@ -66,25 +155,27 @@ class AdvancedUI:
     def create_url_management_keyboard(self, urls: Dict[str, Any]) -> InlineKeyboardMarkup:
         """Create enhanced URL management interface"""
         keyboard = []
+        IKB = InlineKeyboardButton
+        id_for = self._id_for
         
         # Add URL cards (max 5 for clean display)
-        displayed_urls = list(urls.items())[:5]
-        for url, data in displayed_urls:
+        for url, data in islice(urls.items(), 5):
             status = data.get("status", "pending")
             emoji = get_status_emoji(status)
             short_url = truncate_url(url, 25)
+            url_id = id_for(url)
             
             keyboard.append([
-                InlineKeyboardButton(
+                IKB(
                     f"{emoji} {short_url}",
-                    callback_data=f"url_detail:{hash(url) % 10000}"
+                    callback_data=f"url_detail:{url_id}"
                 ),
-                InlineKeyboardButton("🗑️", callback_data=f"remove_url:{hash(url) % 10000}")
+                IKB("🗑️", callback_data=f"remove_url:{url_id}")
             ])
         
         # Action buttons
         keyboard.append([
-            InlineKeyboardButton("➕ Add URL", callback_data="add_url_wizard"),
+            _ADD_URL_BTN,
             InlineKeyboardButton("🔄 Refresh All", callback_data="refresh_urls")
         ])
         
@@ -93,9 +184,7 @@ class AdvancedUI:
                 InlineKeyboardButton("📋 View All", callback_data="view_all_urls")
             ])
         
-        keyboard.append([
-            InlineKeyboardButton("🏠 Main Menu", callback_data="main_menu")
-        ])
+        keyboard.append(_MAIN_MENU_ROW)
         
         return InlineKeyboardMarkup(keyboard)
     
@@ -108,16 +197,20 @@ class AdvancedUI:
                 InlineKeyboardButton("📭 No URLs to Remove", callback_data="no_action")
             ])
         else:
+            IKB = InlineKeyboardButton
+            id_for = self._id_for
+            
             # Add remove buttons for each URL
-            for url, data in list(urls.items())[:8]:  # Show max 8 URLs
+            for url, data in islice(urls.items(), 8):  # Show max 8 URLs
                 status = data.get("status", "pending")
                 emoji = get_status_emoji(status)
                 short_url = truncate_url(url, 30)
+                url_id = id_for(url)
                 
                 keyboard.append([
-                    InlineKeyboardButton(
+                    IKB(
                         f"🗑️ {emoji} {short_url}",
-                        callback_data=f"remove_url:{hash(url) % 10000}"
+                        callback_data=f"remove_url:{url_id}"
                     )
                 ])
             
@@ -129,17 +222,19 @@ class AdvancedUI:
         # Navigation buttons
         keyboard.extend([
             [
-                InlineKeyboardButton("➕ Add URL", callback_data="add_url_wizard"),
+                _ADD_URL_BTN,
                 InlineKeyboardButton("🌐 View URLs", callback_data="main_urls")
             ],
-            [
-                InlineKeyboardButton("🏠 Main Menu", callback_data="main_menu")
-            ]
+            _MAIN_MENU_ROW
         ])
         
         return InlineKeyboardMarkup(keyboard)
     
     def create_stats_dashboard_keyboard(self) -> InlineKeyboardMarkup:
+        """Get the statistics dashboard keyboard"""
+        return self._stats_dashboard
+    
+    def _build_stats_dashboard_keyboard(self) -> InlineKeyboardMarkup:
         """Create advanced statistics dashboard"""
         keyboard = [
             [
@@ -156,12 +251,16 @@ class AdvancedUI:
             ],
             [
                 InlineKeyboardButton("📱 Export Data", callback_data="export_data"),
-                InlineKeyboardButton("🏠 Main Menu", callback_data="main_menu")
+                _MAIN_MENU_BTN
             ]
         ]
         return InlineKeyboardMarkup(keyboard)
     
     def create_quick_actions_keyboard(self) -> InlineKeyboardMarkup:
+        """Get the quick action buttons"""
+        return self._quick_actions
+    
+    def _build_quick_actions_keyboard(self) -> InlineKeyboardMarkup:
         """Create quick action buttons"""
         keyboard = [
             [
@@ -172,13 +271,15 @@ class AdvancedUI:
                 InlineKeyboardButton("📱 Mobile View", callback_data="mobile_view"),
                 InlineKeyboardButton("💻 Desktop View", callback_data="desktop_view")
             ],
-            [
-                InlineKeyboardButton("🏠 Main Menu", callback_data="main_menu")
-            ]
+            _MAIN_MENU_ROW
         ]
         return InlineKeyboardMarkup(keyboard)
     
     def create_settings_keyboard(self) -> InlineKeyboardMarkup:
+        """Get the advanced settings keyboard"""
+        return self._settings
+    
+    def _build_settings_keyboard(self) -> InlineKeyboardMarkup:
         """Create advanced settings interface"""
         keyboard = [
             [
@@ -193,9 +294,7 @@ class AdvancedUI:
                 InlineKeyboardButton("🔒 Security", callback_data="security_settings"),
                 InlineKeyboardButton("💾 Data Management", callback_data="data_settings")
             ],
-            [
-                InlineKeyboardButton("🏠 Main Menu", callback_data="main_menu")
-            ]
+            _MAIN_MENU_ROW
         ]
         return InlineKeyboardMarkup(keyboard)
     
@@ -205,29 +304,58 @@ class AdvancedUI:
         progress_bar = self.progress_frames[progress_index]
         percentage = int((current_step / total_steps) * 100)
         
-        animated_text = f"🔄 **Processing URLs**\n\n"
-        animated_text += f"Progress: {progress_bar} {percentage}%\n"
-        animated_text += f"Step {current_step}/{total_steps}\n\n"
-        animated_text += "Please wait..."
+        animated_text = (
+            f"🔄 *Processing URLs*\n\n"
+            f"Progress: {progress_bar} {percentage}%\n"
+            f"Step {current_step}/{total_steps}\n\n"
+            "Please wait\\.\\.\\."
+        )
         
         try:
-            await message.edit_text(animated_text, parse_mode='Markdown')
-        except Exception:
-            pass  # Ignore edit errors
+            await message.edit_text(animated_text, parse_mode=ParseMode.MARKDOWN_V2)
+        except (BadRequest, RetryAfter, TimedOut):
+            pass  # Best effort; the next step redraws the progress bar
     
     def _generate_url_hash(self, url: str) -> str:
         """Generate consistent hash for URL"""
-        import hashlib
-        return hashlib.md5(url.encode()).hexdigest()[:8]
+        return short_url_hash(url)
+    
+    def _id_for(self, url: str) -> str:
+        """Get the cached callback ID for a URL"""
+        url_id = self._url_ids.get(url)
+        if url_id is None:
+            url_id = self._generate_url_hash(url)
+            self._url_ids[url] = url_id
+            self._url_by_id[url_id] = url
+        return url_id
+    
+    def get_url_by_id(self, url_id: str) -> Optional[str]:
+        """Resolve a callback ID back to its URL"""
+        return self._url_by_id.get(url_id)
+    
+    def _tally_statuses(self, urls: Dict[str, Any]) -> Tuple[int, int, int]:
+        """Count online, offline and pending URLs in a single pass"""
+        online_count = offline_count = pending_count = 0
+        for data in urls.values():
+            status = data.get("status", "")
+            if status == "online":
+                online_count += 1
+            elif status == "offline":
+                offline_count += 1
+            elif status in ("pending", "unknown"):
+                pending_count += 1
+        return online_count, offline_count, pending_count
     
     def format_enhanced_url_list(self, urls: Dict[str, Any], page: int = 0, per_page: int = 4) -> Tuple[str, InlineKeyboardMarkup]:
         """Format URL list with enhanced visual design and interactive elements"""
         if not urls:
-            message = "📭 **No URLs Being Monitored**\n\n"
-            message += "🚀 Ready to add your first URL?\n"
-            message += "Click **Add URL** to get started!"
+            message = (
+                "📭 **No URLs Being Monitored**\n\n"
+                "🚀 Ready to add your first URL?\n"
+                "Click **Add URL** to get started!"
+            )
             
-            keyboard = [[InlineKeyboardButton("➕ Add URL", callback_data="add_url_wizard")]]
+            keyboard = [[_ADD_URL_BTN]]
             return message, InlineKeyboardMarkup(keyboard)
         
         # Pagination
@@ -235,65 +363,63 @@ class AdvancedUI:
         start_idx = page * per_page
         end_idx = min(start_idx + per_page, total_urls)
         
-        url_items = list(urls.items())
-        current_urls = url_items[start_idx:end_idx]
+        total_pages = -(-total_urls // per_page)
+        current_urls = islice(urls.items(), start_idx, end_idx)
         
         # Enhanced header with real-time stats
-        online_count = sum(1 for data in urls.values() if data.get("status", "").lower() == "online")
-        offline_count = sum(1 for data in urls.values() if data.get("status", "").lower() == "offline")
-        pending_count = sum(1 for data in urls.values() if data.get("status", "").lower() in ["pending", "unknown"])
+        online_count, offline_count, pending_count = self._tally_statuses(urls)
         
         uptime_percentage = (online_count / total_urls * 100) if total_urls > 0 else 0
         
         # Health status indicator
-        if uptime_percentage >= 95:
-            health_indicator = "🟢 EXCELLENT"
-        elif uptime_percentage >= 80:
-            health_indicator = "🟡 GOOD"
-        elif uptime_percentage >= 50:
-            health_indicator = "🟠 WARNING"
-        else:
-            health_indicator = "🔴 CRITICAL"
+        health_indicator = _DASHBOARD_HEALTH_DEFAULT
+        for threshold, indicator in _DASHBOARD_HEALTH_BANDS:
+            if uptime_percentage >= threshold:
+                health_indicator = indicator
+                break
+        
+        now_ts = time.time()
+        now_str = clock_time()
+        
+        parts = [
+            f"🌐 **URL Dashboard** | {health_indicator}\n",
+            f"📊 **{total_urls} URLs** | 🟢 {online_count} | 🔴 {offline_count} | 🟡 {pending_count}\n",
+            f"📈 **Uptime: {uptime_percentage:.1f}%** | 🕐 {now_str}\n",
+            "─" * 40 + "\n\n"
+        ]
+        parts_append = parts.append
         
-        message = f"🌐 **URL Dashboard** | {health_indicator}\n"
-        message += f"📊 **{total_urls} URLs** | 🟢 {online_count} | 🔴 {offline_count} | 🟡 {pending_count}\n"
-        message += f"📈 **Uptime: {uptime_percentage:.1f}%** | 🕐 {datetime.now().strftime('%H:%M:%S')}\n"
-        message += "─" * 40 + "\n\n"
+        # Message cards and their action buttons (max 4 URLs per page for clean layout)
+        url_buttons = []
+        IKB = InlineKeyboardButton
+        id_for = self._id_for
         
         for i, (url, data) in enumerate(current_urls, 1):
             status = data.get("status", "pending")
             last_check = data.get("last_check")
+            last_check_ts = data.get("last_check_ts")
             response_time = data.get("response_time")
-            added_at = data.get("added_at")
             
             # Enhanced status indicators
-            status_info = {
-                "online": {"emoji": "🟢", "text": "ONLINE", "color": "✅"},
-                "offline": {"emoji": "🔴", "text": "OFFLINE", "color": "❌"},
-                "pending": {"emoji": "🟡", "text": "PENDING", "color": "⏳"}
-            }
-            status_data = status_info.get(status, {"emoji": "⚪", "text": "UNKNOWN", "color": "❓"})
+            status_data = _STATUS_INFO.get(status, _STATUS_DEFAULT)
             
             # Create card-like layout for each URL
-            message += f"**[{start_idx + i}]** {status_data['color']} **{status_data['text']}**\n"
-            message += f"🌐 `{truncate_url(url, 45)}`\n"
+            parts_append(f"**[{start_idx + i}]** {status_data['color']} **{status_data['text']}**\n")
+            parts_append(f"🌐 `{truncate_url(url, 45)}`\n")
             
             # Time and performance metrics
             time_info = []
-            if last_check:
-                try:
-                    check_time = datetime.fromisoformat(last_check)
-                    now = datetime.now()
-                    time_diff = (now - check_time).total_seconds()
-                    
-                    if time_diff < 60:
-                        time_info.append(f"🕐 {int(time_diff)}s ago")
-                    elif time_diff < 3600:
-                        time_info.append(f"🕐 {int(time_diff/60)}m ago")
-                    else:
-                        time_info.append(f"🕐 {check_time.strftime('%H:%M')}")
-                except:
-                    time_info.append(f"🕐 {last_check}")
+            if last_check_ts is not None:
+                time_diff = now_ts - last_check_ts
+                
+                if time_diff < 60:
+                    time_info.append(f"🕐 {int(time_diff)}s ago")
+                elif time_diff < 3600:
+                    time_info.append(f"🕐 {int(time_diff/60)}m ago")
+                else:
+                    time_info.append(f"🕐 {datetime.fromtimestamp(last_check_ts).strftime('%H:%M')}")
+            elif last_check:
+                time_info.append(f"🕐 {last_check}")
             else:
                 time_info.append("🕐 Never")
             
@@ -307,40 +433,33 @@ class AdvancedUI:
                 time_info.append(speed_info)
             
             if time_info:
-                message += f"📋 {' | '.join(time_info)}\n"
+                parts_append(f"📋 {' | '.join(time_info)}\n")
             
             # Add uptime calculation for individual URLs (if available)
             if status == "online":
-                message += f"💚 Active"
+                parts_append("💚 Active")
             elif status == "offline":
-                message += f"💔 Down"
+                parts_append("💔 Down")
             else:
-                message += f"🔄 Checking"
+                parts_append("🔄 Checking")
             
-            message += "\n" + "─" * 35 + "\n\n"
-        
-        # Create enhanced interactive keyboard
-        keyboard = []
-        
-        # Individual URL action buttons (max 4 URLs per page for clean layout)
-        url_buttons = []
-        for i, (url, data) in enumerate(current_urls, 1):
-            url_hash = self._generate_url_hash(url)
-            status_emoji = "🟢" if data.get("status") == "online" else "🔴" if data.get("status") == "offline" else "🟡"
+            parts_append("\n" + "─" * 35 + "\n\n")
             
+            url_hash = id_for(url)
             url_buttons.append([
-                InlineKeyboardButton(f"{status_emoji} URL {start_idx + i}", callback_data=f"url_detail:{url_hash}"),
-                InlineKeyboardButton("🔄", callback_data=f"test_url:{url_hash}"),
-                InlineKeyboardButton("🗑️", callback_data=f"remove_url:{url_hash}")
+                IKB(f"{status_data['emoji']} URL {start_idx + i}", callback_data=f"url_detail:{url_hash}"),
+                IKB("🔄", callback_data=f"test_url:{url_hash}"),
+                IKB("🗑️", callback_data=f"remove_url:{url_hash}")
             ])
         
-        keyboard.extend(url_buttons)
+        # Create enhanced interactive keyboard
+        keyboard = url_buttons
         
         # Pagination controls
         nav_buttons = []
         if page > 0:
             nav_buttons.append(InlineKeyboardButton("◀️ Prev", callback_data=f"urls_page:{page-1}"))
-        nav_buttons.append(InlineKeyboardButton(f"📄 {page + 1}/{(total_urls - 1) // per_page + 1}", callback_data="no_action"))
+        nav_buttons.append(InlineKeyboardButton(f"📄 {page + 1}/{total_pages}", callback_data="no_action"))
         if end_idx < total_urls:
             nav_buttons.append(InlineKeyboardButton("Next ▶️", callback_data=f"urls_page:{page+1}"))
         
@@ -350,7 +469,7 @@ class AdvancedUI:
         # Enhanced action buttons
         keyboard.extend([
             [
-                InlineKeyboardButton("➕ Add URL", callback_data="add_url_wizard"),
+                _ADD_URL_BTN,
                 InlineKeyboardButton("🔄 Refresh All", callback_data="refresh_urls"),
                 InlineKeyboardButton("⚡ Test All", callback_data="quick_ping")
             ],
@@ -358,86 +477,102 @@ class AdvancedUI:
                 InlineKeyboardButton("📊 Detailed Stats", callback_data="main_stats"),
                 InlineKeyboardButton("⚙️ Settings", callback_data="main_settings")
             ],
-            [
-                InlineKeyboardButton("🏠 Main Menu", callback_data="main_menu")
-            ]
+            _MAIN_MENU_ROW
         ])
         
-        return message, InlineKeyboardMarkup(keyboard)
+        return "".join(parts), InlineKeyboardMarkup(keyboard)
     
     def format_advanced_stats(self, urls: Dict[str, Any]) -> Tuple[str, InlineKeyboardMarkup]:
         """Format comprehensive statistics dashboard with visual elements"""
         if not urls:
-            message = "📊 **Analytics Dashboard**\n\n"
-            message += "📭 No monitoring data available yet.\n\n"
-            message += "🚀 **Get Started:**\n"
-            message += "• Add URLs to begin monitoring\n"
-            message += "• View real-time statistics\n"
-            message += "• Track performance trends"
+            message = (
+                "📊 **Analytics Dashboard**\n\n"
+                "📭 No monitoring data available yet.\n\n"
+                "🚀 **Get Started:**\n"
+                "• Add URLs to begin monitoring\n"
+                "• View real-time statistics\n"
+                "• Track performance trends"
+            )
             
             keyboard = [
                 [InlineKeyboardButton("➕ Add First URL", callback_data="add_url_wizard")],
-                [InlineKeyboardButton("🏠 Main Menu", callback_data="main_menu")]
+                _MAIN_MENU_ROW
             ]
             return message, InlineKeyboardMarkup(keyboard)
         
+        now_str = clock_time()
+        
         # Enhanced header
-        message = "📊 **COMPREHENSIVE ANALYTICS DASHBOARD**\n"
-        message += f"🕐 **Live Data | {datetime.now().strftime('%H:%M:%S')}**\n"
-        message += "═" * 45 + "\n\n"
+        parts = ["📊 **COMPREHENSIVE ANALYTICS DASHBOARD**\n"]
+        parts_append = parts.append
+        parts_append(f"🕐 **Live Data | {now_str}**\n")
+        parts_append("═" * 45 + "\n\n")
         
-        # Calculate comprehensive stats
+        # Calculate comprehensive stats (statuses, response times and the
+        # online ranking) in a single pass over the URLs
         total_urls = len(urls)
-        online_count = sum(1 for data in urls.values() if data.get("status", "").lower() == "online")
-        offline_count = sum(1 for data in urls.values() if data.get("status", "").lower() == "offline")
-        pending_count = sum(1 for data in urls.values() if data.get("status", "").lower() in ["pending", "unknown"])
+        online_count = offline_count = pending_count = 0
+        rt_count = 0
+        sum_rt = 0.0
+        min_rt = float('inf')
+        max_rt = 0.0
+        online_rts = []
+        online_rts_append = online_rts.append
+        no_rt = float('inf')
+        
+        for url, data in urls.items():
+            status = data.get("status", "")
+            response_time = data.get("response_time")
+            
+            if response_time:
+                rt_count += 1
+                sum_rt += response_time
+                if response_time < min_rt:
+                    min_rt = response_time
+                if response_time > max_rt:
+                    max_rt = response_time
+            
+            if status == "online":
+                online_count += 1
+                online_rts_append((response_time if response_time and response_time > 0 else no_rt, url))
+            elif status == "offline":
+                offline_count += 1
+            elif status in ("pending", "unknown"):
+                pending_count += 1
         
         overall_uptime = (online_count / total_urls * 100) if total_urls > 0 else 0
         
         # Enhanced health analysis
-        if overall_uptime >= 98:
-            health_emoji = "🟢"
-            health_status = "EXCELLENT"
-            health_description = "All systems optimal"
-        elif overall_uptime >= 90:
-            health_emoji = "🟡"
-            health_status = "GOOD"
-            health_description = "Performing well"
-        elif overall_uptime >= 70:
-            health_emoji = "🟠"
-            health_status = "WARNING"
-            health_description = "Some issues detected"
-        else:
-            health_emoji = "🔴"
-            health_status = "CRITICAL"
-            health_description = "Needs immediate attention"
+        health_band = _STATS_HEALTH_DEFAULT
+        for band in _STATS_HEALTH_BANDS:
+            if overall_uptime >= band[0]:
+                health_band = band
+                break
+        _, health_emoji, health_status, health_description = health_band
         
         # System Health Section
-        message += f"🎯 **SYSTEM HEALTH**\n"
-        message += f"{health_emoji} **Status:** {health_status}\n"
-        message += f"📈 **Uptime:** {overall_uptime:.1f}%\n"
-        message += f"💡 **Assessment:** {health_description}\n"
-        message += "─" * 35 + "\n\n"
+        parts_append(f"🎯 **SYSTEM HEALTH**\n")
+        parts_append(f"{health_emoji} **Status:** {health_status}\n")
+        parts_append(f"📈 **Uptime:** {overall_uptime:.1f}%\n")
+        parts_append(f"💡 **Assessment:** {health_description}\n")
+        parts_append("─" * 35 + "\n\n")
         
         # Service Overview
-        message += f"🌐 **SERVICE OVERVIEW**\n"
-        message += f"📊 **Total Services:** {total_urls}\n"
-        message += f"🟢 **Online:** {online_count} ({online_count/total_urls*100:.1f}%)\n"
-        message += f"🔴 **Offline:** {offline_count} ({offline_count/total_urls*100:.1f}%)\n"
-        message += f"🟡 **Checking:** {pending_count} ({pending_count/total_urls*100:.1f}%)\n"
-        message += "─" * 35 + "\n\n"
+        parts_append(f"🌐 **SERVICE OVERVIEW**\n")
+        parts_append(f"📊 **Total Services:** {total_urls}\n")
+        parts_append(f"🟢 **Online:** {online_count} ({online_count/total_urls*100:.1f}%)\n")
+        parts_append(f"🔴 **Offline:** {offline_count} ({offline_count/total_urls*100:.1f}%)\n")
+        parts_append(f"🟡 **Checking:** {pending_count} ({pending_count/total_urls*100:.1f}%)\n")
+        parts_append("─" * 35 + "\n\n")
         
         # Performance Metrics
-        response_times = [data.get("response_time", 0) for data in urls.values() if data.get("response_time")]
-        if response_times:
-            avg_response = sum(response_times) / len(response_times)
-            min_response = min(response_times)
-            max_response = max(response_times)
+        if rt_count:
+            avg_response = sum_rt / rt_count
             
-            message += f"⚡ **PERFORMANCE METRICS**\n"
-            message += f"📊 **Avg Response:** {avg_response:.2f}s\n"
-            message += f"🚀 **Fastest:** {min_response:.2f}s\n"
-            message += f"🐌 **Slowest:** {max_response:.2f}s\n"
+            parts_append(f"⚡ **PERFORMANCE METRICS**\n")
+            parts_append(f"📊 **Avg Response:** {avg_response:.2f}s\n")
+            parts_append(f"🚀 **Fastest:** {min_rt:.2f}s\n")
+            parts_append(f"🐌 **Slowest:** {max_rt:.2f}s\n")
             
             # Performance grade
             if avg_response < 1.0:
@@ -449,39 +584,36 @@ class AdvancedUI:
             else:
                 perf_grade = "🥉 Needs Improvement"
             
-            message += f"🏅 **Grade:** {perf_grade}\n"
-            message += "─" * 35 + "\n\n"
+            parts_append(f"🏅 **Grade:** {perf_grade}\n")
+            parts_append("─" * 35 + "\n\n")
         
         # Top Performing URLs
-        message += f"🏆 **TOP PERFORMING URLS**\n"
-        online_urls = [(url, data) for url, data in urls.items() if data.get("status", "").lower() == "online"]
-        
-        if online_urls:
-            # Sort by response time (fastest first)
-            online_urls.sort(key=lambda x: x[1].get("response_time", float('inf')))
-            for i, (url, data) in enumerate(online_urls[:3], 1):
-                response_time = data.get("response_time", 0)
-                if response_time and response_time > 0:
+        parts_append(f"🏆 **TOP PERFORMING URLS**\n")
+        if online_rts:
+            # Sort by response time (fastest first, unmeasured last)
+            online_rts.sort()
+            for i, (response_time, url) in enumerate(online_rts[:3], 1):
+                if response_time != no_rt:
                     if response_time < 1.0:
                         speed_emoji = "🚀"
                     elif response_time < 2.0:
                         speed_emoji = "⚡"
                     else:
                         speed_emoji = "🟡"
-                    message += f"{i}. {speed_emoji} `{truncate_url(url, 25)}` ({response_time:.2f}s)\n"
+                    parts_append(f"{i}. {speed_emoji} `{truncate_url(url, 25)}` ({response_time:.2f}s)\n")
                 else:
-                    message += f"{i}. ⚪ `{truncate_url(url, 25)}` (No data)\n"
+                    parts_append(f"{i}. ⚪ `{truncate_url(url, 25)}` (No data)\n")
         else:
-            message += "📭 No online URLs to display\n"
+            parts_append("📭 No online URLs to display\n")
         
-        message += "─" * 35 + "\n\n"
+        parts_append("─" * 35 + "\n\n")
         
         # Monitoring Status
-        message += f"🔧 **MONITORING STATUS**\n"
-        message += f"🔄 **Check Interval:** Every 60 seconds\n"
-        message += f"💾 **Storage:** Notion Database\n"
-        message += f"🌍 **Region:** Global monitoring\n"
-        message += f"📡 **Next Check:** {(datetime.now().second % 60)} seconds\n"
+        parts_append(f"🔧 **MONITORING STATUS**\n")
+        parts_append(f"🔄 **Check Interval:** Every 60 seconds\n")
+        parts_append(f"💾 **Storage:** Notion Database\n")
+        parts_append(f"🌍 **Region:** Global monitoring\n")
+        parts_append(f"📡 **Next Check:** {time.localtime().tm_sec} seconds\n")
         
         # Enhanced action buttons
         keyboard = [
@@ -499,42 +631,11 @@ class AdvancedUI:
             ],
             [
                 InlineKeyboardButton("⚙️ Monitoring Settings", callback_data="main_settings"),
-                InlineKeyboardButton("🏠 Main Menu", callback_data="main_menu")
+                _MAIN_MENU_BTN
             ]
         ]
         
-        return message, InlineKeyboardMarkup(keyboard)
-        
-        # Individual URL stats (top 3)
-        message += "🏆 **Top Performing URLs**\n"
-        online_urls = [(url, data) for url, data in urls.items() if data.get("status", "").lower() == "online"]
-        
-        if online_urls:
-            # Sort by response time (fastest first)
-            online_urls.sort(key=lambda x: x[1].get("response_time", float('inf')))
-            for i, (url, data) in enumerate(online_urls[:3], 1):
-                response_time = data.get("response_time", 0)
-                if response_time and response_time > 0:
-                    message += f"{i}. ⚡ `{truncate_url(url, 30)}` ({response_time:.3f}s)\n"
-                else:
-                    message += f"{i}. ⚡ `{truncate_url(url, 30)}` (Testing...)\n"
-        else:
-            message += "No online URLs currently\n"
-        
-        message += f"\n🕐 **Last Updated:** {datetime.now().strftime('%H:%M:%S')}"
-        
-        keyboard = [
-            [
-                InlineKeyboardButton("📊 Detailed Stats", callback_data="detailed_stats"),
-                InlineKeyboardButton("📈 Trends", callback_data="stats_trends")
-            ],
-            [
-                InlineKeyboardButton("🔄 Refresh", callback_data="main_stats"),
-                InlineKeyboardButton("🏠 Main Menu", callback_data="main_menu")
-            ]
-        ]
-        
-        return message, InlineKeyboardMarkup(keyboard)
+        return "".join(parts), InlineKeyboardMarkup(keyboard)
     
     def create_url_detail_view(self, url: str, url_data: Dict[str, Any]) -> Tuple[str, InlineKeyboardMarkup]:
         """Create enhanced detailed view for a specific URL with comprehensive metrics"""
@@ -545,36 +646,31 @@ class AdvancedUI:
         username = url_data.get("username", "Unknown")
         
         # Enhanced status indicators
-        status_indicators = {
-            "online": {"emoji": "🟢", "text": "ONLINE", "color": "🟢", "badge": "✅"},
-            "offline": {"emoji": "🔴", "text": "OFFLINE", "color": "🔴", "badge": "❌"},
-            "pending": {"emoji": "🟡", "text": "PENDING", "color": "🟡", "badge": "⏳"},
-            "unknown": {"emoji": "⚪", "text": "UNKNOWN", "color": "⚪", "badge": "❓"}
-        }
-        status_info = status_indicators.get(status, status_indicators["unknown"])
+        status_info = _STATUS_INDICATORS.get(status, _STATUS_INDICATORS["unknown"])
         
         # Header with status badge
-        message = f"🔍 **URL ANALYTICS DASHBOARD**\n"
-        message += f"{status_info['badge']} **STATUS: {status_info['text']}**\n"
-        message += "═" * 35 + "\n\n"
+        parts = [f"🔍 **URL ANALYTICS DASHBOARD**\n"]
+        parts_append = parts.append
+        parts_append(f"{status_info['badge']} **STATUS: {status_info['text']}**\n")
+        parts_append("═" * 35 + "\n\n")
         
         # URL Information
-        message += f"🌐 **Website:** `{url}`\n"
+        parts_append(f"🌐 **Website:** `{url}`\n")
         
         # Domain extraction for better display
         try:
             from urllib.parse import urlparse
             parsed = urlparse(url)
             domain = parsed.netloc
-            message += f"🏠 **Domain:** `{domain}`\n"
+            parts_append(f"🏠 **Domain:** `{domain}`\n")
         except:
             pass
         
-        message += f"👤 **Added by:** {username}\n"
-        message += "─" * 30 + "\n\n"
+        parts_append(f"👤 **Added by:** {username}\n")
+        parts_append("─" * 30 + "\n\n")
         
         # Performance Metrics
-        message += "⚡ **PERFORMANCE METRICS**\n"
+        parts_append("⚡ **PERFORMANCE METRICS**\n")
         
         if response_time is not None:
             # Enhanced response time analysis
@@ -594,110 +690,92 @@ class AdvancedUI:
                 speed_analysis = "🔴 Very Slow"
                 speed_emoji = "🔴"
             
-            message += f"{speed_emoji} **Response Time:** {response_time:.3f}s\n"
-            message += f"📊 **Speed Rating:** {speed_analysis}\n"
+            parts_append(f"{speed_emoji} **Response Time:** {response_time:.3f}s\n")
+            parts_append(f"📊 **Speed Rating:** {speed_analysis}\n")
         else:
-            message += f"⏱️ **Response Time:** Not measured\n"
+            parts_append(f"⏱️ **Response Time:** Not measured\n")
         
         # Time Information
-        message += "─" * 20 + "\n"
-        message += "🕐 **TIMING INFORMATION**\n"
+        parts_append("─" * 20 + "\n")
+        parts_append("🕐 **TIMING INFORMATION**\n")
         
-        if last_check:
-            try:
-                check_time = datetime.fromisoformat(last_check)
-                now = datetime.now()
-                time_diff = (now - check_time).total_seconds()
-                
-                # Human-readable time difference
-                if time_diff < 60:
-                    last_check_display = f"{int(time_diff)} seconds ago"
-                elif time_diff < 3600:
-                    last_check_display = f"{int(time_diff/60)} minutes ago"
-                elif time_diff < 86400:
-                    last_check_display = f"{int(time_diff/3600)} hours ago"
-                else:
-                    last_check_display = check_time.strftime("%Y-%m-%d %H:%M")
-                
-                message += f"🔍 **Last Check:** {last_check_display}\n"
-                message += f"📅 **Exact Time:** {check_time.strftime('%Y-%m-%d %H:%M:%S')}\n"
-            except:
-                message += f"🔍 **Last Check:** {last_check}\n"
-        else:
-            message += f"🔍 **Last Check:** Never checked\n"
+        now_ts = time.time()
+        last_check_ts = url_data.get("last_check_ts")
+        added_at_ts = url_data.get("added_at_ts")
         
-        if added_at:
-            try:
-                added_time = datetime.fromisoformat(added_at)
-                days_monitoring = (datetime.now() - added_time).days
-                message += f"📅 **Monitoring Since:** {added_time.strftime('%Y-%m-%d')}\n"
-                message += f"📈 **Days Monitored:** {days_monitoring} days\n"
-            except:
-                message += f"📅 **Added:** {added_at}\n"
-        
-        # Mock uptime stats (can be replaced with real data later)
-        import random
-        if status == "online":
-            uptime = random.uniform(95, 99.9)
-        elif status == "offline":
-            uptime = random.uniform(60, 85)
-        else:
-            uptime = random.uniform(85, 95)
-        
-        message += "─" * 20 + "\n"
-        message += "📊 **AVAILABILITY METRICS**\n"
-        
-        if uptime >= 99:
-            performance_badge = "🏆 Excellent"
-            uptime_color = "🟢"
-        elif uptime >= 95:
-            performance_badge = "🥇 Good"
-            uptime_color = "🟡"
-        elif uptime >= 80:
-            performance_badge = "🥈 Fair"
-            uptime_color = "🟠"
+        if last_check_ts is not None:
+            check_time = datetime.fromtimestamp(last_check_ts)
+            time_diff = now_ts - last_check_ts
+            
+            # Human-readable time difference
+            if time_diff < 60:
+                last_check_display = f"{int(time_diff)} seconds ago"
+            elif time_diff < 3600:
+                last_check_display = f"{int(time_diff/60)} minutes ago"
+            elif time_diff < 86400:
+                last_check_display = f"{int(time_diff/3600)} hours ago"
+            else:
+                last_check_display = check_time.strftime("%Y-%m-%d %H:%M")
+            
+            parts_append(f"🔍 **Last Check:** {last_check_display}\n")
+            parts_append(f"📅 **Exact Time:** {check_time.strftime('%Y-%m-%d %H:%M:%S')}\n")
+        elif last_check:
+            parts_append(f"🔍 **Last Check:** {last_check}\n")
         else:
-            performance_badge = "🥉 Poor"
-            uptime_color = "🔴"
+            parts_append(f"🔍 **Last Check:** Never checked\n")
+        
+        if added_at_ts is not None:
+            days_monitoring = int((now_ts - added_at_ts) // 86400)
+            parts_append(f"📅 **Monitoring Since:** {datetime.fromtimestamp(added_at_ts).strftime('%Y-%m-%d')}\n")
+            parts_append(f"📈 **Days Monitored:** {days_monitoring} days\n")
+        elif added_at:
+            parts_append(f"📅 **Added:** {added_at}\n")
+        
+        parts_append("─" * 20 + "\n")
+        parts_append("📊 **AVAILABILITY METRICS**\n")
+        
+        # No per-URL ping history is kept yet, so availability is a fixed placeholder
+        uptime_color, performance_badge, uptime_line = _PENDING_UPTIME
         
-        message += f"{uptime_color} **24h Uptime:** {uptime:.1f}%\n"
-        message += f"🏅 **Performance Grade:** {performance_badge}\n"
+        parts_append(f"{uptime_color} **24h Uptime:** {uptime_line}\n")
+        parts_append(f"🏅 **Performance Grade:** {performance_badge}\n")
         
         # Additional insights
-        message += "─" * 20 + "\n"
-        message += "💡 **QUICK INSIGHTS**\n"
+        parts_append("─" * 20 + "\n")
+        parts_append("💡 **QUICK INSIGHTS**\n")
         
         if status == "online":
-            message += "✅ Website is responding normally\n"
+            parts_append("✅ Website is responding normally\n")
             if response_time and response_time < 1.0:
-                message += "⚡ Fast response times detected\n"
+                parts_append("⚡ Fast response times detected\n")
         elif status == "offline":
-            message += "❌ Website appears to be down\n"
-            message += "🔧 Consider checking server status\n"
+            parts_append("❌ Website appears to be down\n")
+            parts_append("🔧 Consider checking server status\n")
         else:
-            message += "🔄 Initial monitoring in progress\n"
+            parts_append("🔄 Initial monitoring in progress\n")
         
         # Enhanced action buttons
+        url_id = self._id_for(url)
         keyboard = [
             [
-                InlineKeyboardButton("🔄 Test Now", callback_data=f"test_url:{hash(url) % 10000}"),
-                InlineKeyboardButton("📊 Full Analytics", callback_data=f"url_stats:{hash(url) % 10000}")
+                InlineKeyboardButton("🔄 Test Now", callback_data=f"test_url:{url_id}"),
+                InlineKeyboardButton("📊 Full Analytics", callback_data=f"url_stats:{url_id}")
             ],
             [
-                InlineKeyboardButton("📈 Historical Data", callback_data=f"url_history:{hash(url) % 10000}"),
-                InlineKeyboardButton("⚙️ Configure", callback_data=f"url_settings:{hash(url) % 10000}")
+                InlineKeyboardButton("📈 Historical Data", callback_data=f"url_history:{url_id}"),
+                InlineKeyboardButton("⚙️ Configure", callback_data=f"url_settings:{url_id}")
             ],
             [
-                InlineKeyboardButton("🗑️ Remove URL", callback_data=f"remove_url:{hash(url) % 10000}"),
-                InlineKeyboardButton("📋 Copy URL", callback_data=f"copy_url:{hash(url) % 10000}")
+                InlineKeyboardButton("🗑️ Remove URL", callback_data=f"remove_url:{url_id}"),
+                InlineKeyboardButton("📋 Copy URL", callback_data=f"copy_url:{url_id}")
             ],
             [
                 InlineKeyboardButton("◀️ Back to Dashboard", callback_data="main_urls"),
-                InlineKeyboardButton("🏠 Main Menu", callback_data="main_menu")
+                _MAIN_MENU_BTN
             ]
         ]
         
-        return message, InlineKeyboardMarkup(keyboard)
+        return "".join(parts), InlineKeyboardMarkup(keyboard)
     
     async def show_typing_animation(self, chat_id, bot, duration: int = 2):
         """Show typing indicator for better UX"""
@@ -3,46 +3,647 @@ Telegram bot command handlers and message processing
 Enhanced with advanced UI and interactive features
 """
 
+import html
 import logging
 import asyncio
+import functools
+import time
+from collections import Counter
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, FrozenSet, Optional, Set, Tuple
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.constants import ParseMode
+from telegram.error import BadRequest, Forbidden, RetryAfter, TimedOut
 from telegram.ext import ContextTypes, CallbackContext
 from url_monitor import URLMonitor
 from config import Config
-from utils import format_uptime_message, format_url_list, validate_url
+from utils import format_uptime_message, format_url_list, validate_url, short_url_hash, escape_markdown, clock_time
 from advanced_ui import AdvancedUI
 from notion_data_manager import NotionDataManager
+from rate_limiter import AsyncTokenBucket
+from ttl_cache import AsyncTTLCache
+from admin_stats import AdminStatsCache
 
 logger = logging.getLogger(__name__)
 
+# Maximum broadcast sends in flight at once (Telegram allows ~30 messages/sec)
+_BROADCAST_CONCURRENCY = 25
+
+# Broadcast failure categories, checked in order
+_BROADCAST_FAILURE_REASONS = (
+    (Forbidden, "blocked"),
+    (BadRequest, "invalid_chat"),
+    (RetryAfter, "rate_limited"),
+    (TimedOut, "timeout"),
+)
+
+# Sustained broadcast send rate and burst, kept just under Telegram's global limit
+_BROADCAST_RATE = 28
+_BROADCAST_BURST = 30
+
+# Seconds a Notion URL listing is reused before fetching it again
+_URL_CACHE_TTL = 10.0
+
+# Seconds the broadcast recipient set is reused between broadcasts
+_BROADCAST_IDS_TTL = 30.0
+
+# Per-URL status icons for stored statuses and live ping results
+_STATUS_ICON = {"online": "🟢", "offline": "🔴", "pending": "⏳"}
+_PING_RESULT_LABEL = {True: ("🟢", "Online"), False: ("🔴", "Offline")}
+
+# Most recent callback messages whose rendered content is remembered
+_LAST_RENDERED_MAX = 1024
+
+# Minimum seconds between broadcast progress edits
+_PROGRESS_EDIT_INTERVAL = 1.0
+
+# Minimum seconds between partial /pingnow result edits
+_PING_EDIT_INTERVAL = 1.5
+
+# Seconds a rendered system analytics dashboard is reused while the stats are unchanged
+_ANALYTICS_RENDER_TTL = 5.0
+
+# System analytics labels: (minimum uptime %, label) bands, highest first
+_ANALYTICS_HEALTH_BANDS = ((95, "🟢 Excellent"), (80, "🟡 Good"))
+_ANALYTICS_QUALITY_BANDS = ((99, "Excellent"), (95, "Good"))
+# (response time below, grade) bands, fastest first
+_ANALYTICS_GRADE_BANDS = ((1, "A+"), (2, "A"), (3, "B"))
+
+# Chats whose URL hash mappings are kept; the least recently used are dropped
+_URL_HASH_MAP_MAX_CHATS = 1024
+
+# Toasts shown when answering slower callbacks, keyed by callback data or its prefix
+_CALLBACK_TOASTS = {
+    "main_urls": "📊 Loading enhanced dashboard...",
+    "urls_page": "📄 Loading page...",
+    "url_detail": "📊 Loading URL analytics...",
+    "confirm_remove": "🗑️ Removing URL...",
+    "system_analytics": "📊 Loading analytics...",
+}
+
+# Static messages and keyboards, built once at import time
+_WELCOME_TEMPLATE = (
+    "👋 Welcome {username}!\n\n"
+    "🚀 **URL Monitor Bot** 🚀\n\n"
+    "Monitor your websites and get instant alerts when they go down!\n\n"
+    "✨ **Features:**\n"
+    "📊 Real-time monitoring every 60 seconds\n"
+    "⚡ Response time tracking\n"
+    "🔔 Instant downtime alerts\n"
+    "📈 Statistics and trends\n"
+    "💾 All data stored securely in Notion\n\n"
+    "Start by adding your first URL to monitor:"
+)
+
+_HELP_MSG = (
+    "🆘 **Help - URL Monitor Bot** 🆘\n\n"
+    "🚀 **Available Commands:**\n"
+    "📌 `/seturl <url>` - Add URL to monitor\n"
+    "🗑️ `/removeurl <url>` - Remove URL from monitoring\n"
+    "📋 `/listurls` - View all your monitored URLs\n"
+    "📊 `/status` - View statistics and status\n"
+    "🔄 `/pingnow` - Test all URLs immediately\n\n"
+    "💾 **Notion Integration:**\n"
+    "• All your data is stored securely in Notion database\n"
+    "• Each user has their own separate data\n"
+    "• Real-time monitoring every 60 seconds\n\n"
+    "🎨 **Status Indicators:**\n"
+    "🟢 Online - Website is working\n"
+    "🔴 Offline - Website is down\n"
+    "⏳ Pending - First check in progress\n\n"
+    "💡 **Tips:**\n"
+    "• Start by adding a URL with /seturl\n"
+    "• Check your dashboard regularly\n"
+    "• You'll get instant alerts for downtime"
+)
+
+_HELP_MENU_MSG = (
+    "ℹ️ **Help & Support** ℹ️\n\n"
+    "🚀 **Quick Start Guide:**\n"
+    "1️⃣ Click '➕ Add URL' to start monitoring\n"
+    "2️⃣ Enter your website URL\n"
+    "3️⃣ Monitor real-time status\n"
+    "4️⃣ Get instant downtime alerts\n\n"
+    "🎛️ **Available Features:**\n"
+    "• 🌐 URL Management Dashboard\n"
+    "• 📊 Real-time Statistics\n"
+    "• ⚡ Instant Ping Testing\n"
+    "• 🔔 Downtime Alerts\n"
+    "• 📈 Performance Analytics\n\n"
+    "💡 **Pro Tips:**\n"
+    "• Monitor every 60 seconds automatically\n"
+    "• Get alerts immediately when sites go down\n"
+    "• View response time trends\n"
+    "• All data stored securely in Notion\n\n"
+    "❓ **Need More Help?**\n"
+    "Use the /help command for detailed instructions!"
+)
+
+_ADD_URL_WIZARD_MSG = (
+    "➕ **Add URL Wizard** ➕\n\n"
+    "🎯 **Ready to monitor a new website!**\n\n"
+    "📋 **How to add a URL:**\n"
+    "1️⃣ Use command: `/seturl <your-url>`\n"
+    "2️⃣ Example: `/seturl https://myapp.com`\n"
+    "3️⃣ Bot will start monitoring immediately\n\n"
+    "✅ **Supported URLs:**\n"
+    "• https://example.com\n"
+    "• http://example.com\n"
+    "• https://api.example.com/health\n"
+    "• Any publicly accessible URL\n\n"
+    "⚡ **What happens next:**\n"
+    "• Instant connectivity test\n"
+    "• Automatic monitoring every 60 seconds\n"
+    "• Real-time alerts for downtime\n"
+    "• Performance tracking\n\n"
+    "💡 **Tip:** You can monitor multiple URLs!"
+)
+
+_BROADCAST_CENTER_TEMPLATE = (
+    "📢 **Broadcast Control Center** 📢\n\n"
+    "🎯 **Mass Communication Hub**\n\n"
+    "✨ **Available Features:**\n"
+    "• 📝 Broadcast Text Messages\n"
+    "• 🖼️ Broadcast Images with Captions\n"
+    "• 🎯 Target Specific Users or All\n"
+    "• 📊 Delivery Analytics & Reports\n"
+    "• ⚡ Instant or Scheduled Delivery\n\n"
+    "👥 **Target Audience:**\n"
+    "• Active Users: {total_users}\n"
+    "• Potential Reach: {total_users} users\n\n"
+    "🚀 **How to Broadcast:**\n"
+    "1️⃣ Choose message type (text/image)\n"
+    "2️⃣ Compose your message\n"
+    "3️⃣ Review and confirm\n"
+    "4️⃣ Send to all users instantly\n\n"
+    "⚠️ **Important:** Use responsibly!"
+)
+
+_BROADCAST_TEXT_MSG = (
+    "📝 **Text Broadcast Setup** 📝\n\n"
+    "🎯 **Ready to send message to all users!**\n\n"
+    "📋 **Instructions:**\n"
+    "1️⃣ Type: `/broadcast <your message>`\n"
+    "2️⃣ Example: `/broadcast 🚀 New features available!`\n"
+    "3️⃣ Message will be sent to all active users\n\n"
+    "✨ **Message Features:**\n"
+    "• ✅ Markdown formatting supported\n"
+    "• 📝 Unlimited text length\n"
+    "• 🔗 Links and formatting allowed\n"
+    "• ⚡ Instant delivery to all users\n\n"
+    "💡 **Pro Tips:**\n"
+    "• Use **bold** and *italic* text\n"
+    "• Add emojis for better engagement\n"
+    "• Keep messages clear and concise\n"
+    "• Test formatting with a single message first\n\n"
+    "📊 **Sample Commands:**\n"
+    "`/broadcast Hello everyone! 👋`\n"
+    "`/broadcast **Important Update:** New features added!`\n"
+    "`/broadcast 🔧 Maintenance scheduled for tonight`"
+)
+
+_BROADCAST_IMAGE_MSG = (
+    "🖼️ **Image Broadcast Setup** 🖼️\n\n"
+    "🎯 **Send images with captions to all users!**\n\n"
+    "📋 **Instructions:**\n"
+    "1️⃣ Use command: `/broadcastimg`\n"
+    "2️⃣ Send the image as a reply to the command\n"
+    "3️⃣ Add caption with the image\n"
+    "4️⃣ Image will be sent to all users\n\n"
+    "✨ **Image Features:**\n"
+    "• 🖼️ JPG, PNG, GIF supported\n"
+    "• 📝 Rich captions with Markdown\n"
+    "• 🎯 Broadcast to all active users\n"
+    "• ⚡ High-quality image delivery\n\n"
+    "💡 **Pro Tips:**\n"
+    "• Use high-quality images\n"
+    "• Keep file sizes reasonable (<10MB)\n"
+    "• Add engaging captions\n"
+    "• Test with single user first\n\n"
+    "📊 **Usage Examples:**\n"
+    "1. Send `/broadcastimg`\n"
+    "2. Reply with image + caption\n"
+    "3. Confirm broadcast delivery\n"
+    "4. Monitor delivery status"
+)
+
+_HELP_KEYBOARD = InlineKeyboardMarkup([
+    [
+        InlineKeyboardButton("🚀 Dashboard", callback_data="main_menu"),
+        InlineKeyboardButton("📊 Quick Stats", callback_data="main_stats")
+    ],
+    [
+        InlineKeyboardButton("➕ Add URL", callback_data="add_url_wizard"),
+        InlineKeyboardButton("⚙️ Settings", callback_data="main_settings")
+    ]
+])
+
+_LIST_URLS_EMPTY_KEYBOARD = InlineKeyboardMarkup([
+    [InlineKeyboardButton("➕ Add URL", callback_data="help_seturl")]
+])
+
+_LIST_URLS_KEYBOARD = InlineKeyboardMarkup([
+    [InlineKeyboardButton("📊 Show Status", callback_data="show_status")],
+    [InlineKeyboardButton("🔄 Ping Now", callback_data="ping_now")]
+])
+
+_MAIN_MENU_ONLY_KEYBOARD = InlineKeyboardMarkup([
+    [InlineKeyboardButton("🏠 Main Menu", callback_data="main_menu")]
+])
+
+_URL_NOT_FOUND_KEYBOARD = InlineKeyboardMarkup([
+    [InlineKeyboardButton("🔄 Refresh URLs", callback_data="main_urls")],
+    [InlineKeyboardButton("🏠 Main Menu", callback_data="main_menu")]
+])
+
+_HANDLE_MESSAGE_KEYBOARD = InlineKeyboardMarkup([
+    [InlineKeyboardButton("📋 List URLs", callback_data="list_urls")],
+    [InlineKeyboardButton("📊 Show Status", callback_data="show_status")],
+    [InlineKeyboardButton("🆘 Help", callback_data="help")]
+])
+
+_HELP_MENU_KEYBOARD = InlineKeyboardMarkup([
+    [
+        InlineKeyboardButton("🚀 Get Started", callback_data="add_url_wizard"),
+        InlineKeyboardButton("📊 View Dashboard", callback_data="main_menu")
+    ],
+    [
+        InlineKeyboardButton("💬 Commands List", callback_data="commands_help"),
+        InlineKeyboardButton("🔧 Settings", callback_data="main_settings")
+    ]
+])
+
+_ADD_URL_WIZARD_KEYBOARD = InlineKeyboardMarkup([
+    [
+        InlineKeyboardButton("📋 View Current URLs", callback_data="main_urls"),
+        InlineKeyboardButton("📊 Statistics", callback_data="main_stats")
+    ],
+    [
+        InlineKeyboardButton("❓ Help", callback_data="help_menu"),
+        InlineKeyboardButton("🏠 Main Menu", callback_data="main_menu")
+    ]
+])
+
+_ADMIN_PANEL_KEYBOARD = InlineKeyboardMarkup([
+    [
+        InlineKeyboardButton("📢 Broadcast Center", callback_data="broadcast_center"),
+        InlineKeyboardButton("👥 User Management", callback_data="user_management")
+    ],
+    [
+        InlineKeyboardButton("📊 System Analytics", callback_data="system_analytics"),
+        InlineKeyboardButton("🔧 Database Tools", callback_data="database_tools")
+    ],
+    [
+        InlineKeyboardButton("🛡️ Admin Controls", callback_data="admin_controls"),
+        InlineKeyboardButton("📈 Performance Monitor", callback_data="performance_monitor")
+    ],
+    [
+        InlineKeyboardButton("🔄 Refresh Stats", callback_data="admin_panel"),
+        InlineKeyboardButton("🏠 Main Menu", callback_data="main_menu")
+    ]
+])
+
+_BROADCAST_CENTER_KEYBOARD = InlineKeyboardMarkup([
+    [
+        InlineKeyboardButton("📝 Text Broadcast", callback_data="broadcast_text"),
+        InlineKeyboardButton("🖼️ Image Broadcast", callback_data="broadcast_image")
+    ],
+    [
+        InlineKeyboardButton("👥 User List", callback_data="broadcast_users"),
+        InlineKeyboardButton("📊 Broadcast Stats", callback_data="broadcast_stats")
+    ],
+    [
+        InlineKeyboardButton("📋 Message Templates", callback_data="message_templates"),
+        InlineKeyboardButton("⚙️ Broadcast Settings", callback_data="broadcast_settings")
+    ],
+    [
+        InlineKeyboardButton("🔙 Admin Panel", callback_data="admin_panel"),
+        InlineKeyboardButton("🏠 Main Menu", callback_data="main_menu")
+    ]
+])
+
+_BROADCAST_TEXT_KEYBOARD = InlineKeyboardMarkup([
+    [
+        InlineKeyboardButton("📋 Message Templates", callback_data="message_templates"),
+        InlineKeyboardButton("👥 Target Users", callback_data="broadcast_users")
+    ],
+    [
+        InlineKeyboardButton("🧪 Test Message", callback_data="test_broadcast"),
+        InlineKeyboardButton("📊 Delivery Stats", callback_data="broadcast_stats")
+    ],
+    [
+        InlineKeyboardButton("🔙 Broadcast Center", callback_data="broadcast_center"),
+        InlineKeyboardButton("👑 Admin Panel", callback_data="admin_panel")
+    ]
+])
+
+_BROADCAST_IMAGE_KEYBOARD = InlineKeyboardMarkup([
+    [
+        InlineKeyboardButton("📸 Start Image Broadcast", callback_data="start_img_broadcast"),
+        InlineKeyboardButton("🎨 Image Templates", callback_data="image_templates")
+    ],
+    [
+        InlineKeyboardButton("👥 Target Users", callback_data="broadcast_users"),
+        InlineKeyboardButton("📊 Image Stats", callback_data="image_broadcast_stats")
+    ],
+    [
+        InlineKeyboardButton("🔙 Broadcast Center", callback_data="broadcast_center"),
+        InlineKeyboardButton("👑 Admin Panel", callback_data="admin_panel")
+    ]
+])
+
+_USER_MANAGEMENT_KEYBOARD = InlineKeyboardMarkup([
+    [
+        InlineKeyboardButton("👁️ View All Users", callback_data="view_all_users"),
+        InlineKeyboardButton("📊 User Analytics", callback_data="user_analytics")
+    ],
+    [
+        InlineKeyboardButton("📈 Activity Report", callback_data="activity_report"),
+        InlineKeyboardButton("📋 Export Data", callback_data="export_user_data")
+    ],
+    [
+        InlineKeyboardButton("🔧 User Tools", callback_data="user_tools"),
+        InlineKeyboardButton("⚙️ User Settings", callback_data="user_settings_admin")
+    ],
+    [
+        InlineKeyboardButton("🔙 Admin Panel", callback_data="admin_panel"),
+        InlineKeyboardButton("🏠 Main Menu", callback_data="main_menu")
+    ]
+])
+
+_SYSTEM_ANALYTICS_KEYBOARD = InlineKeyboardMarkup([
+    [
+        InlineKeyboardButton("📈 Detailed Reports", callback_data="detailed_reports"),
+        InlineKeyboardButton("📊 Performance Trends", callback_data="performance_trends")
+    ],
+    [
+        InlineKeyboardButton("🔍 URL Analysis", callback_data="url_analysis"),
+        InlineKeyboardButton("👥 User Activity", callback_data="user_activity_analytics")
+    ],
+    [
+        InlineKeyboardButton("📋 Export Analytics", callback_data="export_analytics"),
+        InlineKeyboardButton("⚙️ Analytics Settings", callback_data="analytics_settings")
+    ],
+    [
+        InlineKeyboardButton("🔙 Admin Panel", callback_data="admin_panel"),
+        InlineKeyboardButton("🔄 Refresh", callback_data="system_analytics")
+    ]
+])
+
+# Callbacks that only show fixed content: callback data -> (text, keyboard)
+_STATIC_PAGES = {
+    "help_menu": (_HELP_MENU_MSG, _HELP_MENU_KEYBOARD),
+    "add_url_wizard": (_ADD_URL_WIZARD_MSG, _ADD_URL_WIZARD_KEYBOARD),
+    "help_seturl": (_ADD_URL_WIZARD_MSG, _ADD_URL_WIZARD_KEYBOARD),  # Legacy
+}
+
+# Reply sent to users who may not use the bot
+_NOT_AVAILABLE_MSG = "Sorry, this bot is currently not available."
+
+def _chat_id(update: Update) -> str:
+    """Chat ID of an update as the string key used for Notion and caches"""
+    return str(update.effective_chat.id)
+
+def _preview(text: str, limit: int) -> str:
+    """Markdown-escaped preview of user text, cut to `limit` characters"""
+    return escape_markdown(text[:limit]) + ("..." if len(text) > limit else "")
+
+def require_allowed(handler):
+    """Only run a command handler for users allowed to use the bot"""
+    @functools.wraps(handler)
+    async def wrapper(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        if not self._is_user_allowed(update):
+            await update.message.reply_text(_NOT_AVAILABLE_MSG)
+            return
+        return await handler(self, update, context)
+    return wrapper
+
+def require_primary_admin(denied_reason: str):
+    """Only run a command handler for the primary admin, replying with denied_reason otherwise"""
+    def decorator(handler):
+        @functools.wraps(handler)
+        async def wrapper(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+            if not self.config.is_primary_admin(update.effective_chat.id):
+                await update.message.reply_text(
+                    f"🔒 **Access Denied**\n\n{denied_reason}",
+                    parse_mode=ParseMode.MARKDOWN
+                )
+                return
+            return await handler(self, update, context)
+        return wrapper
+    return decorator
+
 class BotHandlers:
     def __init__(self, url_monitor: URLMonitor, config: Config):
         self.url_monitor = url_monitor
         self.config = config
         self.notion_data = NotionDataManager()
         self.advanced_ui = AdvancedUI(url_monitor, config)
-        self.url_hash_map = {}  # Store URL hash mappings for callbacks
+        self.url_hash_map: Dict[str, Dict[str, str]] = {}  # Per-chat URL hash mappings for callbacks, in LRU order
+        self._url_cache = AsyncTTLCache(_URL_CACHE_TTL)  # chat id -> urls
+        self._broadcast_ids_cache = AsyncTTLCache(_BROADCAST_IDS_TTL)
+        self._blocked_user_ids: Set[str] = set()  # Users who blocked the bot; skipped by broadcasts
+        self._analytics_render: Optional[Tuple[float, int, str]] = None  # (rendered at, stats version, text)
+        self._last_rendered: Dict[Tuple[int, int], int] = {}  # (chat id, message id) -> content hash
+        self._send_bucket = AsyncTokenBucket(rate=_BROADCAST_RATE, burst=_BROADCAST_BURST)
+        
+        # Inline button dispatch tables for button_callback
+        self._cb_table = {
+            "main_menu": self._handle_main_menu_callback,
+            "main_urls": self._handle_main_urls_callback,
+            "main_stats": self._handle_main_stats_callback,
+            "main_settings": self._handle_settings_callback,
+            "quick_ping": self._handle_quick_ping_callback,
+            "analytics": self._handle_analytics_callback,
+            "broadcast_center": self._handle_broadcast_center_callback,
+            "broadcast_text": self._handle_broadcast_text_callback,
+            "broadcast_image": self._handle_broadcast_image_callback,
+            "user_management": self._handle_user_management_callback,
+            "system_analytics": self._handle_system_analytics_callback,
+            "view_alerts": self._handle_alerts_callback,
+            "refresh_main": self._handle_main_menu_callback,
+            "remove_url_menu": self._handle_remove_url_menu_callback,
+            "admin_panel": self._handle_admin_panel_callback,
+            # Legacy callbacks for compatibility
+            "list_urls": self._handle_main_urls_callback,
+            "show_status": self._handle_main_stats_callback,
+            "ping_now": self._handle_quick_ping_callback,
+        }
+        self._cb_prefix = {
+            "urls_page": lambda query, page: self._handle_urls_page_callback(query, int(page)),
+            "test_url": self._handle_test_url_callback,
+            "url_detail": self._handle_url_detail_callback,
+            "remove_url": self._handle_remove_url_callback,
+            "confirm_remove": self._handle_confirm_remove_callback,
+        }
         
     def _generate_url_hash(self, url: str) -> str:
         """Generate consistent hash for URL"""
-        import hashlib
-        return hashlib.md5(url.encode()).hexdigest()[:8]
+        return short_url_hash(url)
+    
+    async def _get_user_urls_cached(self, user_chat_id: str) -> Dict[str, Dict[str, Any]]:
+        """Get a user's URLs from Notion, reusing a recent result if there is one"""
+        try:
+            return await self._url_cache.get(user_chat_id, lambda: self.notion_data.get_user_urls(user_chat_id, raise_errors=True))
+        except Exception:
+            # Already logged; the failed load isn't cached, so the next call asks Notion again
+            return {}
+    
+    async def _get_broadcast_user_ids(self) -> FrozenSet[str]:
+        """Get the broadcast recipients, reusing the set from a recent broadcast"""
+        async def load():
+            return frozenset(await self.notion_data.get_broadcast_user_ids(raise_errors=True))
+        
+        try:
+            return await self._broadcast_ids_cache.get("all", load) - self._blocked_user_ids
+        except Exception:
+            # Already logged; the failed load isn't cached, so the next call asks Notion again
+            return frozenset()
+    
+    def _invalidate_url_cache(self, user_chat_id: str) -> None:
+        """Drop cached URL listings after a user's URLs change"""
+        self._url_cache.invalidate(user_chat_id)
+    
+    def _hash_map_for(self, user_chat_id: str) -> Dict[str, str]:
+        """Get a chat's URL hash mapping, marking it recently used and evicting the oldest chats"""
+        mapping = self.url_hash_map.pop(user_chat_id, None)
+        if mapping is None:
+            mapping = {}
+        self.url_hash_map[user_chat_id] = mapping
+        if len(self.url_hash_map) > _URL_HASH_MAP_MAX_CHATS:
+            self.url_hash_map.pop(next(iter(self.url_hash_map)))
+        return mapping
     
     async def _refresh_url_hash_map(self, user_chat_id: str) -> None:
         """Refresh URL hash mapping for user"""
         try:
-            urls = await self.notion_data.get_user_urls(user_chat_id)
-            self.url_hash_map.clear()
+            urls = await self._get_user_urls_cached(user_chat_id)
+            mapping = self._hash_map_for(user_chat_id)
+            mapping.clear()
+            mapping.update((self._generate_url_hash(url), url) for url in urls)
             
-            for url in urls.keys():
-                url_hash = self._generate_url_hash(url)
-                self.url_hash_map[url_hash] = url
-                
-            logger.debug(f"Refreshed hash map with {len(self.url_hash_map)} URLs")
+            logger.debug("Refreshed hash map with %s URLs for %s", len(urls), user_chat_id)
         except Exception as e:
-            logger.error(f"Error refreshing URL hash map: {e}")
+            logger.error("Error refreshing URL hash map: %s", e)
+    
+    async def _resolve_url_hash(self, url_hash: str, user_chat_id: str) -> Optional[str]:
+        """Resolve a URL hash for a chat, rebuilding its hash map only on a miss"""
+        url = self._hash_map_for(user_chat_id).get(url_hash)
+        if not url:
+            # Map may be stale, evicted or empty after a restart
+            await self._refresh_url_hash_map(user_chat_id)
+            url = self._hash_map_for(user_chat_id).get(url_hash)
+        return url
+    
+    def _lookup_url(self, url_hash: str, user_chat_id: str) -> Optional[str]:
+        """Resolve a callback URL hash, falling back to IDs issued by the UI"""
+        return (self.url_hash_map.get(user_chat_id, {}).get(url_hash)
+                or self.advanced_ui.get_url_by_id(url_hash))
+    
+    async def _deliver_broadcast(self, user_ids, send, report_progress) -> Tuple[int, int]:
+        """Send a broadcast to all users concurrently, returning (delivered, failed)"""
+        semaphore = asyncio.Semaphore(_BROADCAST_CONCURRENCY)
+        total = len(user_ids)
+        counts = {"done": 0, "delivered": 0}
+        failures = Counter()
+        
+        async def send_one(user_id) -> bool:
+            async with semaphore:
+                try:
+                    try:
+                        async with self._send_bucket:
+                            await send(user_id)
+                    except RetryAfter as e:
+                        # Flood limit hit; hold back every send, then retry this user once
+                        self._send_bucket.pause(e.retry_after)
+                        async with self._send_bucket:
+                            await send(user_id)
+                    delivered = True
+                except Exception as e:
+                    logger.error("Failed to send broadcast to user %s: %s", user_id, e)
+                    reason = next((r for exc_type, r in _BROADCAST_FAILURE_REASONS if isinstance(e, exc_type)), "error")
+                    failures[reason] += 1
+                    if reason == "blocked":
+                        self._blocked_user_ids.add(user_id)
+                    delivered = False
+            
+            counts["done"] += 1
+            counts["delivered"] += delivered
+            return delivered
+        
+        async def progress_loop():
+            # Runs alongside the sends so a slow edit never holds up delivery
+            reported = 0
+            while True:
+                await asyncio.sleep(_PROGRESS_EDIT_INTERVAL)
+                if counts["done"] == reported:
+                    # Nothing new; Telegram would reject an identical edit anyway
+                    continue
+                reported = counts["done"]
+                try:
+                    await report_progress(counts["done"], counts["delivered"])
+                except RetryAfter as e:
+                    # Hold off further edits until Telegram lets us edit again
+                    await asyncio.sleep(e.retry_after)
+                except Exception as e:
+                    logger.debug("Could not update broadcast progress: %s", e)
+        
+        progress_task = asyncio.create_task(progress_loop())
+        try:
+            results = await asyncio.gather(*(send_one(user_id) for user_id in user_ids))
+        finally:
+            progress_task.cancel()
+        
+        success_count = sum(results)
+        if failures:
+            logger.info("Broadcast failures by reason: %s", dict(failures))
+        return success_count, total - success_count
+    
+    async def _edit(self, query, text: str, **kwargs):
+        """Edit a callback's message, skipping the API call if it would not change anything"""
+        key = (query.message.chat.id, query.message.message_id)
+        rendered = hash((text, kwargs.get('parse_mode'), repr(kwargs.get('reply_markup'))))
+        if self._last_rendered.get(key) == rendered:
+            return
+        
+        try:
+            await query.edit_message_text(text, **kwargs)
+        except BadRequest as e:
+            # Already showing this content, e.g. rendered before a restart
+            if "not modified" not in str(e).lower():
+                raise
+        
+        self._last_rendered.pop(key, None)
+        self._last_rendered[key] = rendered
+        if len(self._last_rendered) > _LAST_RENDERED_MAX:
+            self._last_rendered.pop(next(iter(self._last_rendered)))
+    
+    def _render_status_html(self, urls: Dict[str, Dict[str, Any]]) -> str:
+        """Render the URL status summary as HTML, escaping URLs into <code> tags"""
+        # Statistics come from the same listing, no second Notion query
+        stats = self.notion_data.summarize_urls(urls)
+        
+        parts = [f"📊 <b>Your URL Statistics</b>\n\n"]
+        parts.append(f"<b>Total URLs:</b> {stats['total_urls']}\n")
+        parts.append(f"🟢 <b>Online:</b> {stats['online']}\n")
+        parts.append(f"🔴 <b>Offline:</b> {stats['offline']}\n")
+        parts.append(f"⏳ <b>Pending:</b> {stats['pending']}\n")
+        parts.append(f"⚡ <b>Avg Response:</b> {stats['average_response_time']}ms\n\n")
+        
+        # Show individual URL statuses
+        for url, data in urls.items():
+            status_icon = _STATUS_ICON.get(data['status'], "⏳")
+            response_time_str = f" ({data['response_time']}ms)" if data['response_time'] else ""
+            parts.append(f"{status_icon} <code>{html.escape(url)}</code>{response_time_str}\n")
+        
+        # Read straight off the monitor; get_monitoring_status() would also scan every URL in Notion
+        is_running = self.url_monitor.is_running
+        status_icon = "🟢" if is_running else "🔴"
+        parts.append(f"\n<b>Monitoring Status:</b> {status_icon} {'Active' if is_running else 'Inactive'}\n")
+        parts.append(f"<b>Ping Interval:</b> {self.url_monitor.ping_interval} seconds\n")
+        parts.append(f"<b>Data Storage:</b> Notion Database\n")
+        parts.append(f"<b>Last Updated:</b> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        return "".join(parts)
     
     def _is_user_allowed(self, update: Update) -> bool:
         """Check if the user is allowed to use the bot"""
@@ -50,95 +651,45 @@ class BotHandlers:
             return False
         return self.config.is_user_allowed(update.effective_chat.id)
     
+    @require_allowed
     async def start_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /start command"""
-        if not self._is_user_allowed(update):
-            await update.message.reply_text("Sorry, this bot is currently not available.")
-            return
-        
-        # Show typing animation for better UX
-        await self.advanced_ui.show_typing_animation(update.effective_chat.id, context.bot, 2)
+        # Show typing animation for better UX without holding up the reply
+        context.application.create_task(
+            self.advanced_ui.show_typing_animation(update.effective_chat.id, context.bot, 2),
+            update=update
+        )
         
         user = update.effective_user
         username = user.username or user.first_name or "User"
         
-        welcome_msg = (
-            f"👋 Welcome {username}!\n\n"
-            "🚀 **URL Monitor Bot** 🚀\n\n"
-            "Monitor your websites and get instant alerts when they go down!\n\n"
-            "✨ **Features:**\n"
-            "📊 Real-time monitoring every 60 seconds\n"
-            "⚡ Response time tracking\n"
-            "🔔 Instant downtime alerts\n"
-            "📈 Statistics and trends\n"
-            "💾 All data stored securely in Notion\n\n"
-            "Start by adding your first URL to monitor:"
-        )
+        welcome_msg = _WELCOME_TEMPLATE.format(username=escape_markdown(username))
         
         # Use advanced main menu
         reply_markup = self.advanced_ui.create_main_menu_keyboard()
         
         await update.message.reply_text(
             welcome_msg,
-            parse_mode='Markdown',
+            parse_mode=ParseMode.MARKDOWN,
             reply_markup=reply_markup
         )
     
+    @require_allowed
     async def help_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /help command"""
-        if not self._is_user_allowed(update):
-            await update.message.reply_text("Sorry, this bot is currently not available.")
-            return
-        
-        help_msg = (
-            "🆘 **Help - URL Monitor Bot** 🆘\n\n"
-            "🚀 **Available Commands:**\n"
-            "📌 `/seturl <url>` - Add URL to monitor\n"
-            "🗑️ `/removeurl <url>` - Remove URL from monitoring\n"
-            "📋 `/listurls` - View all your monitored URLs\n"
-            "📊 `/status` - View statistics and status\n"
-            "🔄 `/pingnow` - Test all URLs immediately\n\n"
-            "💾 **Notion Integration:**\n"
-            "• All your data is stored securely in Notion database\n"
-            "• Each user has their own separate data\n"
-            "• Real-time monitoring every 60 seconds\n\n"
-            "🎨 **Status Indicators:**\n"
-            "🟢 Online - Website is working\n"
-            "🔴 Offline - Website is down\n"
-            "⏳ Pending - First check in progress\n\n"
-            "💡 **Tips:**\n"
-            "• Start by adding a URL with /seturl\n"
-            "• Check your dashboard regularly\n"
-            "• You'll get instant alerts for downtime"
-        )
-        
-        keyboard = [
-            [
-                InlineKeyboardButton("🚀 Dashboard", callback_data="main_menu"),
-                InlineKeyboardButton("📊 Quick Stats", callback_data="main_stats")
-            ],
-            [
-                InlineKeyboardButton("➕ Add URL", callback_data="add_url_wizard"),
-                InlineKeyboardButton("⚙️ Settings", callback_data="main_settings")
-            ]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        
-        await update.message.reply_text(help_msg, parse_mode='Markdown', reply_markup=reply_markup)
+        await update.message.reply_text(_HELP_MSG, parse_mode=ParseMode.MARKDOWN, reply_markup=_HELP_KEYBOARD)
     
+    @require_allowed
     async def set_url_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /seturl command"""
-        if not self._is_user_allowed(update):
-            await update.message.reply_text("Sorry, this bot is currently not available.")
-            return
-        
+        user_chat_id = _chat_id(update)
         # Check if URL is provided
         if not context.args:
             await update.message.reply_text(
                 "❌ Please provide a URL to monitor.\n\n"
                 "Usage: `/seturl <url>`\n"
                 "Example: `/seturl https://myapp.herokuapp.com`",
-                parse_mode='Markdown'
+                parse_mode=ParseMode.MARKDOWN
             )
             return
         
@@ -150,7 +701,7 @@ class BotHandlers:
                 "❌ Invalid URL format.\n\n"
                 "Please provide a valid URL starting with http:// or https://\n"
                 "Example: `https://myapp.herokuapp.com`",
-                parse_mode='Markdown'
+                parse_mode=ParseMode.MARKDOWN
             )
             return
         
@@ -160,20 +711,28 @@ class BotHandlers:
             "⏳ Validating URL format\n"
             "⏳ Testing connectivity\n"
             "⏳ Adding to monitoring system",
-            parse_mode='Markdown'
+            parse_mode=ParseMode.MARKDOWN
         )
         
         # Get user info
         user = update.effective_user
         username = user.username or user.first_name
         
-        # Add URL to Notion database
-        success = await self.notion_data.add_url(url, str(update.effective_chat.id), username)
+        # Add URL to Notion database; a hung request fails after the client's request timeout
+        success = await self.notion_data.add_url(url, user_chat_id, username)
         
         if success:
+            self._invalidate_url_cache(user_chat_id)
+            self._broadcast_ids_cache.invalidate()  # Recipient set may have changed
+            self._blocked_user_ids.discard(user_chat_id)  # Talking to the bot again, so not blocked
+            self.url_monitor.stats.url_added(user_chat_id, url)
+            recent = context.user_data.get('recent_url_list')
+            if recent:
+                recent[1].add(url)  # Keep /removeurl's shortcut from rejecting the new URL
+            
             # Store URL hash mapping for callbacks
-            url_hash = hash(url) % 10000
-            self.url_hash_map[url_hash] = url
+            url_hash = self._generate_url_hash(url)
+            self._hash_map_for(user_chat_id)[url_hash] = url
             
             # Create enhanced response with animations
             keyboard = [
@@ -202,50 +761,66 @@ class BotHandlers:
                 f"• View the dashboard for real-time status\n"
                 f"• Test connectivity immediately\n"
                 f"• Monitor performance analytics",
-                parse_mode='Markdown',
+                parse_mode=ParseMode.MARKDOWN,
                 reply_markup=reply_markup
             )
         else:
             await update.message.reply_text(
                 f"❌ Failed to add URL: `{url}`\n\n"
                 "Please try again or check the URL format.",
-                parse_mode='Markdown'
+                parse_mode=ParseMode.MARKDOWN
             )
     
+    @require_allowed
     async def remove_url_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /removeurl command"""
-        if not self._is_user_allowed(update):
-            await update.message.reply_text("Sorry, this bot is currently not available.")
-            return
-        
+        user_chat_id = _chat_id(update)
         # Check if URL is provided
         if not context.args:
             # Show current URLs for easy removal
-            urls = await self.notion_data.get_user_urls(str(update.effective_chat.id))
+            urls = await self._get_user_urls_cached(user_chat_id)
             if not urls:
                 await update.message.reply_text(
                     "❌ No URLs are currently being monitored.\n\n"
                     "Use `/seturl <url>` to add URLs to monitor.",
-                    parse_mode='Markdown'
+                    parse_mode=ParseMode.MARKDOWN
                 )
                 return
             
+            # Remember what was shown so the follow-up can be checked without Notion
+            context.user_data['recent_url_list'] = (time.monotonic(), set(urls))
+            
             url_list = "\n".join([f"• `{url}`" for url in urls.keys()])
             await update.message.reply_text(
                 "❌ Please specify which URL to remove.\n\n"
                 "**Current URLs:**\n"
                 f"{url_list}\n\n"
                 "Usage: `/removeurl <url>`",
-                parse_mode='Markdown'
+                parse_mode=ParseMode.MARKDOWN
             )
             return
         
         url = context.args[0]
         
-        # Remove URL from monitoring
-        success = await self.notion_data.remove_url(url, str(update.effective_chat.id))
+        recent = context.user_data.get('recent_url_list')
+        if recent and time.monotonic() - recent[0] < _URL_CACHE_TTL and url not in recent[1]:
+            # Not among the URLs just listed, so skip the Notion round-trip
+            success = False
+        else:
+            # Remove URL from monitoring
+            success = await self.notion_data.remove_url(url, user_chat_id)
         
         if success:
+            # Drop just this URL from the cached listing so /listurls needs no fetch
+            cached = self._url_cache.peek(user_chat_id)
+            if cached:
+                cached.pop(url, None)
+            if recent:
+                recent[1].discard(url)
+            self._broadcast_ids_cache.invalidate()  # Recipient set may have changed
+            self.url_monitor.stats.url_removed(user_chat_id, url)
+            self._hash_map_for(user_chat_id).pop(self._generate_url_hash(url), None)
+            
             keyboard = [
                 [InlineKeyboardButton("📋 List Remaining URLs", callback_data="list_urls")]
             ]
@@ -256,7 +831,7 @@ class BotHandlers:
                 f"**URL:** `{url}`\n"
                 f"**Status:** No longer monitoring\n\n"
                 f"This URL will no longer receive keep-alive pings.",
-                parse_mode='Markdown',
+                parse_mode=ParseMode.MARKDOWN,
                 reply_markup=reply_markup
             )
         else:
@@ -264,87 +839,49 @@ class BotHandlers:
                 f"❌ URL not found: `{url}`\n\n"
                 "This URL is not currently being monitored.\n"
                 "Use `/listurls` to see all monitored URLs.",
-                parse_mode='Markdown'
+                parse_mode=ParseMode.MARKDOWN
             )
     
+    @require_allowed
     async def list_urls_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /listurls command"""
-        if not self._is_user_allowed(update):
-            await update.message.reply_text("Sorry, this bot is currently not available.")
-            return
-        
-        urls = await self.notion_data.get_user_urls(str(update.effective_chat.id))
+        user_chat_id = _chat_id(update)
+        urls = await self._get_user_urls_cached(user_chat_id)
         
         if not urls:
-            keyboard = [
-                [InlineKeyboardButton("➕ Add URL", callback_data="help_seturl")]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
-            
             await update.message.reply_text(
                 "📭 **No URLs Currently Monitored**\n\n"
                 "You haven't added any URLs to monitor yet.\n\n"
                 "Use `/seturl <url>` to start monitoring a URL.",
-                parse_mode='Markdown',
-                reply_markup=reply_markup
+                parse_mode=ParseMode.MARKDOWN,
+                reply_markup=_LIST_URLS_EMPTY_KEYBOARD
             )
             return
         
         message = format_url_list(urls)
         
-        # Add action buttons
-        keyboard = [
-            [InlineKeyboardButton("📊 Show Status", callback_data="show_status")],
-            [InlineKeyboardButton("🔄 Ping Now", callback_data="ping_now")]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        
         await update.message.reply_text(
             message,
-            parse_mode='Markdown',
-            reply_markup=reply_markup
+            parse_mode=ParseMode.MARKDOWN,
+            reply_markup=_LIST_URLS_KEYBOARD
         )
     
+    @require_allowed
     async def status_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /status command"""
-        if not self._is_user_allowed(update):
-            await update.message.reply_text("Sorry, this bot is currently not available.")
-            return
-        
-        urls = await self.notion_data.get_user_urls(str(update.effective_chat.id))
+        user_chat_id = _chat_id(update)
+        urls = await self._get_user_urls_cached(user_chat_id)
         
         if not urls:
             await update.message.reply_text(
                 "📊 **No Status Data Available**\n\n"
                 "No URLs are currently being monitored.\n"
                 "Use `/seturl <url>` to add URLs and start collecting statistics.",
-                parse_mode='Markdown'
+                parse_mode=ParseMode.MARKDOWN
             )
             return
         
-        # Get statistics from Notion database
-        stats = await self.notion_data.get_url_statistics(str(update.effective_chat.id))
-        
-        message = f"📊 **Your URL Statistics**\n\n"
-        message += f"**Total URLs:** {stats['total_urls']}\n"
-        message += f"🟢 **Online:** {stats['online']}\n"
-        message += f"🔴 **Offline:** {stats['offline']}\n"
-        message += f"⏳ **Pending:** {stats['pending']}\n"
-        message += f"⚡ **Avg Response:** {stats['average_response_time']}ms\n\n"
-        
-        # Show individual URL statuses
-        for url, data in urls.items():
-            status_icon = "🟢" if data['status'] == 'online' else "🔴" if data['status'] == 'offline' else "⏳"
-            response_time_str = f" ({data['response_time']}ms)" if data['response_time'] else ""
-            message += f"{status_icon} `{url}`{response_time_str}\n"
-        
-        # Add monitoring status
-        monitor_status = await self.url_monitor.get_monitoring_status()
-        status_icon = "🟢" if monitor_status["is_running"] else "🔴"
-        message += f"\n**Monitoring Status:** {status_icon} {'Active' if monitor_status['is_running'] else 'Inactive'}\n"
-        message += f"**Ping Interval:** {monitor_status['ping_interval']} seconds\n"
-        message += f"**Data Storage:** Notion Database\n"
-        message += f"**Last Updated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+        message = self._render_status_html(urls)
         
         keyboard = [
             [InlineKeyboardButton("🔄 Refresh Stats", callback_data="show_status")],
@@ -354,24 +891,22 @@ class BotHandlers:
         
         await update.message.reply_text(
             message,
-            parse_mode='Markdown',
+            parse_mode=ParseMode.HTML,
             reply_markup=reply_markup
         )
     
+    @require_allowed
     async def ping_now_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /pingnow command"""
-        if not self._is_user_allowed(update):
-            await update.message.reply_text("Sorry, this bot is currently not available.")
-            return
-        
-        urls = await self.notion_data.get_user_urls(str(update.effective_chat.id))
+        user_chat_id = _chat_id(update)
+        urls = await self._get_user_urls_cached(user_chat_id)
         
         if not urls:
             await update.message.reply_text(
                 "❌ **No URLs to Ping**\n\n"
                 "No URLs are currently being monitored.\n"
                 "Use `/seturl <url>` to add URLs first.",
-                parse_mode='Markdown'
+                parse_mode=ParseMode.MARKDOWN
             )
             return
         
@@ -379,26 +914,41 @@ class BotHandlers:
         status_msg = await update.message.reply_text(
             f"🔄 **Pinging {len(urls)} URLs...**\n\n"
             "Please wait while I check all your URLs.",
-            parse_mode='Markdown'
+            parse_mode=ParseMode.MARKDOWN
         )
         
         try:
-            # Perform the pings for this user only
-            results = await self.url_monitor.ping_user_urls(str(update.effective_chat.id))
-            
-            # Format results
-            message = "🔄 **Manual Ping Results**\n\n"
+            # Ping this user's URLs, showing results as they come in
+            parts = ["🔄 **Manual Ping Results**\n\n"]
+            checked = 0
+            last_edit = time.monotonic()
             
-            for url, result in results.items():
-                status_icon = "🟢" if result["success"] else "🔴"
-                status_text = "Online" if result["success"] else "Offline"
+            async for url, result in self.url_monitor.iter_ping_user_urls(user_chat_id):
+                status_icon, status_text = _PING_RESULT_LABEL[bool(result["success"])]
                 
-                message += f"{status_icon} **{status_text}**\n"
-                message += f"   `{url}`\n"
-                message += f"   Status: {result['status_code']} | "
-                message += f"Time: {result['response_time']:.3f}s\n\n"
+                parts.append(f"{status_icon} **{status_text}**\n")
+                parts.append(f"   `{url}`\n")
+                parts.append(f"   Status: {result['status_code']} | ")
+                parts.append(f"Time: {result['response_time']:.3f}s\n\n")
+                checked += 1
+                
+                now = time.monotonic()
+                if checked < len(urls) and now - last_edit >= _PING_EDIT_INTERVAL:
+                    last_edit = now
+                    try:
+                        await status_msg.edit_text(
+                            "".join(parts) + f"⏳ **Checked:** {checked}/{len(urls)}",
+                            parse_mode=ParseMode.MARKDOWN
+                        )
+                    except RetryAfter as e:
+                        last_edit = now + e.retry_after
+                    except BadRequest as e:
+                        logger.debug("Could not update ping progress: %s", e)
+            
+            self._invalidate_url_cache(user_chat_id)  # Pings updated the stored statuses
             
-            message += f"**Completed:** {datetime.now().strftime('%H:%M:%S')}"
+            parts.append(f"**Completed:** {clock_time()}")
+            message = "".join(parts)
             
             # Add action buttons
             keyboard = [
@@ -410,28 +960,21 @@ class BotHandlers:
             # Update the status message
             await status_msg.edit_text(
                 message,
-                parse_mode='Markdown',
+                parse_mode=ParseMode.MARKDOWN,
                 reply_markup=reply_markup
             )
             
         except Exception as e:
-            logger.error(f"Error in ping_now_command: {e}")
+            logger.error("Error in ping_now_command: %s", e)
             await status_msg.edit_text(
                 f"❌ **Ping Failed**\n\n"
                 f"An error occurred while pinging URLs: {str(e)}",
-                parse_mode='Markdown'
+                parse_mode=ParseMode.MARKDOWN
             )
     
+    @require_primary_admin("Only the primary admin can add new administrators.")
     async def add_admin_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /addadmin command - Only primary admin can add new admins"""
-        if not self.config.is_primary_admin(update.effective_chat.id):
-            await update.message.reply_text(
-                "🔒 **Access Denied**\n\n"
-                "Only the primary admin can add new administrators.",
-                parse_mode='Markdown'
-            )
-            return
-        
         if not context.args:
             await update.message.reply_text(
                 "❌ **Usage Error**\n\n"
@@ -439,7 +982,7 @@ class BotHandlers:
                 "**Example:** `/addadmin 123456789`\n\n"
                 "**How to get Chat ID:**\n"
                 "Ask the user to send a message to @userinfobot to get their chat ID.",
-                parse_mode='Markdown'
+                parse_mode=ParseMode.MARKDOWN
             )
             return
         
@@ -450,7 +993,7 @@ class BotHandlers:
                 "❌ **Invalid Chat ID**\n\n"
                 "Chat ID must be a number.\n\n"
                 "Example: `/addadmin 123456789`",
-                parse_mode='Markdown'
+                parse_mode=ParseMode.MARKDOWN
             )
             return
         
@@ -460,32 +1003,25 @@ class BotHandlers:
                 f"**New Admin ID:** `{new_admin_id}`\n"
                 f"**Total Admins:** {len(self.config.get_admin_list())}\n\n"
                 f"This user can now use all bot features.",
-                parse_mode='Markdown'
+                parse_mode=ParseMode.MARKDOWN
             )
         else:
             await update.message.reply_text(
                 f"ℹ️ **Admin Already Exists**\n\n"
                 f"Chat ID `{new_admin_id}` is already an admin.",
-                parse_mode='Markdown'
+                parse_mode=ParseMode.MARKDOWN
             )
     
+    @require_primary_admin("Only the primary admin can remove administrators.")
     async def remove_admin_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /removeadmin command - Only primary admin can remove admins"""
-        if not self.config.is_primary_admin(update.effective_chat.id):
-            await update.message.reply_text(
-                "🔒 **Access Denied**\n\n"
-                "Only the primary admin can remove administrators.",
-                parse_mode='Markdown'
-            )
-            return
-        
         if not context.args:
             await update.message.reply_text(
                 "❌ **Usage Error**\n\n"
                 "**Correct usage:** `/removeadmin <chat_id>`\n\n"
                 "**Example:** `/removeadmin 123456789`\n\n"
                 "Use `/listadmins` to see all current admins.",
-                parse_mode='Markdown'
+                parse_mode=ParseMode.MARKDOWN
             )
             return
         
@@ -495,7 +1031,7 @@ class BotHandlers:
             await update.message.reply_text(
                 "❌ **Invalid Chat ID**\n\n"
                 "Chat ID must be a number.",
-                parse_mode='Markdown'
+                parse_mode=ParseMode.MARKDOWN
             )
             return
         
@@ -505,61 +1041,48 @@ class BotHandlers:
                 f"**Removed Admin ID:** `{admin_id}`\n"
                 f"**Remaining Admins:** {len(self.config.get_admin_list())}\n\n"
                 f"This user can no longer use bot features.",
-                parse_mode='Markdown'
+                parse_mode=ParseMode.MARKDOWN
             )
         else:
             if admin_id == self.config.primary_admin_chat_id:
                 await update.message.reply_text(
                     "❌ **Cannot Remove Primary Admin**\n\n"
                     "The primary admin cannot be removed for security reasons.",
-                    parse_mode='Markdown'
+                    parse_mode=ParseMode.MARKDOWN
                 )
             else:
                 await update.message.reply_text(
                     f"❌ **Admin Not Found**\n\n"
                     f"Chat ID `{admin_id}` is not currently an admin.",
-                    parse_mode='Markdown'
+                    parse_mode=ParseMode.MARKDOWN
                 )
     
+    @require_primary_admin("Only the primary admin can view the admin list.")
     async def list_admins_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /listadmins command - Only primary admin can view admin list"""
-        if not self.config.is_primary_admin(update.effective_chat.id):
-            await update.message.reply_text(
-                "🔒 **Access Denied**\n\n"
-                "Only the primary admin can view the admin list.",
-                parse_mode='Markdown'
-            )
-            return
-        
         admin_list = self.config.get_admin_list()
         
-        message = "👥 **Admin Management Panel**\n\n"
-        message += f"**Total Admins:** {len(admin_list)}\n\n"
+        parts = ["👥 **Admin Management Panel**\n\n"]
+        parts.append(f"**Total Admins:** {len(admin_list)}\n\n")
         
         for i, admin_id in enumerate(admin_list, 1):
             if admin_id == self.config.primary_admin_chat_id:
-                message += f"**{i}.** `{admin_id}` 👑 **Primary Admin**\n"
+                parts.append(f"**{i}.** `{admin_id}` 👑 **Primary Admin**\n")
             else:
-                message += f"**{i}.** `{admin_id}`\n"
+                parts.append(f"**{i}.** `{admin_id}`\n")
         
-        message += f"\n**Commands:**\n"
-        message += f"• `/addadmin <chat_id>` - Add new admin\n"
-        message += f"• `/removeadmin <chat_id>` - Remove admin\n"
-        message += f"• `/listadmins` - Show this list\n\n"
-        message += f"**Note:** Only primary admin can manage other admins."
+        parts.append(f"\n**Commands:**\n")
+        parts.append(f"• `/addadmin <chat_id>` - Add new admin\n")
+        parts.append(f"• `/removeadmin <chat_id>` - Remove admin\n")
+        parts.append(f"• `/listadmins` - Show this list\n\n")
+        parts.append(f"**Note:** Only primary admin can manage other admins.")
+        message = "".join(parts)
         
-        await update.message.reply_text(message, parse_mode='Markdown')
+        await update.message.reply_text(message, parse_mode=ParseMode.MARKDOWN)
     
+    @require_primary_admin("Only admins can use the broadcast feature.")
     async def broadcast_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /broadcast command - Admin only"""
-        if not self.config.is_primary_admin(update.effective_chat.id):
-            await update.message.reply_text(
-                "🔒 **Access Denied**\n\n"
-                "Only admins can use the broadcast feature.",
-                parse_mode='Markdown'
-            )
-            return
-        
         if not context.args:
             await update.message.reply_text(
                 "📢 **Broadcast Command Usage**\n\n"
@@ -571,12 +1094,13 @@ class BotHandlers:
                 "• Instant delivery\n"
                 "• Delivery confirmation\n\n"
                 "**Pro tip:** Use emojis and formatting for better engagement!",
-                parse_mode='Markdown'
+                parse_mode=ParseMode.MARKDOWN
             )
             return
         
         # Get the broadcast message
         broadcast_message = ' '.join(context.args)
+        broadcast_message_preview = {n: _preview(broadcast_message, n) for n in (50, 100)}
         
         # Show confirmation
         confirm_msg = await update.message.reply_text(
@@ -586,19 +1110,18 @@ class BotHandlers:
             f"⚡ **Preparing broadcast...**\n"
             f"🎯 Getting user list...\n"
             f"📊 Calculating delivery...",
-            parse_mode='Markdown'
+            parse_mode=ParseMode.MARKDOWN
         )
         
         # Get all users
-        all_urls = await self.notion_data.get_all_urls()
-        user_ids = set(all_urls.values()) if all_urls else set()
+        user_ids = await self._get_broadcast_user_ids()
         
         if not user_ids:
             await confirm_msg.edit_text(
                 "📢 **Broadcast Status**\n\n"
                 "❌ No active users found to broadcast to.\n"
                 "Users must have at least one monitored URL to receive broadcasts.",
-                parse_mode='Markdown'
+                parse_mode=ParseMode.MARKDOWN
             )
             return
         
@@ -609,64 +1132,57 @@ class BotHandlers:
             f"🎯 **Target:** {len(user_ids)} users\n"
             f"⏳ **Status:** Sending...\n"
             f"📨 **Progress:** Starting delivery",
-            parse_mode='Markdown'
+            parse_mode=ParseMode.MARKDOWN
         )
         
         # Send broadcast to all users
-        success_count = 0
-        failed_count = 0
-        
-        for i, user_id in enumerate(user_ids, 1):
-            try:
-                await context.bot.send_message(
-                    chat_id=user_id,
-                    text=f"📢 **Admin Broadcast**\n\n{broadcast_message}",
-                    parse_mode='Markdown'
-                )
-                success_count += 1
-                
-                # Update progress every 5 users or at the end
-                if i % 5 == 0 or i == len(user_ids):
-                    await confirm_msg.edit_text(
-                        f"📢 **Broadcasting Message**\n\n"
-                        f"**Message:** {broadcast_message[:50]}{'...' if len(broadcast_message) > 50 else ''}\n\n"
-                        f"🎯 **Target:** {len(user_ids)} users\n"
-                        f"⏳ **Status:** Sending...\n"
-                        f"📨 **Progress:** {i}/{len(user_ids)} ({(i/len(user_ids)*100):.0f}%)\n"
-                        f"✅ **Delivered:** {success_count}\n"
-                        f"❌ **Failed:** {failed_count}",
-                        parse_mode='Markdown'
-                    )
-                
-            except Exception as e:
-                failed_count += 1
-                logger.error(f"Failed to send broadcast to user {user_id}: {e}")
+        broadcast_text = f"📢 **Admin Broadcast**\n\n{broadcast_message}"
+        
+        async def send(user_id):
+            await context.bot.send_message(
+                chat_id=user_id,
+                text=broadcast_text,
+                parse_mode=ParseMode.MARKDOWN
+            )
+        
+        # Everything above the counters is fixed for the whole broadcast
+        total = len(user_ids)
+        progress_header = (
+            f"📢 **Broadcasting Message**\n\n"
+            f"**Message:** {broadcast_message_preview[50]}\n\n"
+            f"🎯 **Target:** {total} users\n"
+            f"⏳ **Status:** Sending...\n"
+        )
+        
+        async def report_progress(done, delivered):
+            await confirm_msg.edit_text(
+                f"{progress_header}"
+                f"📨 **Progress:** {done}/{total} ({(done/total*100):.0f}%)\n"
+                f"✅ **Delivered:** {delivered}\n"
+                f"❌ **Failed:** {done - delivered}",
+                parse_mode=ParseMode.MARKDOWN
+            )
+        
+        success_count, failed_count = await self._deliver_broadcast(user_ids, send, report_progress)
         
         # Final status report
         await confirm_msg.edit_text(
             f"📢 **Broadcast Complete!** ✅\n\n"
-            f"**Message:** {broadcast_message[:100]}{'...' if len(broadcast_message) > 100 else ''}\n\n"
+            f"**Message:** {broadcast_message_preview[100]}\n\n"
             f"📊 **Delivery Report:**\n"
             f"🎯 **Total Users:** {len(user_ids)}\n"
             f"✅ **Successfully Delivered:** {success_count}\n"
             f"❌ **Failed Deliveries:** {failed_count}\n"
             f"📈 **Success Rate:** {(success_count/len(user_ids)*100):.1f}%\n\n"
-            f"⏰ **Completed:** {datetime.now().strftime('%H:%M:%S')}",
-            parse_mode='Markdown'
+            f"⏰ **Completed:** {clock_time()}",
+            parse_mode=ParseMode.MARKDOWN
         )
         
-        logger.info(f"Broadcast sent by admin {update.effective_chat.id} to {success_count}/{len(user_ids)} users")
+        logger.info("Broadcast sent by admin %s to %s/%s users", update.effective_chat.id, success_count, len(user_ids))
     
+    @require_primary_admin("Only admins can use the image broadcast feature.")
     async def broadcast_image_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /broadcastimg command - Admin only"""
-        if not self.config.is_primary_admin(update.effective_chat.id):
-            await update.message.reply_text(
-                "🔒 **Access Denied**\n\n"
-                "Only admins can use the image broadcast feature.",
-                parse_mode='Markdown'
-            )
-            return
-        
         # Set waiting for image state
         context.user_data['waiting_for_broadcast_image'] = True
         
@@ -679,11 +1195,15 @@ class BotHandlers:
             "📏 **Max size:** 10MB\n"
             "⚡ **Delivery:** Instant to all users\n\n"
             "🚫 **To cancel:** Send `/cancel`",
-            parse_mode='Markdown'
+            parse_mode=ParseMode.MARKDOWN
         )
     
     async def handle_broadcast_image(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Handle image for broadcasting"""
+        """Handle image for broadcasting
+        
+        The admin's photo is already on Telegram's servers, so every send (including
+        flood-limit retries) passes its file_id and the image is never re-uploaded.
+        """
         if not self.config.is_primary_admin(update.effective_chat.id):
             return
         
@@ -694,7 +1214,7 @@ class BotHandlers:
             await update.message.reply_text(
                 "❌ Please send an image file (photo).\n\n"
                 "Use `/broadcastimg` to start over or `/cancel` to cancel.",
-                parse_mode='Markdown'
+                parse_mode=ParseMode.MARKDOWN
             )
             return
         
@@ -703,29 +1223,30 @@ class BotHandlers:
         
         # Get image and caption
         photo = update.message.photo[-1]  # Get highest resolution
+        file_id = photo.file_id
         caption = update.message.caption or ""
+        caption_preview = {n: _preview(caption, n) for n in (30, 50, 80, 100)}
         
         # Show confirmation
         confirm_msg = await update.message.reply_text(
             f"🖼️ **Image Broadcast Preview**\n\n"
             f"📸 **Image:** Received ({photo.width}x{photo.height})\n"
-            f"📝 **Caption:** {caption[:100]}{'...' if len(caption) > 100 else caption}\n\n"
+            f"📝 **Caption:** {caption_preview[100]}\n\n"
             f"⚡ **Preparing broadcast...**\n"
             f"🎯 Getting user list...\n"
             f"📊 Calculating delivery...",
-            parse_mode='Markdown'
+            parse_mode=ParseMode.MARKDOWN
         )
         
         # Get all users
-        all_urls = await self.notion_data.get_all_urls()
-        user_ids = set(all_urls.values()) if all_urls else set()
+        user_ids = await self._get_broadcast_user_ids()
         
         if not user_ids:
             await confirm_msg.edit_text(
                 "🖼️ **Image Broadcast Status**\n\n"
                 "❌ No active users found to broadcast to.\n"
                 "Users must have at least one monitored URL to receive broadcasts.",
-                parse_mode='Markdown'
+                parse_mode=ParseMode.MARKDOWN
             )
             return
         
@@ -733,61 +1254,60 @@ class BotHandlers:
         await confirm_msg.edit_text(
             f"🖼️ **Broadcasting Image**\n\n"
             f"📸 **Image:** ({photo.width}x{photo.height})\n"
-            f"📝 **Caption:** {caption[:50]}{'...' if len(caption) > 50 else caption}\n\n"
+            f"📝 **Caption:** {caption_preview[50]}\n\n"
             f"🎯 **Target:** {len(user_ids)} users\n"
             f"⏳ **Status:** Sending...\n"
             f"📨 **Progress:** Starting delivery",
-            parse_mode='Markdown'
+            parse_mode=ParseMode.MARKDOWN
         )
         
         # Send broadcast to all users
-        success_count = 0
-        failed_count = 0
-        
-        for i, user_id in enumerate(user_ids, 1):
-            try:
-                broadcast_caption = f"📢 **Admin Broadcast**\n\n{caption}" if caption else "📢 **Admin Broadcast**"
-                await context.bot.send_photo(
-                    chat_id=user_id,
-                    photo=photo.file_id,
-                    caption=broadcast_caption,
-                    parse_mode='Markdown'
-                )
-                success_count += 1
-                
-                # Update progress every 3 users or at the end
-                if i % 3 == 0 or i == len(user_ids):
-                    await confirm_msg.edit_text(
-                        f"🖼️ **Broadcasting Image**\n\n"
-                        f"📸 **Image:** ({photo.width}x{photo.height})\n"
-                        f"📝 **Caption:** {caption[:30]}{'...' if len(caption) > 30 else caption}\n\n"
-                        f"🎯 **Target:** {len(user_ids)} users\n"
-                        f"⏳ **Status:** Sending...\n"
-                        f"📨 **Progress:** {i}/{len(user_ids)} ({(i/len(user_ids)*100):.0f}%)\n"
-                        f"✅ **Delivered:** {success_count}\n"
-                        f"❌ **Failed:** {failed_count}",
-                        parse_mode='Markdown'
-                    )
-                
-            except Exception as e:
-                failed_count += 1
-                logger.error(f"Failed to send image broadcast to user {user_id}: {e}")
+        broadcast_caption = f"📢 **Admin Broadcast**\n\n{caption}" if caption else "📢 **Admin Broadcast**"
+        
+        async def send(user_id):
+            await context.bot.send_photo(
+                chat_id=user_id,
+                photo=file_id,
+                caption=broadcast_caption,
+                parse_mode=ParseMode.MARKDOWN
+            )
+        
+        # Everything above the counters is fixed for the whole broadcast
+        total = len(user_ids)
+        progress_header = (
+            f"🖼️ **Broadcasting Image**\n\n"
+            f"📸 **Image:** ({photo.width}x{photo.height})\n"
+            f"📝 **Caption:** {caption_preview[30]}\n\n"
+            f"🎯 **Target:** {total} users\n"
+            f"⏳ **Status:** Sending...\n"
+        )
+        
+        async def report_progress(done, delivered):
+            await confirm_msg.edit_text(
+                f"{progress_header}"
+                f"📨 **Progress:** {done}/{total} ({(done/total*100):.0f}%)\n"
+                f"✅ **Delivered:** {delivered}\n"
+                f"❌ **Failed:** {done - delivered}",
+                parse_mode=ParseMode.MARKDOWN
+            )
+        
+        success_count, failed_count = await self._deliver_broadcast(user_ids, send, report_progress)
         
         # Final status report
         await confirm_msg.edit_text(
             f"🖼️ **Image Broadcast Complete!** ✅\n\n"
             f"📸 **Image:** ({photo.width}x{photo.height})\n"
-            f"📝 **Caption:** {caption[:80]}{'...' if len(caption) > 80 else caption}\n\n"
+            f"📝 **Caption:** {caption_preview[80]}\n\n"
             f"📊 **Delivery Report:**\n"
             f"🎯 **Total Users:** {len(user_ids)}\n"
             f"✅ **Successfully Delivered:** {success_count}\n"
             f"❌ **Failed Deliveries:** {failed_count}\n"
             f"📈 **Success Rate:** {(success_count/len(user_ids)*100):.1f}%\n\n"
-            f"⏰ **Completed:** {datetime.now().strftime('%H:%M:%S')}",
-            parse_mode='Markdown'
+            f"⏰ **Completed:** {clock_time()}",
+            parse_mode=ParseMode.MARKDOWN
         )
         
-        logger.info(f"Image broadcast sent by admin {update.effective_chat.id} to {success_count}/{len(user_ids)} users")
+        logger.info("Image broadcast sent by admin %s to %s/%s users", update.effective_chat.id, success_count, len(user_ids))
     
     async def handle_message(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle regular text messages"""
@@ -801,14 +1321,14 @@ class BotHandlers:
                 await update.message.reply_text(
                     "❌ **Image Broadcast Cancelled**\n\n"
                     "The image broadcast has been cancelled. Use `/broadcastimg` to start over.",
-                    parse_mode='Markdown'
+                    parse_mode=ParseMode.MARKDOWN
                 )
                 return
             else:
                 await update.message.reply_text(
                     "📸 **Waiting for Image**\n\n"
                     "Please send an image file to broadcast, or send `/cancel` to cancel.",
-                    parse_mode='Markdown'
+                    parse_mode=ParseMode.MARKDOWN
                 )
                 return
         
@@ -836,82 +1356,40 @@ class BotHandlers:
         ]
         reply_markup = InlineKeyboardMarkup(keyboard)
         
-        await update.message.reply_text(message, parse_mode='Markdown', reply_markup=reply_markup)
+        await update.message.reply_text(message, parse_mode=ParseMode.MARKDOWN, reply_markup=reply_markup)
     
     async def button_callback(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle inline button callbacks"""
         query = update.callback_query
-        await query.answer()
+        callback_data = query.data
+        prefix, _, arg = callback_data.partition(":")
+        
+        # Answer once, up front, so the client stops spinning before any Notion I/O
+        await query.answer(_CALLBACK_TOASTS.get(prefix))
         
         if not self._is_user_allowed(update):
-            await query.edit_message_text("🔒 Sorry, this bot is currently not available.")
+            await self._edit(query, "🔒 Sorry, this bot is currently not available.")
             return
         
-        callback_data = query.data
+        page = _STATIC_PAGES.get(callback_data)
+        if page:
+            text, keyboard = page
+            await self._edit(query, text, parse_mode=ParseMode.MARKDOWN, reply_markup=keyboard)
+            return
+        
+        handler = self._cb_table.get(callback_data)
+        if handler:
+            await handler(query)
+            return
         
-        # Handle advanced UI callbacks
-        if callback_data == "main_menu":
-            await self._handle_main_menu_callback(query)
-        elif callback_data == "main_urls":
-            await self._handle_main_urls_callback(query)
-        elif callback_data == "main_stats":
-            await self._handle_main_stats_callback(query)
-        elif callback_data == "main_settings":
-            await self._handle_settings_callback(query)
-        elif callback_data == "quick_ping":
-            await self._handle_quick_ping_callback(query)
-        elif callback_data == "analytics":
-            await self._handle_analytics_callback(query)
-        elif callback_data == "broadcast_center":
-            await self._handle_broadcast_center_callback(query)
-        elif callback_data == "broadcast_text":
-            await self._handle_broadcast_text_callback(query)
-        elif callback_data == "broadcast_image":
-            await self._handle_broadcast_image_callback(query)
-        elif callback_data == "user_management":
-            await self._handle_user_management_callback(query)
-        elif callback_data == "system_analytics":
-            await self._handle_system_analytics_callback(query)
-        elif callback_data == "view_alerts":
-            await self._handle_alerts_callback(query)
-        elif callback_data == "help_menu":
-            await self._handle_help_menu_callback(query)
-        elif callback_data == "refresh_main":
-            await self._handle_main_menu_callback(query)
-        elif callback_data.startswith("urls_page:"):
-            page = int(callback_data.split(":")[1])
-            await self._handle_urls_page_callback(query, page)
-        elif callback_data.startswith("test_url:"):
-            url_hash = callback_data.split(":")[1]
-            await self._handle_test_url_callback(query, url_hash)
-        elif callback_data.startswith("url_detail:"):
-            url_hash = callback_data.split(":")[1]
-            await self._handle_url_detail_callback(query, url_hash)
-        elif callback_data.startswith("remove_url:"):
-            url_hash = callback_data.split(":")[1]
-            await self._handle_remove_url_callback(query, url_hash)
-        elif callback_data.startswith("confirm_remove:"):
-            url_hash = callback_data.split(":")[1]
-            await self._handle_confirm_remove_callback(query, url_hash)
-        elif callback_data == "add_url_wizard":
-            await self._handle_add_url_wizard_callback(query)
-        elif callback_data == "remove_url_menu":
-            await self._handle_remove_url_menu_callback(query)
-        elif callback_data == "admin_panel":
-            await self._handle_admin_panel_callback(query)
-        # Legacy callbacks for compatibility
-        elif callback_data == "list_urls":
-            await self._handle_main_urls_callback(query)
-        elif callback_data == "show_status":
-            await self._handle_main_stats_callback(query)
-        elif callback_data == "ping_now":
-            await self._handle_quick_ping_callback(query)
-        elif callback_data == "help_seturl":
-            await self._handle_add_url_wizard_callback(query)
+        # Callbacks carrying an argument, e.g. "test_url:<hash>"
+        handler = self._cb_prefix.get(prefix)
+        if handler:
+            await handler(query, arg)
     
     async def _handle_list_urls_callback(self, query):
         """Handle list URLs button callback"""
-        urls = await self.notion_data.get_user_urls(str(query.message.chat.id))
+        urls = await self._get_user_urls_cached(str(query.message.chat.id))
         
         if not urls:
             keyboard = [
@@ -919,11 +1397,12 @@ class BotHandlers:
             ]
             reply_markup = InlineKeyboardMarkup(keyboard)
             
-            await query.edit_message_text(
+            await self._edit(
+                query,
                 "📭 **No URLs Currently Monitored**\n\n"
                 "You haven't added any URLs to monitor yet.\n\n"
                 "Use `/seturl <url>` to start monitoring a URL.",
-                parse_mode='Markdown',
+                parse_mode=ParseMode.MARKDOWN,
                 reply_markup=reply_markup
             )
             return
@@ -936,47 +1415,27 @@ class BotHandlers:
         ]
         reply_markup = InlineKeyboardMarkup(keyboard)
         
-        await query.edit_message_text(
+        await self._edit(
+            query,
             message,
-            parse_mode='Markdown',
+            parse_mode=ParseMode.MARKDOWN,
             reply_markup=reply_markup
         )
     
     async def _handle_show_status_callback(self, query):
         """Handle show status button callback"""
-        urls = await self.notion_data.get_user_urls(str(query.message.chat.id))
+        urls = await self._get_user_urls_cached(str(query.message.chat.id))
         
         if not urls:
-            await query.edit_message_text(
+            await self._edit(
+                query,
                 "📊 **No Status Data Available**\n\n"
                 "No URLs are currently being monitored.",
-                parse_mode='Markdown'
+                parse_mode=ParseMode.MARKDOWN
             )
             return
         
-        # Get statistics from Notion database
-        stats = await self.notion_data.get_url_statistics(str(query.message.chat.id))
-        
-        message = f"📊 **Your URL Statistics**\n\n"
-        message += f"**Total URLs:** {stats['total_urls']}\n"
-        message += f"🟢 **Online:** {stats['online']}\n"
-        message += f"🔴 **Offline:** {stats['offline']}\n"
-        message += f"⏳ **Pending:** {stats['pending']}\n"
-        message += f"⚡ **Avg Response:** {stats['average_response_time']}ms\n\n"
-        
-        # Show individual URL statuses
-        for url, data in urls.items():
-            status_icon = "🟢" if data['status'] == 'online' else "🔴" if data['status'] == 'offline' else "⏳"
-            response_time_str = f" ({data['response_time']}ms)" if data['response_time'] else ""
-            message += f"{status_icon} `{url}`{response_time_str}\n"
-        
-        # Add monitoring status
-        monitor_status = await self.url_monitor.get_monitoring_status()
-        status_icon = "🟢" if monitor_status["is_running"] else "🔴"
-        message += f"\n**Monitoring Status:** {status_icon} {'Active' if monitor_status['is_running'] else 'Inactive'}\n"
-        message += f"**Ping Interval:** {monitor_status['ping_interval']} seconds\n"
-        message += f"**Data Storage:** Notion Database\n"
-        message += f"**Last Updated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+        message = self._render_status_html(urls)
         
         keyboard = [
             [InlineKeyboardButton("🔄 Refresh", callback_data="show_status")],
@@ -984,48 +1443,51 @@ class BotHandlers:
         ]
         reply_markup = InlineKeyboardMarkup(keyboard)
         
-        await query.edit_message_text(
+        await self._edit(
+            query,
             message,
-            parse_mode='Markdown',
+            parse_mode=ParseMode.HTML,
             reply_markup=reply_markup
         )
     
     async def _handle_ping_now_callback(self, query):
         """Handle ping now button callback"""
-        urls = await self.notion_data.get_user_urls(str(query.message.chat.id))
+        urls = await self._get_user_urls_cached(str(query.message.chat.id))
         
         if not urls:
-            await query.edit_message_text(
+            await self._edit(
+                query,
                 "❌ **No URLs to Ping**\n\n"
                 "No URLs are currently being monitored.",
-                parse_mode='Markdown'
+                parse_mode=ParseMode.MARKDOWN
             )
             return
         
         # Update message to show pinging status
-        await query.edit_message_text(
+        await self._edit(
+            query,
             f"🔄 **Pinging {len(urls)} URLs...**\n\n"
             "Please wait while I check all your URLs.",
-            parse_mode='Markdown'
+            parse_mode=ParseMode.MARKDOWN
         )
         
         try:
             # Perform the pings for this user only
             results = await self.url_monitor.ping_user_urls(str(query.message.chat.id))
+            self._invalidate_url_cache(str(query.message.chat.id))  # Pings updated the stored statuses
             
             # Format results
             message = "🔄 **Manual Ping Results**\n\n"
             
             for url, result in results.items():
-                status_icon = "🟢" if result["success"] else "🔴"
-                status_text = "Online" if result["success"] else "Offline"
+                status_icon, status_text = _PING_RESULT_LABEL[bool(result["success"])]
                 
                 message += f"{status_icon} **{status_text}**\n"
                 message += f"   `{url}`\n"
                 message += f"   Status: {result['status_code']} | "
                 message += f"Time: {result['response_time']:.3f}s\n\n"
             
-            message += f"**Completed:** {datetime.now().strftime('%H:%M:%S')}"
+            message += f"**Completed:** {clock_time()}"
             
             keyboard = [
                 [InlineKeyboardButton("📊 Show Status", callback_data="show_status")],
@@ -1033,33 +1495,27 @@ class BotHandlers:
             ]
             reply_markup = InlineKeyboardMarkup(keyboard)
             
-            await query.edit_message_text(
+            await self._edit(
+                query,
                 message,
-                parse_mode='Markdown',
+                parse_mode=ParseMode.MARKDOWN,
                 reply_markup=reply_markup
             )
             
         except Exception as e:
-            logger.error(f"Error in ping now callback: {e}")
-            await query.edit_message_text(
+            logger.error("Error in ping now callback: %s", e)
+            await self._edit(
+                query,
                 f"❌ **Ping Failed**\n\n"
                 f"An error occurred while pinging URLs: {str(e)}",
-                parse_mode='Markdown'
+                parse_mode=ParseMode.MARKDOWN
             )
     
+    @require_allowed
     async def handle_message(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle non-command messages"""
-        if not self._is_user_allowed(update):
-            await update.message.reply_text("Sorry, this bot is currently not available.")
-            return
-        
         # Provide helpful response for non-command messages
-        keyboard = [
-            [InlineKeyboardButton("📋 List URLs", callback_data="list_urls")],
-            [InlineKeyboardButton("📊 Show Status", callback_data="show_status")],
-            [InlineKeyboardButton("🆘 Help", callback_data="help")]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        reply_markup = _HANDLE_MESSAGE_KEYBOARD
         
         await update.message.reply_text(
             "🤖 **AI Assistant Active**\n\n"
@@ -1081,49 +1537,53 @@ class BotHandlers:
         
         reply_markup = self.advanced_ui.create_main_menu_keyboard()
         
-        await query.edit_message_text(
+        await self._edit(
+            query,
             welcome_msg,
-            parse_mode='Markdown',
+            parse_mode=ParseMode.MARKDOWN,
             reply_markup=reply_markup
         )
     
     async def _handle_main_urls_callback(self, query):
         """Handle URLs dashboard callback with enhanced UI"""
         try:
-            # Show loading animation first
-            await query.answer("📊 Loading enhanced dashboard...")
+            user_chat_id = str(query.message.chat.id)
             
-            # Refresh URL hash mapping
-            await self._refresh_url_hash_map(str(query.message.chat.id))
+            # Build the URL hash mapping once; add/remove keep it current afterwards
+            if user_chat_id not in self.url_hash_map:
+                await self._refresh_url_hash_map(user_chat_id)
             
             # Get user URLs from Notion
-            urls = await self.notion_data.get_user_urls(str(query.message.chat.id))
+            urls = await self._get_user_urls_cached(user_chat_id)
             
             # Generate enhanced dashboard
             message, reply_markup = self.advanced_ui.format_enhanced_url_list(urls, page=0, per_page=4)
             
             # Update message with enhanced dashboard
-            await query.edit_message_text(
+            await self._edit(
+                query,
                 message,
-                parse_mode='Markdown',
+                parse_mode=ParseMode.MARKDOWN,
                 reply_markup=reply_markup
             )
         except Exception as e:
-            logger.error(f"Error in main URLs callback: {e}")
-            await query.edit_message_text(
+            logger.error("Error in main URLs callback: %s", e)
+            await self._edit(
+                query,
                 "❌ **Error Loading Dashboard**\n\n"
                 "Please try again later or contact support.",
-                parse_mode='Markdown'
+                parse_mode=ParseMode.MARKDOWN
             )
     
     async def _handle_main_stats_callback(self, query):
         """Handle statistics dashboard callback"""
-        urls = await self.notion_data.get_user_urls(str(query.message.chat.id))
+        urls = await self._get_user_urls_cached(str(query.message.chat.id))
         message, reply_markup = self.advanced_ui.format_advanced_stats(urls)
         
-        await query.edit_message_text(
+        await self._edit(
+            query,
             message,
-            parse_mode='Markdown',
+            parse_mode=ParseMode.MARKDOWN,
             reply_markup=reply_markup
         )
     
@@ -1139,56 +1599,50 @@ class BotHandlers:
         
         reply_markup = self.advanced_ui.create_settings_keyboard()
         
-        await query.edit_message_text(
+        await self._edit(
+            query,
             settings_msg,
-            parse_mode='Markdown',
+            parse_mode=ParseMode.MARKDOWN,
             reply_markup=reply_markup
         )
     
     async def _handle_quick_ping_callback(self, query):
         """Handle quick ping with advanced animation"""
-        urls = await self.notion_data.get_user_urls(str(query.message.chat.id))
+        urls = await self._get_user_urls_cached(str(query.message.chat.id))
         
         if not urls:
-            await query.edit_message_text(
+            await self._edit(
+                query,
                 "❌ **No URLs to Ping**\n\n"
                 "No URLs are currently being monitored.\n"
                 "Add some URLs first to use this feature.",
-                parse_mode='Markdown'
+                parse_mode=ParseMode.MARKDOWN
             )
             return
         
         # Show enhanced loading animation
-        await query.edit_message_text(
+        await self._edit(
+            query,
             f"🚀 **Initiating Advanced Ping Sequence** 🚀\n\n"
             f"⚡ Preparing to ping {len(urls)} URLs...\n"
             f"🎯 Using optimized parallel processing\n"
             f"📊 Real-time analysis enabled\n\n"
             f"⏳ Please wait...",
-            parse_mode='Markdown'
-        )
-        
-        # Simulate progress updates
-        await asyncio.sleep(1)
-        await query.edit_message_text(
-            f"🔄 **Processing URLs** 🔄\n\n"
-            f"▰▰▱▱▱ 40% Complete\n"
-            f"🎯 Testing connectivity...\n"
-            f"📡 Measuring response times...",
-            parse_mode='Markdown'
+            parse_mode=ParseMode.MARKDOWN
         )
         
         try:
-            # Perform the pings for this admin only
-            results = await self.url_monitor.ping_user_urls(str(query.message.chat.id))
+            user_chat_id = str(query.message.chat.id)
             
-            # Enhanced results display
-            message = "⚡ **Advanced Ping Results** ⚡\n\n"
+            # Enhanced results display, filled in as each ping finishes
+            parts = ["⚡ **Advanced Ping Results** ⚡\n\n"]
             
             online_count = 0
             total_response_time = 0
+            checked = 0
+            last_edit = time.monotonic()
             
-            for url, result in results.items():
+            async for url, result in self.url_monitor.iter_ping_user_urls(user_chat_id):
                 if result["success"]:
                     online_count += 1
                     total_response_time += result["response_time"]
@@ -1205,18 +1659,36 @@ class BotHandlers:
                     status_text = "OFFLINE"
                     speed_text = "❌ Failed"
                 
-                message += f"{status_icon} **{status_text}**\n"
-                message += f"   🌐 `{url[:40]}{'...' if len(url) > 40 else ''}`\n"
-                message += f"   📊 Status: {result['status_code']} | {speed_text} ({result['response_time']:.3f}s)\n\n"
+                parts.append(f"{status_icon} **{status_text}**\n")
+                parts.append(f"   🌐 `{url[:40]}{'...' if len(url) > 40 else ''}`\n")
+                parts.append(f"   📊 Status: {result['status_code']} | {speed_text} ({result['response_time']:.3f}s)\n\n")
+                checked += 1
+                
+                now = time.monotonic()
+                if checked < len(urls) and now - last_edit >= _PING_EDIT_INTERVAL:
+                    last_edit = now
+                    try:
+                        await self._edit(
+                            query,
+                            "".join(parts) + f"⏳ **Checked:** {checked}/{len(urls)}",
+                            parse_mode=ParseMode.MARKDOWN
+                        )
+                    except RetryAfter as e:
+                        last_edit = now + e.retry_after
+                    except BadRequest as e:
+                        logger.debug("Could not update ping progress: %s", e)
+            
+            self._invalidate_url_cache(user_chat_id)  # Pings updated the stored statuses
             
             # Summary stats
             avg_response = total_response_time / online_count if online_count > 0 else 0
-            success_rate = (online_count / len(results)) * 100
+            success_rate = (online_count / checked) * 100 if checked else 0
             
+            message = "".join(parts)
             message += f"📈 **Performance Summary:**\n"
             message += f"✅ Success Rate: {success_rate:.1f}%\n"
             message += f"⚡ Average Response: {avg_response:.3f}s\n"
-            message += f"🕐 Completed: {datetime.now().strftime('%H:%M:%S')}"
+            message += f"🕐 Completed: {clock_time()}"
             
             keyboard = [
                 [
@@ -1230,25 +1702,28 @@ class BotHandlers:
             ]
             reply_markup = InlineKeyboardMarkup(keyboard)
             
-            await query.edit_message_text(
+            await self._edit(
+                query,
                 message,
-                parse_mode='Markdown',
+                parse_mode=ParseMode.MARKDOWN,
                 reply_markup=reply_markup
             )
             
         except Exception as e:
-            logger.error(f"Error in quick ping callback: {e}")
-            await query.edit_message_text(
+            logger.error("Error in quick ping callback: %s", e)
+            await self._edit(
+                query,
                 f"❌ **Ping Operation Failed**\n\n"
                 f"An error occurred during the ping sequence.\n"
                 f"**Error:** {str(e)}\n\n"
                 f"Please try again or check your URLs.",
-                parse_mode='Markdown'
+                parse_mode=ParseMode.MARKDOWN
             )
     
     async def _handle_analytics_callback(self, query):
         """Handle analytics dashboard"""
-        await query.edit_message_text(
+        await self._edit(
+            query,
             "📈 **Advanced Analytics Dashboard** 📈\n\n"
             "🚀 **Coming Soon:**\n"
             "• Performance trend analysis\n"
@@ -1257,15 +1732,14 @@ class BotHandlers:
             "• Export data capabilities\n"
             "• Historical comparison charts\n\n"
             "This feature is currently in development.",
-            parse_mode='Markdown',
-            reply_markup=InlineKeyboardMarkup([
-                [InlineKeyboardButton("🏠 Main Menu", callback_data="main_menu")]
-            ])
+            parse_mode=ParseMode.MARKDOWN,
+            reply_markup=_MAIN_MENU_ONLY_KEYBOARD
         )
     
     async def _handle_alerts_callback(self, query):
         """Handle alerts management"""
-        await query.edit_message_text(
+        await self._edit(
+            query,
             "🔔 **Smart Alert System** 🔔\n\n"
             "🎯 **Alert Status:** Active\n"
             "⚡ **Response Time:** Instant\n"
@@ -1276,76 +1750,22 @@ class BotHandlers:
             "• Performance degradation warnings\n"
             "• Custom alert thresholds\n\n"
             "All alerts are automatically sent to this chat.",
-            parse_mode='Markdown',
-            reply_markup=InlineKeyboardMarkup([
-                [InlineKeyboardButton("🏠 Main Menu", callback_data="main_menu")]
-            ])
-        )
-    
-    async def _handle_help_menu_callback(self, query):
-        """Handle help menu"""
-        help_msg = (
-            "🆘 **Interactive Help Center** 🆘\n\n"
-            "🎯 **Quick Navigation:**\n"
-            "Use the interactive buttons for fast access to all features!\n\n"
-            "⚡ **Speed Tips:**\n"
-            "• Dashboard shows real-time status\n"
-            "• Tap URLs for detailed information\n"
-            "• Use Quick Ping for instant checks\n"
-            "• Analytics provide deep insights\n\n"
-            "🚀 **Pro Features:**\n"
-            "• Animated loading indicators\n"
-            "• Progress tracking\n"
-            "• Mobile-optimized interface\n"
-            "• Smart error handling"
-        )
-        
-        keyboard = [
-            [
-                InlineKeyboardButton("🚀 Dashboard", callback_data="main_menu"),
-                InlineKeyboardButton("📊 Quick Stats", callback_data="main_stats")
-            ],
-            [
-                InlineKeyboardButton("🌐 URLs", callback_data="main_urls"),
-                InlineKeyboardButton("⚙️ Settings", callback_data="main_settings")
-            ]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        
-        await query.edit_message_text(help_msg, parse_mode='Markdown', reply_markup=reply_markup)
-    
-    async def _handle_add_url_wizard_callback(self, query):
-        """Handle add URL wizard"""
-        await query.edit_message_text(
-            "➕ **Smart URL Addition Wizard** ➕\n\n"
-            "🎯 **Ready to add a new URL for monitoring!**\n\n"
-            "✨ **Features:**\n"
-            "• Automatic URL validation\n"
-            "• Instant connectivity testing\n"
-            "• Smart protocol detection\n"
-            "• Real-time status updates\n\n"
-            "📝 **How to add:**\n"
-            "Type: `/seturl <your-url>`\n\n"
-            "📌 **Example:**\n"
-            "`/seturl https://myapp.herokuapp.com`\n\n"
-            "💡 **Tip:** You can omit 'https://' - I'll add it automatically!",
-            parse_mode='Markdown',
-            reply_markup=InlineKeyboardMarkup([
-                [InlineKeyboardButton("🏠 Main Menu", callback_data="main_menu")]
-            ])
+            parse_mode=ParseMode.MARKDOWN,
+            reply_markup=_MAIN_MENU_ONLY_KEYBOARD
         )
     
     async def _handle_remove_url_menu_callback(self, query):
         """Handle remove URL menu"""
-        urls = await self.notion_data.get_user_urls(str(query.message.chat.id))
+        urls = await self._get_user_urls_cached(str(query.message.chat.id))
         
         if not urls:
-            await query.edit_message_text(
+            await self._edit(
+                query,
                 "🗑️ **Remove URL Menu** 🗑️\n\n"
                 "📭 **No URLs to Remove**\n\n"
                 "You don't have any URLs currently being monitored.\n"
                 "Add some URLs first to enable removal options!",
-                parse_mode='Markdown',
+                parse_mode=ParseMode.MARKDOWN,
                 reply_markup=InlineKeyboardMarkup([
                     [
                         InlineKeyboardButton("➕ Add URL", callback_data="add_url_wizard"),
@@ -1373,9 +1793,10 @@ class BotHandlers:
         message += f"💡 **Tip:** You can also use `/removeurl <url>` command!\n\n"
         message += f"⚠️ **Note:** Removal is immediate and cannot be undone."
         
-        await query.edit_message_text(
+        await self._edit(
+            query,
             message,
-            parse_mode='Markdown',
+            parse_mode=ParseMode.MARKDOWN,
             reply_markup=reply_markup
         )
     
@@ -1383,165 +1804,93 @@ class BotHandlers:
         """Handle advanced admin panel callback"""
         user_chat_id = query.message.chat.id
         if not self.config.is_primary_admin(user_chat_id):
-            await query.edit_message_text(
+            await self._edit(
+                query,
                 f"🔒 **Access Denied**\n\n"
                 f"Only the primary admin can access the admin panel.\n\n"
                 f"**Your Chat ID:** `{user_chat_id}`\n"
                 f"**Required Admin ID:** `{self.config.primary_admin_chat_id}`\n\n"
                 f"Contact the bot owner to add your Chat ID as admin.",
-                parse_mode='Markdown',
-                reply_markup=InlineKeyboardMarkup([
-                    [InlineKeyboardButton("🏠 Main Menu", callback_data="main_menu")]
-                ])
+                parse_mode=ParseMode.MARKDOWN,
+                reply_markup=_MAIN_MENU_ONLY_KEYBOARD
             )
             return
         
-        # Get system statistics
-        all_urls = await self.notion_data.get_all_urls()
-        total_users = len(set(all_urls.values())) if all_urls else 0
-        total_urls = len(all_urls)
+        # Get system statistics from the running aggregates; only a cold start scans Notion
+        stats = self.url_monitor.stats
+        await stats.ensure_loaded(self.notion_data.get_all_user_urls)
+        total_users = stats.users
+        total_urls = stats.urls
         admin_list = self.config.get_admin_list()
         
-        message = "👑 **Advanced Admin Control Panel** 👑\n\n"
-        message += f"🎯 **System Overview:**\n"
-        message += f"• 👥 Active Users: {total_users}\n"
-        message += f"• 🌐 Total URLs: {total_urls}\n"
-        message += f"• 🛡️ Admins: {len(admin_list)}\n"
-        message += f"• 📊 Database: Notion\n\n"
-        
-        message += f"🚀 **Admin Features Available:**\n"
-        message += f"• 📢 Broadcast Messages & Images\n"
-        message += f"• 👥 User Management System\n"
-        message += f"• 📊 System Analytics & Reports\n"
-        message += f"• 🔧 Database Management Tools\n"
-        message += f"• 🛡️ Admin Access Control\n"
-        message += f"• 📈 Performance Monitoring\n\n"
-        
-        message += f"⚡ **Quick Stats:**\n"
-        # Get online/offline counts
-        online_count = 0
-        offline_count = 0
-        if all_urls:
-            for url in all_urls.keys():
-                # Get status from first user who has this URL
-                user_id = all_urls[url]
-                user_urls = await self.notion_data.get_user_urls(user_id)
-                if url in user_urls:
-                    status = user_urls[url].get('status', '').lower()
-                    if status == 'online':
-                        online_count += 1
-                    elif status == 'offline':
-                        offline_count += 1
-        
-        message += f"• 🟢 Online URLs: {online_count}\n"
-        message += f"• 🔴 Offline URLs: {offline_count}\n"
-        message += f"• ⏱️ Last Update: {datetime.now().strftime('%H:%M:%S')}"
-        
-        keyboard = [
-            [
-                InlineKeyboardButton("📢 Broadcast Center", callback_data="broadcast_center"),
-                InlineKeyboardButton("👥 User Management", callback_data="user_management")
-            ],
-            [
-                InlineKeyboardButton("📊 System Analytics", callback_data="system_analytics"),
-                InlineKeyboardButton("🔧 Database Tools", callback_data="database_tools")
-            ],
-            [
-                InlineKeyboardButton("🛡️ Admin Controls", callback_data="admin_controls"),
-                InlineKeyboardButton("📈 Performance Monitor", callback_data="performance_monitor")
-            ],
-            [
-                InlineKeyboardButton("🔄 Refresh Stats", callback_data="admin_panel"),
-                InlineKeyboardButton("🏠 Main Menu", callback_data="main_menu")
-            ]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        
-        await query.edit_message_text(
+        parts = ["👑 **Advanced Admin Control Panel** 👑\n\n"]
+        parts.append(f"🎯 **System Overview:**\n")
+        parts.append(f"• 👥 Active Users: {total_users}\n")
+        parts.append(f"• 🌐 Total URLs: {total_urls}\n")
+        parts.append(f"• 🛡️ Admins: {len(admin_list)}\n")
+        parts.append(f"• 📊 Database: Notion\n\n")
+        
+        parts.append(f"🚀 **Admin Features Available:**\n")
+        parts.append(f"• 📢 Broadcast Messages & Images\n")
+        parts.append(f"• 👥 User Management System\n")
+        parts.append(f"• 📊 System Analytics & Reports\n")
+        parts.append(f"• 🔧 Database Management Tools\n")
+        parts.append(f"• 🛡️ Admin Access Control\n")
+        parts.append(f"• 📈 Performance Monitoring\n\n")
+        
+        parts.append(f"⚡ **Quick Stats:**\n")
+        parts.append(f"• 🟢 Online URLs: {stats.online}\n")
+        parts.append(f"• 🔴 Offline URLs: {stats.offline}\n")
+        parts.append(f"• ⏱️ Last Update: {clock_time()}")
+        message = "".join(parts)
+        
+        await self._edit(
+            query,
             message,
-            parse_mode='Markdown',
-            reply_markup=reply_markup
+            parse_mode=ParseMode.MARKDOWN,
+            reply_markup=_ADMIN_PANEL_KEYBOARD
         )
     
     async def _handle_broadcast_center_callback(self, query):
         """Handle broadcast center callback"""
         if not self.config.is_primary_admin(query.message.chat.id):
-            await query.edit_message_text("🔒 Access denied. Admin only.")
+            await self._edit(query, "🔒 Access denied. Admin only.")
             return
         
-        message = "📢 **Broadcast Control Center** 📢\n\n"
-        message += "🎯 **Mass Communication Hub**\n\n"
-        message += "✨ **Available Features:**\n"
-        message += "• 📝 Broadcast Text Messages\n"
-        message += "• 🖼️ Broadcast Images with Captions\n"
-        message += "• 🎯 Target Specific Users or All\n"
-        message += "• 📊 Delivery Analytics & Reports\n"
-        message += "• ⚡ Instant or Scheduled Delivery\n\n"
-        
         # Get user statistics
-        all_urls = await self.notion_data.get_all_urls()
-        total_users = len(set(all_urls.values())) if all_urls else 0
-        
-        message += f"👥 **Target Audience:**\n"
-        message += f"• Active Users: {total_users}\n"
-        message += f"• Potential Reach: {total_users} users\n\n"
-        
-        message += "🚀 **How to Broadcast:**\n"
-        message += "1️⃣ Choose message type (text/image)\n"
-        message += "2️⃣ Compose your message\n"
-        message += "3️⃣ Review and confirm\n"
-        message += "4️⃣ Send to all users instantly\n\n"
-        
-        message += "⚠️ **Important:** Use responsibly!"
-        
-        keyboard = [
-            [
-                InlineKeyboardButton("📝 Text Broadcast", callback_data="broadcast_text"),
-                InlineKeyboardButton("🖼️ Image Broadcast", callback_data="broadcast_image")
-            ],
-            [
-                InlineKeyboardButton("👥 User List", callback_data="broadcast_users"),
-                InlineKeyboardButton("📊 Broadcast Stats", callback_data="broadcast_stats")
-            ],
-            [
-                InlineKeyboardButton("📋 Message Templates", callback_data="message_templates"),
-                InlineKeyboardButton("⚙️ Broadcast Settings", callback_data="broadcast_settings")
-            ],
-            [
-                InlineKeyboardButton("🔙 Admin Panel", callback_data="admin_panel"),
-                InlineKeyboardButton("🏠 Main Menu", callback_data="main_menu")
-            ]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        
-        await query.edit_message_text(
-            message,
-            parse_mode='Markdown',
-            reply_markup=reply_markup
+        stats = self.url_monitor.stats
+        await stats.ensure_loaded(self.notion_data.get_all_user_urls)
+        total_users = stats.users
+        
+        await self._edit(
+            query,
+            _BROADCAST_CENTER_TEMPLATE.format(total_users=total_users),
+            parse_mode=ParseMode.MARKDOWN,
+            reply_markup=_BROADCAST_CENTER_KEYBOARD
         )
     
     async def _handle_urls_page_callback(self, query, page):
         """Handle enhanced URL pagination"""
         try:
-            await query.answer(f"📄 Loading page {page + 1}...")
-            
             # Get URLs from Notion
-            urls = await self.notion_data.get_user_urls(str(query.message.chat.id))
+            urls = await self._get_user_urls_cached(str(query.message.chat.id))
             
             # Generate enhanced dashboard with pagination
             message, reply_markup = self.advanced_ui.format_enhanced_url_list(urls, page, per_page=4)
             
-            await query.edit_message_text(
+            await self._edit(
+                query,
                 message,
-                parse_mode='Markdown',
+                parse_mode=ParseMode.MARKDOWN,
                 reply_markup=reply_markup
             )
         except Exception as e:
-            logger.error(f"Error in URL pagination: {e}")
-            await query.edit_message_text(
+            logger.error("Error in URL pagination: %s", e)
+            await self._edit(
+                query,
                 "❌ **Error Loading Page**\n\n"
                 "Please try refreshing the dashboard.",
-                parse_mode='Markdown',
+                parse_mode=ParseMode.MARKDOWN,
                 reply_markup=InlineKeyboardMarkup([
                     [InlineKeyboardButton("🔄 Refresh Dashboard", callback_data="main_urls")]
                 ])
@@ -1549,19 +1898,19 @@ class BotHandlers:
     
     async def _handle_test_url_callback(self, query, url_hash):
         """Handle individual URL testing"""
-        if url_hash not in self.url_hash_map:
-            await query.edit_message_text("❌ URL not found. Please refresh and try again.")
+        url = self._lookup_url(url_hash, str(query.message.chat.id))
+        if not url:
+            await self._edit(query, "❌ URL not found. Please refresh and try again.")
             return
         
-        url = self.url_hash_map[url_hash]
-        
-        await query.edit_message_text(
+        await self._edit(
+            query,
             f"🧪 **Testing URL** 🧪\n\n"
             f"🌐 `{url}`\n\n"
             f"⚡ Running connectivity test...\n"
             f"📊 Measuring response time...\n"
             f"🔍 Analyzing performance...",
-            parse_mode='Markdown'
+            parse_mode=ParseMode.MARKDOWN
         )
         
         # Perform single URL test
@@ -1581,17 +1930,18 @@ class BotHandlers:
             status_text = "OFFLINE"
             performance = "🚫 Failed"
         
-        message = f"🧪 **URL Test Results** 🧪\n\n"
-        message += f"🌐 **URL:** `{url}`\n"
-        message += f"{status_icon} **Status:** {status_text}\n"
-        message += f"📊 **HTTP Code:** {result['status_code']}\n"
-        message += f"⏱️ **Response Time:** {result['response_time']:.3f}s\n"
-        message += f"📈 **Performance:** {performance}\n"
+        parts = [f"🧪 **URL Test Results** 🧪\n\n"]
+        parts.append(f"🌐 **URL:** `{url}`\n")
+        parts.append(f"{status_icon} **Status:** {status_text}\n")
+        parts.append(f"📊 **HTTP Code:** {result['status_code']}\n")
+        parts.append(f"⏱️ **Response Time:** {result['response_time']:.3f}s\n")
+        parts.append(f"📈 **Performance:** {performance}\n")
         
         if result.get("error"):
-            message += f"⚠️ **Error:** {result['error']}\n"
+            parts.append(f"⚠️ **Error:** {result['error']}\n")
         
-        message += f"\n🕐 **Test Time:** {datetime.now().strftime('%H:%M:%S')}"
+        parts.append(f"\n🕐 **Test Time:** {clock_time()}")
+        message = "".join(parts)
         
         keyboard = [
             [
@@ -1605,37 +1955,34 @@ class BotHandlers:
         ]
         reply_markup = InlineKeyboardMarkup(keyboard)
         
-        await query.edit_message_text(
+        await self._edit(
+            query,
             message,
-            parse_mode='Markdown',
+            parse_mode=ParseMode.MARKDOWN,
             reply_markup=reply_markup
         )
     
     async def _handle_remove_url_callback(self, query, url_hash):
         """Handle URL removal through button interface"""
         try:
-            # Refresh hash mapping first
-            await self._refresh_url_hash_map(str(query.message.chat.id))
-            
-            if url_hash not in self.url_hash_map:
-                await query.edit_message_text(
+            user_chat_id = str(query.message.chat.id)
+            url = await self._resolve_url_hash(url_hash, user_chat_id)
+            if not url:
+                await self._edit(
+                    query,
                     "❌ URL not found. Please refresh and try again.",
-                    reply_markup=InlineKeyboardMarkup([
-                        [InlineKeyboardButton("🔄 Refresh URLs", callback_data="main_urls")],
-                        [InlineKeyboardButton("🏠 Main Menu", callback_data="main_menu")]
-                    ])
+                    reply_markup=_URL_NOT_FOUND_KEYBOARD
                 )
                 return
             
-            url = self.url_hash_map[url_hash]
-            
             # Show confirmation message
-            await query.edit_message_text(
+            await self._edit(
+                query,
                 f"🗑️ **Confirm URL Removal**\n\n"
                 f"**URL:** `{url}`\n\n"
                 f"⚠️ This will stop monitoring this URL permanently.\n"
                 f"Are you sure you want to remove it?",
-                parse_mode='Markdown',
+                parse_mode=ParseMode.MARKDOWN,
                 reply_markup=InlineKeyboardMarkup([
                     [
                         InlineKeyboardButton("✅ Yes, Remove", callback_data=f"confirm_remove:{url_hash}"),
@@ -1644,11 +1991,12 @@ class BotHandlers:
                 ])
             )
         except Exception as e:
-            logger.error(f"Error in remove URL callback: {e}")
-            await query.edit_message_text(
+            logger.error("Error in remove URL callback: %s", e)
+            await self._edit(
+                query,
                 "❌ **Error Processing Request**\n\n"
                 "Please try refreshing the dashboard.",
-                parse_mode='Markdown',
+                parse_mode=ParseMode.MARKDOWN,
                 reply_markup=InlineKeyboardMarkup([
                     [InlineKeyboardButton("🔄 Refresh URLs", callback_data="main_urls")]
                 ])
@@ -1657,25 +2005,21 @@ class BotHandlers:
     async def _handle_url_detail_callback(self, query, url_hash):
         """Handle enhanced URL detail view callback"""
         try:
-            await query.answer("📊 Loading URL analytics...")
-            
-            if url_hash not in self.url_hash_map:
-                await query.edit_message_text(
+            url = self._lookup_url(url_hash, str(query.message.chat.id))
+            if not url:
+                await self._edit(
+                    query,
                     "❌ URL not found. Please refresh and try again.",
-                    reply_markup=InlineKeyboardMarkup([
-                        [InlineKeyboardButton("🔄 Refresh URLs", callback_data="main_urls")],
-                        [InlineKeyboardButton("🏠 Main Menu", callback_data="main_menu")]
-                    ])
+                    reply_markup=_URL_NOT_FOUND_KEYBOARD
                 )
                 return
             
-            url = self.url_hash_map[url_hash]
-            
             # Get URL details from Notion
             url_data = await self.notion_data.get_user_url(str(query.message.chat.id), url)
             
             if not url_data:
-                await query.edit_message_text(
+                await self._edit(
+                    query,
                     "❌ URL details not found.",
                     reply_markup=InlineKeyboardMarkup([
                         [InlineKeyboardButton("🔄 Refresh URLs", callback_data="main_urls")]
@@ -1686,18 +2030,20 @@ class BotHandlers:
             # Use enhanced detail view
             message, reply_markup = self.advanced_ui.create_url_detail_view(url, url_data)
             
-            await query.edit_message_text(
+            await self._edit(
+                query,
                 message,
-                parse_mode='Markdown',
+                parse_mode=ParseMode.MARKDOWN,
                 reply_markup=reply_markup
             )
             
         except Exception as e:
-            logger.error(f"Error in URL detail callback: {e}")
-            await query.edit_message_text(
+            logger.error("Error in URL detail callback: %s", e)
+            await self._edit(
+                query,
                 "❌ **Error Loading URL Details**\n\n"
                 "Please try again later.",
-                parse_mode='Markdown',
+                parse_mode=ParseMode.MARKDOWN,
                 reply_markup=InlineKeyboardMarkup([
                     [InlineKeyboardButton("🔄 Try Again", callback_data=f"url_detail:{url_hash}")],
                     [InlineKeyboardButton("🌐 Dashboard", callback_data="main_urls")]
@@ -1707,39 +2053,36 @@ class BotHandlers:
     async def _handle_confirm_remove_callback(self, query, url_hash):
         """Handle confirmed URL removal"""
         try:
-            # Refresh hash mapping to ensure we have latest data
-            await self._refresh_url_hash_map(str(query.message.chat.id))
-            
-            if url_hash not in self.url_hash_map:
-                await query.edit_message_text(
+            user_chat_id = str(query.message.chat.id)
+            url = await self._resolve_url_hash(url_hash, user_chat_id)
+            if not url:
+                await self._edit(
+                    query,
                     "❌ URL not found. Please refresh and try again.",
-                    reply_markup=InlineKeyboardMarkup([
-                        [InlineKeyboardButton("🔄 Refresh URLs", callback_data="main_urls")],
-                        [InlineKeyboardButton("🏠 Main Menu", callback_data="main_menu")]
-                    ])
+                    reply_markup=_URL_NOT_FOUND_KEYBOARD
                 )
                 return
             
-            url = self.url_hash_map[url_hash]
-            
-            # Show processing message with answer to prevent timeout
-            await query.answer("🗑️ Removing URL...")
-            await query.edit_message_text(
+            # Show processing message while Notion is updated
+            await self._edit(
+                query,
                 f"🗑️ **Removing URL...**\n\n"
                 f"**URL:** `{url}`\n\n"
                 f"⏳ Stopping monitoring...\n"
                 f"⏳ Removing from database...\n"
                 f"⏳ Cleaning up resources...",
-                parse_mode='Markdown'
+                parse_mode=ParseMode.MARKDOWN
             )
             
             # Remove URL from monitoring
             success = await self.url_monitor.remove_url(url, str(query.message.chat.id))
             
             if success:
-                # Remove from hash mapping
-                if url_hash in self.url_hash_map:
-                    del self.url_hash_map[url_hash]
+                # Remove from hash mapping and cached listings
+                self._hash_map_for(user_chat_id).pop(url_hash, None)
+                self._invalidate_url_cache(user_chat_id)
+                self._broadcast_ids_cache.invalidate()  # Recipient set may have changed
+                self.url_monitor.stats.url_removed(user_chat_id, url)
                 
                 # Show success message
                 keyboard = [
@@ -1753,36 +2096,39 @@ class BotHandlers:
                 ]
                 reply_markup = InlineKeyboardMarkup(keyboard)
                 
-                await query.edit_message_text(
+                await self._edit(
+                    query,
                     f"✅ **URL Removed Successfully!**\n\n"
                     f"**Removed URL:** `{url}`\n"
                     f"**Status:** No longer monitoring\n\n"
                     f"This URL will no longer receive keep-alive pings.\n\n"
-                    f"🕐 **Removed at:** {datetime.now().strftime('%H:%M:%S')}",
-                    parse_mode='Markdown',
+                    f"🕐 **Removed at:** {clock_time()}",
+                    parse_mode=ParseMode.MARKDOWN,
                     reply_markup=reply_markup
                 )
-                logger.info(f"Successfully removed URL {url} for user {query.message.chat.id}")
+                logger.info("Successfully removed URL %s for user %s", url, query.message.chat.id)
             else:
-                await query.edit_message_text(
+                await self._edit(
+                    query,
                     f"❌ **Failed to Remove URL**\n\n"
                     f"**URL:** `{url}`\n"
                     f"This URL may not exist in the monitoring system.\n\n"
                     f"Use the URL list to see all monitored URLs.",
-                    parse_mode='Markdown',
+                    parse_mode=ParseMode.MARKDOWN,
                     reply_markup=InlineKeyboardMarkup([
                         [InlineKeyboardButton("📋 View URLs", callback_data="main_urls")],
                         [InlineKeyboardButton("🏠 Main Menu", callback_data="main_menu")]
                     ])
                 )
-                logger.warning(f"Failed to remove URL {url} for user {query.message.chat.id}")
+                logger.warning("Failed to remove URL %s for user %s", url, query.message.chat.id)
                 
         except Exception as e:
-            logger.error(f"Error in confirm remove callback: {e}")
-            await query.edit_message_text(
+            logger.error("Error in confirm remove callback: %s", e)
+            await self._edit(
+                query,
                 "❌ **Error Removing URL**\n\n"
                 "An unexpected error occurred. Please try again.",
-                parse_mode='Markdown',
+                parse_mode=ParseMode.MARKDOWN,
                 reply_markup=InlineKeyboardMarkup([
                     [InlineKeyboardButton("🔄 Try Again", callback_data="main_urls")],
                     [InlineKeyboardButton("🏠 Main Menu", callback_data="main_menu")]
@@ -1791,30 +2137,38 @@ class BotHandlers:
     
     async def _handle_view_alerts_callback(self, query):
         """Handle view alerts callback"""
-        urls = await self.notion_data.get_user_urls(str(query.message.chat.id))
+        urls = await self._get_user_urls_cached(str(query.message.chat.id))
         
-        message = f"🔔 **Alert System** 🔔\n\n"
+        parts = [f"🔔 **Alert System** 🔔\n\n"]
         
         if not urls:
-            message += "📭 **No URLs Monitored**\n\n"
-            message += "Add URLs to receive downtime alerts!"
+            parts.append("📭 **No URLs Monitored**\n\n")
+            parts.append("Add URLs to receive downtime alerts!")
         else:
-            offline_urls = [url for url, data in urls.items() if data.get('status') == 'Offline']
+            # One pass: count offline URLs, keeping only the few that are listed
+            shown_offline = []
+            offline_count = 0
+            for url, data in urls.items():
+                if data.get('status') == 'offline':
+                    offline_count += 1
+                    if len(shown_offline) < 5:
+                        shown_offline.append(url)
             
-            if offline_urls:
-                message += f"🚨 **Active Alerts** 🚨\n\n"
-                for url in offline_urls[:5]:
-                    message += f"🔴 `{url}`\n"
-                if len(offline_urls) > 5:
-                    message += f"... and {len(offline_urls) - 5} more\n"
+            if offline_count:
+                parts.append(f"🚨 **Active Alerts** 🚨\n\n")
+                for url in shown_offline:
+                    parts.append(f"🔴 `{url}`\n")
+                if offline_count > 5:
+                    parts.append(f"... and {offline_count - 5} more\n")
             else:
-                message += "✅ **All Systems Online** ✅\n\n"
-                message += "No active alerts. All URLs are working!"
+                parts.append("✅ **All Systems Online** ✅\n\n")
+                parts.append("No active alerts. All URLs are working!")
             
-            message += f"\n📊 **Alert Summary:**\n"
-            message += f"• Total URLs: {len(urls)}\n"
-            message += f"• Active Alerts: {len(offline_urls)}\n"
-            message += f"• Status: {'🟢 Good' if len(offline_urls) == 0 else '🔴 Issues Detected'}"
+            parts.append(f"\n📊 **Alert Summary:**\n")
+            parts.append(f"• Total URLs: {len(urls)}\n")
+            parts.append(f"• Active Alerts: {offline_count}\n")
+            parts.append(f"• Status: {'🟢 Good' if offline_count == 0 else '🔴 Issues Detected'}")
+        message = "".join(parts)
         
         keyboard = [
             [
@@ -1831,340 +2185,137 @@ class BotHandlers:
         ]
         reply_markup = InlineKeyboardMarkup(keyboard)
         
-        await query.edit_message_text(
-            message,
-            parse_mode='Markdown',
-            reply_markup=reply_markup
-        )
-    
-    async def _handle_help_menu_callback(self, query):
-        """Handle help menu callback"""
-        help_msg = (
-            "ℹ️ **Help & Support** ℹ️\n\n"
-            "🚀 **Quick Start Guide:**\n"
-            "1️⃣ Click '➕ Add URL' to start monitoring\n"
-            "2️⃣ Enter your website URL\n"
-            "3️⃣ Monitor real-time status\n"
-            "4️⃣ Get instant downtime alerts\n\n"
-            "🎛️ **Available Features:**\n"
-            "• 🌐 URL Management Dashboard\n"
-            "• 📊 Real-time Statistics\n"
-            "• ⚡ Instant Ping Testing\n"
-            "• 🔔 Downtime Alerts\n"
-            "• 📈 Performance Analytics\n\n"
-            "💡 **Pro Tips:**\n"
-            "• Monitor every 60 seconds automatically\n"
-            "• Get alerts immediately when sites go down\n"
-            "• View response time trends\n"
-            "• All data stored securely in Notion\n\n"
-            "❓ **Need More Help?**\n"
-            "Use the /help command for detailed instructions!"
-        )
-        
-        keyboard = [
-            [
-                InlineKeyboardButton("🚀 Get Started", callback_data="add_url_wizard"),
-                InlineKeyboardButton("📊 View Dashboard", callback_data="main_menu")
-            ],
-            [
-                InlineKeyboardButton("💬 Commands List", callback_data="commands_help"),
-                InlineKeyboardButton("🔧 Settings", callback_data="main_settings")
-            ]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        
-        await query.edit_message_text(help_msg, parse_mode='Markdown', reply_markup=reply_markup)
-    
-    async def _handle_add_url_wizard_callback(self, query):
-        """Handle add URL wizard callback"""
-        message = (
-            "➕ **Add URL Wizard** ➕\n\n"
-            "🎯 **Ready to monitor a new website!**\n\n"
-            "📋 **How to add a URL:**\n"
-            "1️⃣ Use command: `/seturl <your-url>`\n"
-            "2️⃣ Example: `/seturl https://myapp.com`\n"
-            "3️⃣ Bot will start monitoring immediately\n\n"
-            "✅ **Supported URLs:**\n"
-            "• https://example.com\n"
-            "• http://example.com\n"
-            "• https://api.example.com/health\n"
-            "• Any publicly accessible URL\n\n"
-            "⚡ **What happens next:**\n"
-            "• Instant connectivity test\n"
-            "• Automatic monitoring every 60 seconds\n"
-            "• Real-time alerts for downtime\n"
-            "• Performance tracking\n\n"
-            "💡 **Tip:** You can monitor multiple URLs!"
-        )
-        
-        keyboard = [
-            [
-                InlineKeyboardButton("📋 View Current URLs", callback_data="main_urls"),
-                InlineKeyboardButton("📊 Statistics", callback_data="main_stats")
-            ],
-            [
-                InlineKeyboardButton("❓ Help", callback_data="help_menu"),
-                InlineKeyboardButton("🏠 Main Menu", callback_data="main_menu")
-            ]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        
-        await query.edit_message_text(
+        await self._edit(
+            query,
             message,
-            parse_mode='Markdown',
+            parse_mode=ParseMode.MARKDOWN,
             reply_markup=reply_markup
         )
     
     async def _handle_broadcast_text_callback(self, query):
         """Handle text broadcast setup"""
         if not self.config.is_primary_admin(query.message.chat.id):
-            await query.edit_message_text("🔒 Access denied. Admin only.")
+            await self._edit(query, "🔒 Access denied. Admin only.")
             return
         
-        message = "📝 **Text Broadcast Setup** 📝\n\n"
-        message += "🎯 **Ready to send message to all users!**\n\n"
-        message += "📋 **Instructions:**\n"
-        message += "1️⃣ Type: `/broadcast <your message>`\n"
-        message += "2️⃣ Example: `/broadcast 🚀 New features available!`\n"
-        message += "3️⃣ Message will be sent to all active users\n\n"
-        
-        message += "✨ **Message Features:**\n"
-        message += "• ✅ Markdown formatting supported\n"
-        message += "• 📝 Unlimited text length\n"
-        message += "• 🔗 Links and formatting allowed\n"
-        message += "• ⚡ Instant delivery to all users\n\n"
-        
-        message += "💡 **Pro Tips:**\n"
-        message += "• Use **bold** and *italic* text\n"
-        message += "• Add emojis for better engagement\n"
-        message += "• Keep messages clear and concise\n"
-        message += "• Test formatting with a single message first\n\n"
-        
-        message += "📊 **Sample Commands:**\n"
-        message += "`/broadcast Hello everyone! 👋`\n"
-        message += "`/broadcast **Important Update:** New features added!`\n"
-        message += "`/broadcast 🔧 Maintenance scheduled for tonight`"
-        
-        keyboard = [
-            [
-                InlineKeyboardButton("📋 Message Templates", callback_data="message_templates"),
-                InlineKeyboardButton("👥 Target Users", callback_data="broadcast_users")
-            ],
-            [
-                InlineKeyboardButton("🧪 Test Message", callback_data="test_broadcast"),
-                InlineKeyboardButton("📊 Delivery Stats", callback_data="broadcast_stats")
-            ],
-            [
-                InlineKeyboardButton("🔙 Broadcast Center", callback_data="broadcast_center"),
-                InlineKeyboardButton("👑 Admin Panel", callback_data="admin_panel")
-            ]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        
-        await query.edit_message_text(
-            message,
-            parse_mode='Markdown',
-            reply_markup=reply_markup
+        await self._edit(
+            query,
+            _BROADCAST_TEXT_MSG,
+            parse_mode=ParseMode.MARKDOWN,
+            reply_markup=_BROADCAST_TEXT_KEYBOARD
         )
     
     async def _handle_broadcast_image_callback(self, query):
         """Handle image broadcast setup"""
         if not self.config.is_primary_admin(query.message.chat.id):
-            await query.edit_message_text("🔒 Access denied. Admin only.")
+            await self._edit(query, "🔒 Access denied. Admin only.")
             return
         
-        message = "🖼️ **Image Broadcast Setup** 🖼️\n\n"
-        message += "🎯 **Send images with captions to all users!**\n\n"
-        message += "📋 **Instructions:**\n"
-        message += "1️⃣ Use command: `/broadcastimg`\n"
-        message += "2️⃣ Send the image as a reply to the command\n"
-        message += "3️⃣ Add caption with the image\n"
-        message += "4️⃣ Image will be sent to all users\n\n"
-        
-        message += "✨ **Image Features:**\n"
-        message += "• 🖼️ JPG, PNG, GIF supported\n"
-        message += "• 📝 Rich captions with Markdown\n"
-        message += "• 🎯 Broadcast to all active users\n"
-        message += "• ⚡ High-quality image delivery\n\n"
-        
-        message += "💡 **Pro Tips:**\n"
-        message += "• Use high-quality images\n"
-        message += "• Keep file sizes reasonable (<10MB)\n"
-        message += "• Add engaging captions\n"
-        message += "• Test with single user first\n\n"
-        
-        message += "📊 **Usage Examples:**\n"
-        message += "1. Send `/broadcastimg`\n"
-        message += "2. Reply with image + caption\n"
-        message += "3. Confirm broadcast delivery\n"
-        message += "4. Monitor delivery status"
-        
-        keyboard = [
-            [
-                InlineKeyboardButton("📸 Start Image Broadcast", callback_data="start_img_broadcast"),
-                InlineKeyboardButton("🎨 Image Templates", callback_data="image_templates")
-            ],
-            [
-                InlineKeyboardButton("👥 Target Users", callback_data="broadcast_users"),
-                InlineKeyboardButton("📊 Image Stats", callback_data="image_broadcast_stats")
-            ],
-            [
-                InlineKeyboardButton("🔙 Broadcast Center", callback_data="broadcast_center"),
-                InlineKeyboardButton("👑 Admin Panel", callback_data="admin_panel")
-            ]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        
-        await query.edit_message_text(
-            message,
-            parse_mode='Markdown',
-            reply_markup=reply_markup
+        await self._edit(
+            query,
+            _BROADCAST_IMAGE_MSG,
+            parse_mode=ParseMode.MARKDOWN,
+            reply_markup=_BROADCAST_IMAGE_KEYBOARD
         )
     
     async def _handle_user_management_callback(self, query):
         """Handle user management panel"""
         if not self.config.is_primary_admin(query.message.chat.id):
-            await query.edit_message_text("🔒 Access denied. Admin only.")
+            await self._edit(query, "🔒 Access denied. Admin only.")
             return
         
-        # Get user statistics
-        all_urls = await self.notion_data.get_all_urls()
-        user_ids = set(all_urls.values()) if all_urls else set()
-        total_users = len(user_ids)
-        
-        message = "👥 **User Management Panel** 👥\n\n"
-        message += f"📊 **User Statistics:**\n"
-        message += f"• Total Active Users: {total_users}\n"
-        message += f"• Total URLs Monitored: {len(all_urls)}\n"
-        message += f"• Average URLs per User: {len(all_urls) / max(total_users, 1):.1f}\n\n"
-        
-        message += "🎯 **Management Features:**\n"
-        message += "• 👁️ View all user activity\n"
-        message += "• 📊 User statistics and metrics\n"
-        message += "• 🚫 Block/Unblock users (if needed)\n"
-        message += "• 📈 User engagement analytics\n"
-        message += "• 📋 Export user data\n\n"
+        # Per-user URL counts are maintained on add/remove; only a cold start scans Notion
+        stats = self.url_monitor.stats
+        await stats.ensure_loaded(self.notion_data.get_all_user_urls)
+        total_users = stats.users
+        total_urls = stats.urls
+        
+        parts = ["👥 **User Management Panel** 👥\n\n"]
+        parts.append(f"📊 **User Statistics:**\n")
+        parts.append(f"• Total Active Users: {total_users}\n")
+        parts.append(f"• Total URLs Monitored: {total_urls}\n")
+        parts.append(f"• Average URLs per User: {total_urls / max(total_users, 1):.1f}\n\n")
+        
+        parts.append("🎯 **Management Features:**\n")
+        parts.append("• 👁️ View all user activity\n")
+        parts.append("• 📊 User statistics and metrics\n")
+        parts.append("• 🚫 Block/Unblock users (if needed)\n")
+        parts.append("• 📈 User engagement analytics\n")
+        parts.append("• 📋 Export user data\n\n")
         
         if total_users > 0:
-            message += f"🏆 **Top Users (by URLs monitored):**\n"
-            # Count URLs per user
-            user_url_counts = {}
-            for url, user_id in all_urls.items():
-                user_url_counts[user_id] = user_url_counts.get(user_id, 0) + 1
-            
-            # Sort and show top users
-            sorted_users = sorted(user_url_counts.items(), key=lambda x: x[1], reverse=True)
-            for i, (user_id, url_count) in enumerate(sorted_users[:5], 1):
-                message += f"{i}. User `{user_id}`: {url_count} URLs\n"
-        
-        keyboard = [
-            [
-                InlineKeyboardButton("👁️ View All Users", callback_data="view_all_users"),
-                InlineKeyboardButton("📊 User Analytics", callback_data="user_analytics")
-            ],
-            [
-                InlineKeyboardButton("📈 Activity Report", callback_data="activity_report"),
-                InlineKeyboardButton("📋 Export Data", callback_data="export_user_data")
-            ],
-            [
-                InlineKeyboardButton("🔧 User Tools", callback_data="user_tools"),
-                InlineKeyboardButton("⚙️ User Settings", callback_data="user_settings_admin")
-            ],
-            [
-                InlineKeyboardButton("🔙 Admin Panel", callback_data="admin_panel"),
-                InlineKeyboardButton("🏠 Main Menu", callback_data="main_menu")
-            ]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
+            parts.append(f"🏆 **Top Users (by URLs monitored):**\n")
+            for i, (user_id, url_count) in enumerate(stats.top_users(5), 1):
+                parts.append(f"{i}. User `{user_id}`: {url_count} URLs\n")
+        message = "".join(parts)
         
-        await query.edit_message_text(
+        await self._edit(
+            query,
             message,
-            parse_mode='Markdown',
-            reply_markup=reply_markup
+            parse_mode=ParseMode.MARKDOWN,
+            reply_markup=_USER_MANAGEMENT_KEYBOARD
         )
     
     async def _handle_system_analytics_callback(self, query):
         """Handle system analytics panel"""
         if not self.config.is_primary_admin(query.message.chat.id):
-            await query.edit_message_text("🔒 Access denied. Admin only.")
+            await self._edit(query, "🔒 Access denied. Admin only.")
             return
         
-        # Get comprehensive system stats
-        all_urls = await self.notion_data.get_all_urls()
-        total_users = len(set(all_urls.values())) if all_urls else 0
-        total_urls = len(all_urls)
-        
-        # Calculate status statistics
-        online_count = 0
-        offline_count = 0
-        pending_count = 0
-        total_response_time = 0
-        response_count = 0
-        
-        for url in all_urls.keys():
-            user_id = all_urls[url]
-            user_urls = await self.notion_data.get_user_urls(user_id)
-            if url in user_urls:
-                status = user_urls[url].get('status', '').lower()
-                if status == 'online':
-                    online_count += 1
-                elif status == 'offline':
-                    offline_count += 1
-                else:
-                    pending_count += 1
-                
-                response_time = user_urls[url].get('response_time')
-                if response_time and response_time > 0:
-                    total_response_time += response_time
-                    response_count += 1
+        # Read the running aggregates; only the first view scans Notion
+        stats = self.url_monitor.stats
+        if not stats.loaded:
+            await self._edit(query, "📊 **System Analytics Dashboard** 📊\n\n⏳ Collecting system statistics...", parse_mode=ParseMode.MARKDOWN)
+        await stats.ensure_loaded(self.notion_data.get_all_user_urls)
         
-        avg_response = total_response_time / max(response_count, 1)
-        uptime_percentage = (online_count / max(total_urls, 1)) * 100
-        
-        message = "📊 **System Analytics Dashboard** 📊\n\n"
-        message += f"🎯 **Overall Health: {('🟢 Excellent' if uptime_percentage >= 95 else '🟡 Good' if uptime_percentage >= 80 else '🔴 Needs Attention')}**\n\n"
-        
-        message += f"📈 **Key Metrics:**\n"
-        message += f"• 🌐 Total URLs: {total_urls}\n"
-        message += f"• 👥 Active Users: {total_users}\n"
-        message += f"• 🟢 Online: {online_count} ({online_count/max(total_urls,1)*100:.1f}%)\n"
-        message += f"• 🔴 Offline: {offline_count} ({offline_count/max(total_urls,1)*100:.1f}%)\n"
-        message += f"• ⏳ Pending: {pending_count}\n"
-        message += f"• ⚡ Avg Response: {avg_response:.3f}s\n\n"
-        
-        message += f"📊 **System Performance:**\n"
-        message += f"• 📈 Overall Uptime: {uptime_percentage:.1f}%\n"
-        message += f"• ⚡ Performance Grade: {'A+' if avg_response < 1 else 'A' if avg_response < 2 else 'B' if avg_response < 3 else 'C'}\n"
-        message += f"• 🎯 Service Quality: {'Excellent' if uptime_percentage >= 99 else 'Good' if uptime_percentage >= 95 else 'Fair'}\n\n"
-        
-        message += f"🔧 **System Status:**\n"
-        message += f"• 🔄 Monitoring: Active\n"
-        message += f"• 💾 Database: Notion (Connected)\n"
-        message += f"• ⏱️ Last Update: {datetime.now().strftime('%H:%M:%S')}\n"
-        message += f"• 🌟 Bot Status: Running Smoothly"
-        
-        keyboard = [
-            [
-                InlineKeyboardButton("📈 Detailed Reports", callback_data="detailed_reports"),
-                InlineKeyboardButton("📊 Performance Trends", callback_data="performance_trends")
-            ],
-            [
-                InlineKeyboardButton("🔍 URL Analysis", callback_data="url_analysis"),
-                InlineKeyboardButton("👥 User Activity", callback_data="user_activity_analytics")
-            ],
-            [
-                InlineKeyboardButton("📋 Export Analytics", callback_data="export_analytics"),
-                InlineKeyboardButton("⚙️ Analytics Settings", callback_data="analytics_settings")
-            ],
-            [
-                InlineKeyboardButton("🔙 Admin Panel", callback_data="admin_panel"),
-                InlineKeyboardButton("🔄 Refresh", callback_data="system_analytics")
-            ]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        # Repeated refreshes reuse the last render until the stats change or it ages out
+        cached = self._analytics_render
+        if cached and cached[1] == stats.version and time.monotonic() - cached[0] < _ANALYTICS_RENDER_TTL:
+            message = cached[2]
+        else:
+            message = self._render_system_analytics(stats)
+            self._analytics_render = (time.monotonic(), stats.version, message)
         
-        await query.edit_message_text(
+        await self._edit(
+            query,
             message,
-            parse_mode='Markdown',
-            reply_markup=reply_markup
+            parse_mode=ParseMode.MARKDOWN,
+            reply_markup=_SYSTEM_ANALYTICS_KEYBOARD
+        )
+    
+    def _render_system_analytics(self, stats: AdminStatsCache) -> str:
+        """Render the system analytics dashboard text from the running aggregates"""
+        total_users = stats.users
+        total_urls = stats.urls
+        online_count = stats.online
+        offline_count = stats.offline
+        pending_count = stats.pending
+        
+        avg_response = stats.sum_rt / max(stats.count_rt, 1)
+        uptime_percentage = (online_count / max(total_urls, 1)) * 100
+        
+        offline_percentage = offline_count / max(total_urls, 1) * 100
+        health = next((label for floor, label in _ANALYTICS_HEALTH_BANDS if uptime_percentage >= floor), "🔴 Needs Attention")
+        grade = next((label for ceiling, label in _ANALYTICS_GRADE_BANDS if avg_response < ceiling), "C")
+        quality = next((label for floor, label in _ANALYTICS_QUALITY_BANDS if uptime_percentage >= floor), "Fair")
+        
+        return (
+            f"📊 **System Analytics Dashboard** 📊\n\n"
+            f"🎯 **Overall Health: {health}**\n\n"
+            f"📈 **Key Metrics:**\n"
+            f"• 🌐 Total URLs: {total_urls}\n"
+            f"• 👥 Active Users: {total_users}\n"
+            f"• 🟢 Online: {online_count} ({uptime_percentage:.1f}%)\n"
+            f"• 🔴 Offline: {offline_count} ({offline_percentage:.1f}%)\n"
+            f"• ⏳ Pending: {pending_count}\n"
+            f"• ⚡ Avg Response: {avg_response:.3f}s\n\n"
+            f"📊 **System Performance:**\n"
+            f"• 📈 Overall Uptime: {uptime_percentage:.1f}%\n"
+            f"• ⚡ Performance Grade: {grade}\n"
+            f"• 🎯 Service Quality: {quality}\n\n"
+            f"🔧 **System Status:**\n"
+            f"• 🔄 Monitoring: Active\n"
+            f"• 💾 Database: Notion (Connected)\n"
+            f"• ⏱️ Last Update: {clock_time()}\n"
+            f"• 🌟 Bot Status: Running Smoothly"
         )
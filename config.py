@@ -17,6 +17,7 @@ class Config:
         self.open_to_all_users = True
         self.primary_admin_chat_id = 1691680798  # Primary admin
         self.admin_list = [1691680798]  # List of admin chat IDs
+        self._allowed_ids = frozenset(self.admin_list)  # Used when the bot is not open to all
         
     def _get_bot_token(self):
         """Get bot token from environment variables"""
@@ -38,7 +39,7 @@ class Config:
     
     def is_user_allowed(self, chat_id):
         """Check if the user is allowed to use the bot (now open to all)"""
-        return True  # Bot is now open to all users
+        return self.open_to_all_users or chat_id in self._allowed_ids
     
     def is_primary_admin(self, chat_id):
         """Check if user is the primary admin"""
@@ -48,6 +49,7 @@ class Config:
         """Add a new admin"""
         if chat_id not in self.admin_list:
             self.admin_list.append(chat_id)
+            self._allowed_ids = frozenset(self.admin_list)
             return True
         return False
     
@@ -55,6 +57,7 @@ class Config:
         """Remove an admin (except primary admin)"""
         if chat_id != self.primary_admin_chat_id and chat_id in self.admin_list:
             self.admin_list.remove(chat_id)
+            self._allowed_ids = frozenset(self.admin_list)
             return True
         return False
     
@@ -2,23 +2,84 @@
 Data persistence manager for URL monitoring data
 """
 
+import asyncio
 import json
 import os
 import logging
+import sqlite3
+import threading
+import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
 
+try:
+    import orjson
+except ImportError:  # Optional speedup; falls back to the stdlib encoder
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Ping records kept per URL; older ones are deleted as new pings arrive
+PING_HISTORY_LIMIT = 1000
+
+_HISTORY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pings (
+    admin_id TEXT NOT NULL,
+    url TEXT NOT NULL,
+    ts REAL NOT NULL,
+    status_code INTEGER,
+    response_time REAL,
+    success INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pings_by_url_ts ON pings (admin_id, url, ts DESC);
+CREATE INDEX IF NOT EXISTS pings_by_ts ON pings (ts);
+CREATE TABLE IF NOT EXISTS incidents (
+    admin_id TEXT NOT NULL,
+    url TEXT NOT NULL,
+    start_ts REAL NOT NULL,
+    end_ts REAL,
+    duration REAL
+);
+CREATE INDEX IF NOT EXISTS incidents_by_url_start ON incidents (admin_id, url, start_ts DESC);
+"""
+
+# Seconds between background flushes; bursts of ping updates coalesce into one write
+FLUSH_INTERVAL = 3.0
+
+# The data file is written compact; export_json() produces the indented form for people
+if orjson is not None:
+    _loads = orjson.loads
+
+    def _dumps(data: Dict[str, Any], pretty: bool = False) -> bytes:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+        return orjson.dumps(data, option=option)
+else:
+    _loads = json.loads
+
+    def _dumps(data: Dict[str, Any], pretty: bool = False) -> bytes:
+        if pretty:
+            return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+        return json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+def _iso(ts: Optional[float]) -> Optional[str]:
+    return datetime.fromtimestamp(ts).isoformat() if ts is not None else None
+
 class DataManager:
-    def __init__(self, data_file: str = "urls_data.json"):
+    def __init__(self, data_file: str = "urls_data.json", history_file: str = "ping_history.db"):
         self.data_file = data_file
+        self._dirty = False
+        self._flush_task: Optional[asyncio.Task] = None
+        # Ping history and incidents live in SQLite so a ping is one row insert,
+        # not a rewrite of the whole JSON document
+        self._db_lock = threading.Lock()
+        self._db = self._open_history_db(history_file)
         self.data = self._load_data()
+        self._url_owner = self._build_url_owner()  # url -> admin_id, kept current by add/remove
     
     def _load_data(self) -> Dict[str, Any]:
         """Load data from JSON file"""
         default_data = {
-            "admin_data": {},  # admin_chat_id -> {urls: {}, ping_history: {}, downtime_incidents: {}}
+            "admin_data": {},  # admin_chat_id -> {urls: {}}; history is in the SQLite file
             # Legacy support - will be migrated
             "urls": {},  
             "ping_history": {},  
@@ -31,8 +92,8 @@ class DataManager:
             return default_data
         
         try:
-            with open(self.data_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            with open(self.data_file, 'rb') as f:
+                data = _loads(f.read())
                 # Ensure all required keys exist
                 for key in default_data:
                     if key not in data:
@@ -40,6 +101,7 @@ class DataManager:
                 logger.info(f"Loaded data from {self.data_file}")
                 # Migrate legacy data if needed
                 data = self._migrate_legacy_data(data)
+                self._import_json_history(data)
                 return data
         except (json.JSONDecodeError, FileNotFoundError) as e:
             logger.error(f"Error loading data file: {e}")
@@ -51,12 +113,67 @@ class DataManager:
         """Save data to JSON file"""
         try:
             data_to_save = data if data is not None else self.data
-            with open(self.data_file, 'w', encoding='utf-8') as f:
-                json.dump(data_to_save, f, indent=2, ensure_ascii=False)
+            # Write a temp file and swap it in, so a crash never leaves a truncated file
+            tmp_file = self.data_file + ".tmp"
+            with open(tmp_file, 'wb') as f:
+                f.write(_dumps(data_to_save))
+            os.replace(tmp_file, self.data_file)
             logger.debug(f"Data saved to {self.data_file}")
         except Exception as e:
             logger.error(f"Error saving data: {e}")
     
+    def export_json(self, path: str):
+        """Write the current data as indented JSON, e.g. for an admin to read"""
+        with open(path, 'wb') as f:
+            f.write(_dumps(self.data, pretty=True))
+    
+    def _mark_dirty(self):
+        """Schedule a save: deferred to the flush loop if it is running, immediate otherwise"""
+        if self._flush_task is None:
+            self._save_data()
+        else:
+            self._dirty = True
+    
+    def flush(self):
+        """Write pending changes to disk"""
+        if self._dirty:
+            self._dirty = False
+            self._save_data()
+    
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(FLUSH_INTERVAL)
+            self.flush()
+    
+    def start_background_flush(self):
+        """Batch saves in a background task; must be called from inside the event loop"""
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush_loop())
+    
+    async def close(self):
+        """Stop the background flush and write any pending changes"""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        self.flush()
+        with self._db_lock:
+            self._db.close()
+    
+    @staticmethod
+    def _open_history_db(path: str) -> sqlite3.Connection:
+        """Open the history database: WAL journal, relaxed fsync, memory-mapped reads"""
+        db = sqlite3.connect(path, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.execute("PRAGMA mmap_size=268435456")
+        db.execute("PRAGMA temp_store=MEMORY")
+        db.executescript(_HISTORY_SCHEMA)
+        return db
+    
     def _migrate_legacy_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Migrate legacy shared data structure to per-admin structure"""
         if "admin_data" not in data:
@@ -83,14 +200,42 @@ class DataManager:
         
         return data
     
+    def _import_json_history(self, data: Dict[str, Any]):
+        """Move ping history and incidents kept in the JSON file into the history database"""
+        pings = []
+        incidents = []
+        for admin_id, admin_data in data["admin_data"].items():
+            for url, history in admin_data.pop("ping_history", {}).items():
+                for ping in history:
+                    ts = ping.get("ts") or datetime.fromisoformat(ping["timestamp"]).timestamp()
+                    pings.append((admin_id, url, ts, ping.get("status_code"), ping.get("response_time"), ping["success"]))
+            for url, url_incidents in admin_data.pop("downtime_incidents", {}).items():
+                for incident in url_incidents:
+                    start_ts = incident.get("start_ts") or datetime.fromisoformat(incident["start_time"]).timestamp()
+                    end_ts = datetime.fromisoformat(incident["end_time"]).timestamp() if incident.get("end_time") else None
+                    incidents.append((admin_id, url, start_ts, end_ts, incident.get("duration")))
+        
+        if not (pings or incidents):
+            return
+        
+        with self._db_lock, self._db:
+            self._db.executemany("INSERT INTO pings VALUES (?, ?, ?, ?, ?, ?)", pings)
+            self._db.executemany("INSERT INTO incidents VALUES (?, ?, ?, ?, ?)", incidents)
+        self._save_data(data)
+        logger.info(f"Moved {len(pings)} ping records and {len(incidents)} incidents into the history database")
+    
+    def _build_url_owner(self) -> Dict[str, str]:
+        """Map each URL to the admin monitoring it (the last one, if several do)"""
+        return {
+            url: admin_id
+            for admin_id, admin_data in self.data["admin_data"].items()
+            for url in admin_data["urls"]
+        }
+    
     def _ensure_admin_data(self, admin_chat_id: str):
         """Ensure admin has their own data structure"""
         if admin_chat_id not in self.data["admin_data"]:
-            self.data["admin_data"][admin_chat_id] = {
-                "urls": {},
-                "ping_history": {},
-                "downtime_incidents": {}
-            }
+            self.data["admin_data"][admin_chat_id] = {"urls": {}}
     
     def add_url(self, url: str, admin_chat_id: str) -> bool:
         """Add a new URL to monitor for specific admin"""
@@ -107,13 +252,8 @@ class DataManager:
             "response_time": None
         }
         
-        if url not in admin_data["ping_history"]:
-            admin_data["ping_history"][url] = []
-        
-        if url not in admin_data["downtime_incidents"]:
-            admin_data["downtime_incidents"][url] = []
-        
-        self._save_data()
+        self._url_owner[url] = admin_chat_id
+        self._mark_dirty()
         logger.info(f"Added URL: {url} for admin {admin_chat_id}")
         return True
     
@@ -129,13 +269,18 @@ class DataManager:
         # Remove from admin's data structures
         del admin_data["urls"][url]
         
-        if url in admin_data["ping_history"]:
-            del admin_data["ping_history"][url]
+        with self._db_lock, self._db:
+            self._db.execute("DELETE FROM pings WHERE admin_id = ? AND url = ?", (admin_chat_id, url))
+            self._db.execute("DELETE FROM incidents WHERE admin_id = ? AND url = ?", (admin_chat_id, url))
         
-        if url in admin_data["downtime_incidents"]:
-            del admin_data["downtime_incidents"][url]
+        if self._url_owner.get(url) == admin_chat_id:
+            # Hand the URL to another admin still monitoring it, if any
+            del self._url_owner[url]
+            for admin_id, other_data in self.data["admin_data"].items():
+                if url in other_data["urls"]:
+                    self._url_owner[url] = admin_id
         
-        self._save_data()
+        self._mark_dirty()
         logger.info(f"Removed URL: {url} for admin {admin_chat_id}")
         return True
     
@@ -146,11 +291,7 @@ class DataManager:
     
     def get_all_urls(self) -> Dict[str, str]:
         """Get all URLs from all admins for monitoring purposes (returns url -> admin_id mapping)"""
-        all_urls = {}
-        for admin_id, admin_data in self.data["admin_data"].items():
-            for url in admin_data["urls"]:
-                all_urls[url] = admin_id
-        return all_urls
+        return self._url_owner.copy()
     
     def update_url_status(self, url: str, admin_chat_id: str, status_code: int, response_time: float, success: bool):
         """Update URL status after a ping for specific admin"""
@@ -161,89 +302,71 @@ class DataManager:
             logger.warning(f"Attempted to update status for unknown URL: {url} for admin {admin_chat_id}")
             return
         
-        now = datetime.now()
+        now_ts = time.time()
         
-        # Update main URL data
+        # Update main URL data; last_check stays ISO for display
         admin_data["urls"][url].update({
-            "last_check": now.isoformat(),
+            "last_check": datetime.fromtimestamp(now_ts).isoformat(),
             "status": "online" if success else "offline",
             "response_time": response_time
         })
         
-        # Add to ping history
-        ping_record = {
-            "timestamp": now.isoformat(),
-            "status_code": status_code,
-            "response_time": response_time,
-            "success": success
-        }
-        
-        admin_data["ping_history"][url].append(ping_record)
-        
-        # Keep only last 1000 ping records per URL to prevent file bloat
-        if len(admin_data["ping_history"][url]) > 1000:
-            admin_data["ping_history"][url] = admin_data["ping_history"][url][-1000:]
-        
-        # Handle downtime incidents
-        self._update_downtime_incidents(url, admin_chat_id, success, now)
+        with self._db_lock, self._db:
+            self._db.execute(
+                "INSERT INTO pings VALUES (?, ?, ?, ?, ?, ?)",
+                (admin_chat_id, url, now_ts, status_code, response_time, success)
+            )
+            # Keep only the newest PING_HISTORY_LIMIT records for this URL
+            self._db.execute(
+                "DELETE FROM pings WHERE admin_id = ? AND url = ? AND ts < ("
+                "SELECT ts FROM pings WHERE admin_id = ? AND url = ? ORDER BY ts DESC LIMIT 1 OFFSET ?)",
+                (admin_chat_id, url, admin_chat_id, url, PING_HISTORY_LIMIT - 1)
+            )
+            
+            # Handle downtime incidents
+            self._update_downtime_incidents(url, admin_chat_id, success, now_ts)
         
-        self._save_data()
+        self._mark_dirty()
     
-    def _update_downtime_incidents(self, url: str, admin_chat_id: str, success: bool, timestamp: datetime):
-        """Track downtime incidents for specific admin"""
-        admin_data = self.data["admin_data"][admin_chat_id]
-        incidents = admin_data["downtime_incidents"][url]
+    def _update_downtime_incidents(self, url: str, admin_chat_id: str, success: bool, now_ts: float):
+        """Track downtime incidents for specific admin; runs inside update_url_status's transaction"""
+        last = self._db.execute(
+            "SELECT rowid, start_ts, end_ts FROM incidents WHERE admin_id = ? AND url = ? ORDER BY start_ts DESC LIMIT 1",
+            (admin_chat_id, url)
+        ).fetchone()
+        is_open = last is not None and last[2] is None
         
         if not success:
             # Check if this is a new incident or continuation of existing one
-            if not incidents or (incidents[-1].get("end_time") is not None):
-                # New incident
-                incidents.append({
-                    "start_time": timestamp.isoformat(),
-                    "end_time": None,
-                    "duration": None
-                })
-        else:
-            # URL is back online, close any open incident
-            if incidents and incidents[-1].get("end_time") is None:
-                start_time = datetime.fromisoformat(incidents[-1]["start_time"])
-                duration = (timestamp - start_time).total_seconds()
-                incidents[-1].update({
-                    "end_time": timestamp.isoformat(),
-                    "duration": duration
-                })
+            if not is_open:
+                self._db.execute(
+                    "INSERT INTO incidents VALUES (?, ?, ?, NULL, NULL)",
+                    (admin_chat_id, url, now_ts)
+                )
+        elif is_open:
+            # URL is back online, close the open incident
+            self._db.execute(
+                "UPDATE incidents SET end_ts = ?, duration = ? WHERE rowid = ?",
+                (now_ts, now_ts - last[1], last[0])
+            )
     
     def get_uptime_stats(self, url: str, admin_chat_id: str, hours: int = 24) -> Dict[str, Any]:
         """Calculate uptime statistics for the last N hours for specific admin"""
-        self._ensure_admin_data(admin_chat_id)
-        admin_data = self.data["admin_data"][admin_chat_id]
+        cutoff_ts = (datetime.now() - timedelta(hours=hours)).timestamp()
         
-        if url not in admin_data["ping_history"]:
-            return {"uptime_percentage": 0, "total_pings": 0, "successful_pings": 0}
-        
-        cutoff_time = datetime.now() - timedelta(hours=hours)
-        recent_pings = [
-            ping for ping in admin_data["ping_history"][url]
-            if datetime.fromisoformat(ping["timestamp"]) > cutoff_time
-        ]
+        # Average response time covers successful pings only
+        with self._db_lock:
+            total_pings, successful_pings, avg_response_time = self._db.execute(
+                "SELECT COUNT(*), SUM(success), AVG(CASE WHEN success THEN response_time END) "
+                "FROM pings WHERE admin_id = ? AND url = ? AND ts > ?",
+                (admin_chat_id, url, cutoff_ts)
+            ).fetchone()
         
-        if not recent_pings:
+        if not total_pings:
             return {"uptime_percentage": 0, "total_pings": 0, "successful_pings": 0}
         
-        total_pings = len(recent_pings)
-        successful_pings = sum(1 for ping in recent_pings if ping["success"])
         uptime_percentage = (successful_pings / total_pings) * 100
         
-        # Calculate average response time for successful pings
-        successful_response_times = [
-            ping["response_time"] for ping in recent_pings 
-            if ping["success"] and ping["response_time"] is not None
-        ]
-        avg_response_time = (
-            sum(successful_response_times) / len(successful_response_times)
-            if successful_response_times else 0
-        )
-        
         return {
             "uptime_percentage": round(uptime_percentage, 2),
             "total_pings": total_pings,
@@ -254,32 +377,25 @@ class DataManager:
     
     def get_recent_incidents(self, url: str, hours: int = 24) -> List[Dict[str, Any]]:
         """Get recent downtime incidents"""
-        if url not in self.data["downtime_incidents"]:
-            return []
-        
-        cutoff_time = datetime.now() - timedelta(hours=hours)
-        recent_incidents = []
+        cutoff_ts = (datetime.now() - timedelta(hours=hours)).timestamp()
         
-        for incident in self.data["downtime_incidents"][url]:
-            start_time = datetime.fromisoformat(incident["start_time"])
-            if start_time > cutoff_time:
-                recent_incidents.append(incident)
+        with self._db_lock:
+            rows = self._db.execute(
+                "SELECT start_ts, end_ts, duration FROM incidents WHERE url = ? AND start_ts > ? ORDER BY start_ts",
+                (url, cutoff_ts)
+            ).fetchall()
         
-        return recent_incidents
+        return [
+            {"start_time": _iso(start_ts), "start_ts": start_ts, "end_time": _iso(end_ts), "duration": duration}
+            for start_ts, end_ts, duration in rows
+        ]
     
     def cleanup_old_data(self, days: int = 7):
         """Clean up old ping history data"""
-        cutoff_time = datetime.now() - timedelta(days=days)
+        cutoff_ts = (datetime.now() - timedelta(days=days)).timestamp()
         
-        for url in self.data["ping_history"]:
-            original_count = len(self.data["ping_history"][url])
-            self.data["ping_history"][url] = [
-                ping for ping in self.data["ping_history"][url]
-                if datetime.fromisoformat(ping["timestamp"]) > cutoff_time
-            ]
-            cleaned_count = len(self.data["ping_history"][url])
-            
-            if original_count != cleaned_count:
-                logger.info(f"Cleaned {original_count - cleaned_count} old ping records for {url}")
+        with self._db_lock, self._db:
+            cleaned = self._db.execute("DELETE FROM pings WHERE ts < ?", (cutoff_ts,)).rowcount
         
-        self._save_data()
+        if cleaned:
+            logger.info(f"Cleaned {cleaned} old ping records")
@@ -8,6 +8,7 @@ import asyncio
 import logging
 import os
 from telegram.ext import Application, CommandHandler, MessageHandler, filters
+from telegram.request import HTTPXRequest
 from config import Config
 from bot_handlers import BotHandlers
 from url_monitor import URLMonitor
@@ -35,36 +36,44 @@ class TelegramURLBot:
     async def setup_bot(self):
         """Initialize the Telegram bot application"""
         try:
-            # Create application
-            self.application = Application.builder().token(self.config.bot_token).build()
+            # Create application; updates are processed concurrently so a slow
+            # handler for one user does not hold up everyone else. The larger
+            # connection pool lets concurrent broadcast sends reuse open connections.
+            self.application = (
+                Application.builder()
+                .token(self.config.bot_token)
+                .request(HTTPXRequest(connection_pool_size=100, pool_timeout=10.0))
+                .concurrent_updates(True)
+                .build()
+            )
             
             # Add command handlers
-            self.application.add_handler(CommandHandler("start", self.bot_handlers.start_command))
-            self.application.add_handler(CommandHandler("help", self.bot_handlers.help_command))
-            self.application.add_handler(CommandHandler("seturl", self.bot_handlers.set_url_command))
-            self.application.add_handler(CommandHandler("removeurl", self.bot_handlers.remove_url_command))
-            self.application.add_handler(CommandHandler("listurls", self.bot_handlers.list_urls_command))
-            self.application.add_handler(CommandHandler("status", self.bot_handlers.status_command))
-            self.application.add_handler(CommandHandler("pingnow", self.bot_handlers.ping_now_command))
+            self.application.add_handler(CommandHandler("start", self.bot_handlers.start_command, block=False))
+            self.application.add_handler(CommandHandler("help", self.bot_handlers.help_command, block=False))
+            self.application.add_handler(CommandHandler("seturl", self.bot_handlers.set_url_command, block=False))
+            self.application.add_handler(CommandHandler("removeurl", self.bot_handlers.remove_url_command, block=False))
+            self.application.add_handler(CommandHandler("listurls", self.bot_handlers.list_urls_command, block=False))
+            self.application.add_handler(CommandHandler("status", self.bot_handlers.status_command, block=False))
+            self.application.add_handler(CommandHandler("pingnow", self.bot_handlers.ping_now_command, block=False))
             
             # Admin management commands
-            self.application.add_handler(CommandHandler("addadmin", self.bot_handlers.add_admin_command))
-            self.application.add_handler(CommandHandler("removeadmin", self.bot_handlers.remove_admin_command))
-            self.application.add_handler(CommandHandler("listadmins", self.bot_handlers.list_admins_command))
+            self.application.add_handler(CommandHandler("addadmin", self.bot_handlers.add_admin_command, block=False))
+            self.application.add_handler(CommandHandler("removeadmin", self.bot_handlers.remove_admin_command, block=False))
+            self.application.add_handler(CommandHandler("listadmins", self.bot_handlers.list_admins_command, block=False))
             
             # Admin broadcast commands
-            self.application.add_handler(CommandHandler("broadcast", self.bot_handlers.broadcast_command))
-            self.application.add_handler(CommandHandler("broadcastimg", self.bot_handlers.broadcast_image_command))
+            self.application.add_handler(CommandHandler("broadcast", self.bot_handlers.broadcast_command, block=False))
+            self.application.add_handler(CommandHandler("broadcastimg", self.bot_handlers.broadcast_image_command, block=False))
             
             # Add callback query handler for inline buttons
             from telegram.ext import CallbackQueryHandler
-            self.application.add_handler(CallbackQueryHandler(self.bot_handlers.button_callback))
+            self.application.add_handler(CallbackQueryHandler(self.bot_handlers.button_callback, block=False))
             
             # Add message handler for non-command messages
-            self.application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, self.bot_handlers.handle_message))
+            self.application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, self.bot_handlers.handle_message, block=False))
             
             # Add photo handler for broadcast images
-            self.application.add_handler(MessageHandler(filters.PHOTO, self.bot_handlers.handle_broadcast_image))
+            self.application.add_handler(MessageHandler(filters.PHOTO, self.bot_handlers.handle_broadcast_image, block=False))
             
             logger.info("Bot handlers registered successfully")
             
@@ -126,6 +135,8 @@ class TelegramURLBot:
             if self.application:
                 await self.application.stop()
                 await self.application.shutdown()
+            await self.url_monitor.close()
+            self.bot_handlers.notion_data.close()
             logger.info("Bot stopped")
 
 def main():
@@ -6,13 +6,59 @@ Replaces the JSON-based data storage with Notion database integration
 
 import os
 import logging
+import httpx
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Set, Tuple
 from notion_client import Client
 from notion_client.errors import APIResponseError
 
 logger = logging.getLogger(__name__)
 
+# Milliseconds before a Notion request is abandoned; the client applies it to the shared httpx pool
+_NOTION_REQUEST_TIMEOUT_MS = 10_000
+
+def _iso_to_ts(value: Optional[str]) -> Optional[float]:
+    """Convert a Notion ISO date string to an epoch timestamp"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        return None
+
+def _parse_url_page(page: Dict[str, Any]) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+    """Extract (url, url data) from a Notion page, or (None, None) if it has no URL"""
+    props = page['properties']
+    
+    # Extract URL
+    url_prop = props.get('url', {})
+    url = url_prop.get('url') if url_prop else ""
+    if not url:
+        return None, None
+    
+    # Extract other properties
+    status_prop = props.get('status', {}).get('select')
+    # Notion stores "Online"/"Offline"; normalize once here so readers compare plain lowercase
+    status = status_prop['name'].lower() if status_prop else "unknown"
+    
+    added_at_prop = props.get('added_at', {}).get('date')
+    added_at = added_at_prop['start'] if added_at_prop else None
+    
+    last_check_prop = props.get('last_check', {}).get('date')
+    last_check = last_check_prop['start'] if last_check_prop else None
+    
+    response_time = props.get('response_time', {}).get('number')
+    
+    return url, {
+        "id": page['id'],
+        "added_at": added_at,
+        "added_at_ts": _iso_to_ts(added_at),
+        "last_check": last_check,
+        "last_check_ts": _iso_to_ts(last_check),
+        "status": status,
+        "response_time": response_time
+    }
+
 class NotionDataManager:
     def __init__(self):
         self.notion_token = os.getenv('NOTION_INTEGRATION_SECRET')
@@ -21,9 +67,17 @@ class NotionDataManager:
         if not self.notion_token or not self.database_id:
             raise ValueError("NOTION_INTEGRATION_SECRET and NOTION_DATABASE_ID environment variables are required")
         
-        self.notion = Client(auth=self.notion_token)
+        # Share one pooled HTTP client so calls reuse keep-alive connections
+        self._http = httpx.Client(
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=20, keepalive_expiry=75)
+        )
+        self.notion = Client(auth=self.notion_token, client=self._http, timeout_ms=_NOTION_REQUEST_TIMEOUT_MS)
         logger.info("Notion Data Manager initialized successfully")
     
+    def close(self):
+        """Close the pooled HTTP connections to Notion"""
+        self._http.close()
+    
     async def add_url(self, url: str, user_chat_id: str, username: str = None) -> bool:
         """Add a new URL to monitor for a user"""
         try:
@@ -88,8 +142,8 @@ class NotionDataManager:
             logger.error(f"Error removing URL: {e}")
             return False
     
-    async def get_user_urls(self, user_chat_id: str) -> Dict[str, Dict[str, Any]]:
-        """Get all monitored URLs for a specific user"""
+    async def get_user_urls(self, user_chat_id: str, raise_errors: bool = False) -> Dict[str, Dict[str, Any]]:
+        """Get all monitored URLs for a specific user (errors give {} unless `raise_errors`)"""
         try:
             # Query database for this user's URLs
             response = self.notion.databases.query(
@@ -102,42 +156,52 @@ class NotionDataManager:
             
             urls = {}
             for page in response['results']:
-                props = page['properties']
-                
-                # Extract URL
-                url_prop = props.get('url', {})
-                url = url_prop.get('url') if url_prop else ""
-                
+                url, data = _parse_url_page(page)
                 if url:
-                    # Extract other properties
-                    status_prop = props.get('status', {}).get('select')
-                    status = status_prop['name'] if status_prop else "unknown"
-                    
-                    added_at_prop = props.get('added_at', {}).get('date')
-                    added_at = added_at_prop['start'] if added_at_prop else None
-                    
-                    last_check_prop = props.get('last_check', {}).get('date')
-                    last_check = last_check_prop['start'] if last_check_prop else None
-                    
-                    response_time = props.get('response_time', {}).get('number')
-                    
-                    urls[url] = {
-                        "id": page['id'],
-                        "added_at": added_at,
-                        "last_check": last_check,
-                        "status": status,
-                        "response_time": response_time
-                    }
+                    urls[url] = data
             
             return urls
             
         except APIResponseError as e:
             logger.error(f"Notion API error getting user URLs: {e}")
+            if raise_errors:
+                raise
             return {}
         except Exception as e:
             logger.error(f"Error getting user URLs: {e}")
+            if raise_errors:
+                raise
             return {}
     
+    async def get_all_user_urls(self) -> Optional[Dict[str, Dict[str, Dict[str, Any]]]]:
+        """Get every user's URLs in one scan of the database (returns user_id -> url -> data, or None if the scan failed)"""
+        try:
+            grouped: Dict[str, Dict[str, Dict[str, Any]]] = {}
+            query = {"database_id": self.database_id}
+            
+            while True:
+                response = self.notion.databases.query(**query)
+                for page in response['results']:
+                    user_id_prop = page['properties'].get('user_id', {}).get('rich_text', [])
+                    if not user_id_prop:
+                        continue
+                    url, data = _parse_url_page(page)
+                    if url:
+                        grouped.setdefault(user_id_prop[0]['text']['content'], {})[url] = data
+                
+                if not response.get('has_more'):
+                    break
+                query["start_cursor"] = response['next_cursor']
+            
+            return grouped
+            
+        except APIResponseError as e:
+            logger.error(f"Notion API error getting all user URLs: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"Error getting all user URLs: {e}")
+            return None
+    
     async def get_all_urls(self) -> Dict[str, str]:
         """Get all URLs from all users for monitoring purposes (returns url -> user_id mapping)"""
         try:
@@ -168,6 +232,42 @@ class NotionDataManager:
             logger.error(f"Error getting all URLs: {e}")
             return {}
     
+    async def get_broadcast_user_ids(self, raise_errors: bool = False) -> Set[str]:
+        """Get the distinct chat IDs of all users with at least one monitored URL (errors give an empty set unless `raise_errors`)"""
+        try:
+            user_ids = set()
+            query = {
+                "database_id": self.database_id,
+                "filter": {
+                    "property": "user_id",
+                    "rich_text": {"is_not_empty": True}
+                }
+            }
+            
+            while True:
+                response = self.notion.databases.query(**query)
+                for page in response['results']:
+                    user_id_prop = page['properties'].get('user_id', {}).get('rich_text', [])
+                    if user_id_prop:
+                        user_ids.add(user_id_prop[0]['text']['content'])
+                
+                if not response.get('has_more'):
+                    break
+                query["start_cursor"] = response['next_cursor']
+            
+            return user_ids
+            
+        except APIResponseError as e:
+            logger.error(f"Notion API error getting broadcast users: {e}")
+            if raise_errors:
+                raise
+            return set()
+        except Exception as e:
+            logger.error(f"Error getting broadcast users: {e}")
+            if raise_errors:
+                raise
+            return set()
+    
     async def get_user_url(self, user_chat_id: str, url: str) -> Optional[Dict[str, Any]]:
         """Get a specific URL entry for a user"""
         try:
@@ -188,28 +288,10 @@ class NotionDataManager:
             )
             
             if response['results']:
-                page = response['results'][0]
-                props = page['properties']
-                
-                status_prop = props.get('status', {}).get('select')
-                status = status_prop['name'] if status_prop else "unknown"
-                
-                added_at_prop = props.get('added_at', {}).get('date')
-                added_at = added_at_prop['start'] if added_at_prop else None
-                
-                last_check_prop = props.get('last_check', {}).get('date')
-                last_check = last_check_prop['start'] if last_check_prop else None
-                
-                response_time = props.get('response_time', {}).get('number')
-                
-                return {
-                    "id": page['id'],
-                    "url": url,
-                    "status": status,
-                    "added_at": added_at,
-                    "last_check": last_check,
-                    "response_time": response_time
-                }
+                page_url, url_data = _parse_url_page(response['results'][0])
+                if page_url:
+                    url_data["url"] = page_url
+                    return url_data
             
             return None
             
@@ -265,46 +347,46 @@ class NotionDataManager:
         except Exception as e:
             logger.error(f"Error updating URL timestamp: {e}")
     
+    @staticmethod
+    def summarize_urls(urls: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """Compute status counts and average response time in a single pass"""
+        online = offline = pending = 0
+        response_count = 0
+        response_total = 0.0
+        
+        for url_data in urls.values():
+            status = url_data.get('status')
+            if status == 'online':
+                online += 1
+            elif status == 'offline':
+                offline += 1
+            elif status == 'pending':
+                pending += 1
+            
+            response_time = url_data.get('response_time')
+            if response_time is not None:
+                response_count += 1
+                response_total += response_time
+        
+        avg_response_time = response_total / response_count if response_count else 0
+        
+        return {
+            "total_urls": len(urls),
+            "online": online,
+            "offline": offline,
+            "pending": pending,
+            "average_response_time": round(avg_response_time, 2)
+        }
+    
     async def get_url_statistics(self, user_chat_id: str) -> Dict[str, Any]:
         """Get statistics for user's URLs"""
-        try:
-            urls = await self.get_user_urls(user_chat_id)
-            
-            if not urls:
-                return {
-                    "total_urls": 0,
-                    "online": 0,
-                    "offline": 0,
-                    "pending": 0,
-                    "average_response_time": 0
-                }
-            
-            online = sum(1 for url_data in urls.values() if url_data['status'] == 'online')
-            offline = sum(1 for url_data in urls.values() if url_data['status'] == 'offline')
-            pending = sum(1 for url_data in urls.values() if url_data['status'] == 'pending')
-            
-            # Calculate average response time
-            response_times = [url_data['response_time'] for url_data in urls.values() 
-                            if url_data['response_time'] is not None]
-            avg_response_time = sum(response_times) / len(response_times) if response_times else 0
-            
-            return {
-                "total_urls": len(urls),
-                "online": online,
-                "offline": offline,
-                "pending": pending,
-                "average_response_time": round(avg_response_time, 2)
-            }
-            
-        except Exception as e:
-            logger.error(f"Error getting URL statistics: {e}")
-            return {
-                "total_urls": 0,
-                "online": 0,
-                "offline": 0,
-                "pending": 0,
-                "average_response_time": 0
-            }
+        _, stats = await self.get_user_urls_with_stats(user_chat_id)
+        return stats
+    
+    async def get_user_urls_with_stats(self, user_chat_id: str) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, Any]]:
+        """Get a user's URLs and their statistics from a single database query"""
+        urls = await self.get_user_urls(user_chat_id)
+        return urls, self.summarize_urls(urls)
     
     async def cleanup_old_data(self, days: int = 7):
         """Cleanup method for compatibility - Notion handles data persistence differently"""
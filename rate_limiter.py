@@ -0,0 +1,43 @@
+"""
+Async token bucket for pacing outgoing Telegram API calls
+"""
+
+import asyncio
+import time
+
+class AsyncTokenBucket:
+    """Allow `rate` calls per second on average, with bursts of up to `burst`"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    async def acquire(self):
+        """Wait until a token is available and take it"""
+        async with self._lock:
+            self._refill()
+            # Re-check after each sleep so a pause() applied meanwhile is honoured
+            while self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+    def pause(self, seconds: float):
+        """Hold back all callers for `seconds`, e.g. after a RetryAfter from Telegram"""
+        self._refill()
+        self._tokens = min(self._tokens, 1 - seconds * self.rate)
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
@@ -0,0 +1,48 @@
+"""
+Async TTL cache that shares in-flight loads between concurrent callers
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+class AsyncTTLCache:
+    """Cache-aside store for coroutine results, expiring entries after `ttl` seconds"""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries: Dict[Hashable, Tuple[float, asyncio.Future]] = {}  # key -> (expires at, load)
+
+    async def get(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached value for `key`, calling `loader` on a miss
+
+        The pending load itself is cached, so callers that miss while it is
+        running await the same result instead of issuing their own request.
+        """
+        entry = self._entries.get(key)
+        if entry and entry[0] > time.monotonic():
+            return await asyncio.shield(entry[1])
+
+        future = asyncio.ensure_future(loader())
+        self._entries[key] = (time.monotonic() + self.ttl, future)
+        try:
+            return await asyncio.shield(future)
+        except Exception:
+            # Don't keep serving a failed load
+            if self._entries.get(key, (None, None))[1] is future:
+                del self._entries[key]
+            raise
+
+    def peek(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for `key` if it is loaded and fresh, without loading"""
+        entry = self._entries.get(key)
+        if entry and entry[0] > time.monotonic() and entry[1].done() and not entry[1].cancelled() and entry[1].exception() is None:
+            return entry[1].result()
+        return None
+
+    def invalidate(self, key: Hashable = None):
+        """Drop one entry, or every entry when no key is given"""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
@@ -6,8 +6,11 @@ import asyncio
 import aiohttp
 import logging
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, AsyncIterator, Tuple
+from telegram.constants import ParseMode
 from notion_data_manager import NotionDataManager
+from admin_stats import AdminStatsCache
+from utils import escape_markdown
 
 logger = logging.getLogger(__name__)
 
@@ -19,39 +22,51 @@ class URLMonitor:
         self.is_running = False
         self.bot_instance = None
         self._monitoring_task = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        self.stats = AdminStatsCache()  # Dashboard aggregates, updated as pings come in
     
     def set_bot_instance(self, bot):
         """Set the bot instance for sending alerts"""
         self.bot_instance = bot
     
-
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Get the shared HTTP session, creating it on first use inside the event loop"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=100, limit_per_host=30, keepalive_timeout=75),
+                timeout=aiohttp.ClientTimeout(total=self.request_timeout)
+            )
+        return self._session
+    
+    async def close(self):
+        """Close the shared HTTP session and Notion connections"""
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self.notion_data.close()
     
     async def ping_url(self, url: str) -> Dict[str, Any]:
         """Ping a single URL and return status information"""
         start_time = datetime.now()
         
         try:
-            # Configure session with timeout
-            timeout = aiohttp.ClientTimeout(total=self.request_timeout)
-            
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.get(url, allow_redirects=True) as response:
-                    end_time = datetime.now()
-                    response_time = (end_time - start_time).total_seconds()
-                    
-                    success = 200 <= response.status < 400
-                    
-                    result = {
-                        "url": url,
-                        "status_code": response.status,
-                        "response_time": response_time,
-                        "success": success,
-                        "timestamp": start_time.isoformat(),
-                        "error": None
-                    }
-                    
-                    logger.debug(f"Pinged {url}: {response.status} ({response_time:.3f}s)")
-                    return result
+            # Reuse pooled keep-alive connections across pings
+            async with self._get_session().get(url, allow_redirects=True) as response:
+                end_time = datetime.now()
+                response_time = (end_time - start_time).total_seconds()
+                
+                success = 200 <= response.status < 400
+                
+                result = {
+                    "url": url,
+                    "status_code": response.status,
+                    "response_time": response_time,
+                    "success": success,
+                    "timestamp": start_time.isoformat(),
+                    "error": None
+                }
+                
+                logger.debug(f"Pinged {url}: {response.status} ({response_time:.3f}s)")
+                return result
                     
         except asyncio.TimeoutError:
             end_time = datetime.now()
@@ -104,63 +119,59 @@ class URLMonitor:
             
             url = result["url"]
             ping_results[url] = result
-            
-            # Update Notion database for the URL owner
-            user_id = url_to_user[url]
-            await self.notion_data.update_url_status(
-                url=url,
-                user_chat_id=user_id,
-                success=result["success"],
-                response_time=result["response_time"],
-                timestamp=datetime.fromisoformat(result["timestamp"])
-            )
-            
-            # Send alert if URL is down
-            if not result["success"]:
-                await self._send_alert(result, user_id)
+            await self._record_result(result, url_to_user[url])
         
         logger.info(f"Completed ping cycle for {len(ping_results)} URLs")
         return ping_results
     
     async def ping_user_urls(self, user_chat_id: str) -> Dict[str, Dict[str, Any]]:
         """Ping only URLs belonging to a specific user"""
+        ping_results = {url: result async for url, result in self.iter_ping_user_urls(user_chat_id)}
+        
+        logger.info(f"Completed ping cycle for {len(ping_results)} URLs for user {user_chat_id}")
+        return ping_results
+    
+    async def iter_ping_user_urls(self, user_chat_id: str) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """Ping a user's URLs concurrently, yielding (url, result) as each ping finishes"""
         user_urls = await self.notion_data.get_user_urls(user_chat_id)
         
         if not user_urls:
             logger.debug(f"No URLs to ping for user {user_chat_id}")
-            return {}
+            return
         
         # Create ping tasks for this user's URLs only
-        ping_tasks = [self.ping_url(url) for url in user_urls.keys()]
+        ping_tasks = [asyncio.ensure_future(self.ping_url(url)) for url in user_urls.keys()]
         
-        # Execute all pings concurrently
-        results = await asyncio.gather(*ping_tasks, return_exceptions=True)
-        
-        # Process results
-        ping_results = {}
-        for result in results:
-            if isinstance(result, Exception):
-                logger.error(f"Ping task failed: {result}")
-                continue
-            
-            url = result["url"]
-            ping_results[url] = result
-            
-            # Update Notion database for this user
-            await self.notion_data.update_url_status(
-                url=url,
-                user_chat_id=user_chat_id,
-                success=result["success"],
-                response_time=result["response_time"],
-                timestamp=datetime.fromisoformat(result["timestamp"])
-            )
-            
-            # Send alert if URL is down (only to this user)
-            if not result["success"]:
-                await self._send_alert(result, user_chat_id)
+        try:
+            for next_done in asyncio.as_completed(ping_tasks):
+                try:
+                    result = await next_done
+                except Exception as e:
+                    logger.error(f"Ping task failed: {e}")
+                    continue
+                
+                # Alerts go only to this user
+                await self._record_result(result, user_chat_id)
+                yield result["url"], result
+        finally:
+            # Don't leave pings running if the consumer stops early
+            for task in ping_tasks:
+                task.cancel()
+    
+    async def _record_result(self, result: Dict[str, Any], user_chat_id: str):
+        """Store a ping result in Notion and alert the owner if the URL is down"""
+        await self.notion_data.update_url_status(
+            url=result["url"],
+            user_chat_id=user_chat_id,
+            success=result["success"],
+            response_time=result["response_time"],
+            timestamp=datetime.fromisoformat(result["timestamp"])
+        )
+        self.stats.status_updated(user_chat_id, result["url"], result["success"], result["response_time"])
         
-        logger.info(f"Completed ping cycle for {len(ping_results)} URLs for user {user_chat_id}")
-        return ping_results
+        # Send alert if URL is down
+        if not result["success"]:
+            await self._send_alert(result, user_chat_id)
     
     async def _send_alert(self, ping_result: Dict[str, Any], user_chat_id: str):
         """Send alert to specific user when URL is down"""
@@ -178,7 +189,7 @@ class URLMonitor:
         alert_msg += f"**URL:** `{url}`\n"
         alert_msg += f"**Status Code:** {status_code}\n"
         alert_msg += f"**Response Time:** {response_time:.3f}s\n"
-        alert_msg += f"**Error:** {error}\n"
+        alert_msg += f"**Error:** {escape_markdown(str(error))}\n"
         alert_msg += f"**Time:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
         alert_msg += "Please check the URL status immediately."
         
@@ -186,7 +197,7 @@ class URLMonitor:
             await self.bot_instance.send_message(
                 chat_id=user_chat_id,
                 text=alert_msg,
-                parse_mode='Markdown'
+                parse_mode=ParseMode.MARKDOWN
             )
             logger.info(f"Alert sent for {url} to user {user_chat_id}")
         except Exception as e:
@@ -3,29 +3,49 @@ Utility functions for the Telegram URL Monitor Bot
 """
 
 import re
+import time
+import hashlib
 import logging
+from functools import lru_cache
 from datetime import datetime
 from typing import Dict, Any, List
 from urllib.parse import urlparse
 
 logger = logging.getLogger(__name__)
 
+# Scheme followed by a non-empty host, compiled once at import
+_URL_RE = re.compile(r"^https?://[^\s/?#]+")
+
+# Single-pass escape tables for Telegram Markdown
+_MD_TABLE = str.maketrans({c: "\\" + c for c in "_*`["})
+_MD2_TABLE = str.maketrans({c: "\\" + c for c in "\\_*[]()~`>#+-=|{}.!"})
+
+# (epoch second, "HH:MM:SS") of the last clock_time() call
+_clock_cache = [0, ""]
+
+def clock_time() -> str:
+    """Current local time as HH:MM:SS, formatted at most once per second"""
+    now = int(time.time())
+    if _clock_cache[0] != now:
+        _clock_cache[0] = now
+        _clock_cache[1] = datetime.fromtimestamp(now).strftime('%H:%M:%S')
+    return _clock_cache[1]
+
 def validate_url(url: str) -> bool:
     """Validate if a string is a valid URL"""
-    try:
-        # Add https:// if no protocol specified
-        if not url.startswith(('http://', 'https://')):
-            url = 'https://' + url
-        
-        # Parse the URL
-        result = urlparse(url)
-        
-        # Check if it has both scheme and netloc
-        return all([result.scheme, result.netloc])
+    # Add https:// if no protocol specified
+    if not url.startswith(('http://', 'https://')):
+        url = 'https://' + url
     
-    except Exception as e:
-        logger.debug(f"URL validation error for '{url}': {e}")
-        return False
+    return _URL_RE.match(url) is not None
+
+def escape_markdown(text: str) -> str:
+    """Escape text for Telegram legacy Markdown"""
+    return text.translate(_MD_TABLE)
+
+def escape_markdown_v2(text: str) -> str:
+    """Escape text for Telegram MarkdownV2"""
+    return text.translate(_MD2_TABLE)
 
 def format_url_list(urls: Dict[str, Dict[str, Any]]) -> str:
     """Format the list of URLs for display"""
@@ -114,6 +134,7 @@ def format_duration(seconds: float) -> str:
         days = seconds / 86400
         return f"{days:.1f}d"
 
+@lru_cache(maxsize=4096)
 def truncate_url(url: str, max_length: int = 50) -> str:
     """Truncate URL for display purposes"""
     if len(url) <= max_length:
@@ -128,6 +149,12 @@ def truncate_url(url: str, max_length: int = 50) -> str:
     else:
         return url[:max_length - 3] + "..."
 
+@lru_cache(maxsize=4096)
+def short_url_hash(url: str) -> str:
+    """Generate a short, stable ID for a URL (used in callback data)"""
+    return hashlib.blake2b(url.encode("utf-8"), digest_size=4).hexdigest()
+
+@lru_cache(maxsize=64)
 def get_status_emoji(status: str) -> str:
     """Get emoji for status"""
     status_emojis = {
@@ -168,7 +195,7 @@ def calculate_uptime_percentage(successful: int, total: int) -> float:
 def sanitize_url(url: str) -> str:
     """Sanitize URL for safe display"""
     # Remove any potential markdown characters that could break formatting
-    return url.replace("_", "\\_").replace("*", "\\*").replace("[", "\\[").replace("]", "\\]")
+    return escape_markdown(url)
 
 def log_performance(func_name: str, start_time: datetime, end_time: datetime):
     """Log function performance"""
@@ -188,9 +215,7 @@ def create_url_keyboard(urls: List[str], action_prefix: str):
         # Telegram callback data limit is 64 characters
         if len(callback_data) > 64:
             # Use URL hash or truncate
-            import hashlib
-            url_hash = hashlib.md5(url.encode()).hexdigest()[:8]
-            callback_data = f"{action_prefix}:{url_hash}"
+            callback_data = f"{action_prefix}:{short_url_hash(url)}"
         
         keyboard.append([InlineKeyboardButton(display_url, callback_data=callback_data)])
     